@@ -5,11 +5,15 @@
 import os
 import sys
 import json
-import subprocess
-import getpass
 import re
+import threading
+import itertools
 from typing import List, Optional
 
+# Skrip ini sendiri: dipanggil lagi sebagai proses turunan (log-sink, supervisor, watchdog,
+# worker bench) dan disalin ke host lain oleh `remote sync`.
+TOOL_ENTRY = os.path.abspath(__file__)
+
 # Variabel global
 node_id = None
 wallet_address = None
@@ -17,6 +21,19 @@ config_file = ''
 user_home = ''
 screen_path = None  # Path absolut ke executable 'screen'
 nexus_cli_path = None  # Path absolut ke nexus-network CLI
+fleet_nodes: List[dict] = []  # Daftar node untuk mode fleet: {'nodeId': ..., 'threads': ...}
+tool_settings: dict = {}  # Pengaturan tambahan tool (mis. 'cpuPinning')
+taskset_path = None  # Path absolut ke executable 'taskset'
+executable_cache = None  # Cache path/mtime/versi executable, dimuat dari disk saat pertama dipakai
+store_connection = None  # Koneksi SQLite, dibuka saat pertama dipakai
+store_lock = threading.Lock()  # Menyerialkan transaksi tulis dari beberapa thread dalam satu proses
+stored_settings: dict = {}  # Nilai settings terakhir yang dimuat/disimpan, untuk menulis perubahan saja
+store_error: Optional[str] = None  # Pesan error terakhir saat memuat/menyimpan state, None jika berhasil
+trace_fd = None  # File trace JSON-lines, dibuka saat span pertama selesai
+trace_run_id = None  # ID run proses ini di file trace
+trace_counter = itertools.count(1)  # Penghitung ID span
+trace_local = threading.local()  # Tumpukan span aktif per thread
+rusage_popen_class = None  # Subclass subprocess.Popen milik rusage_popen, dibuat saat pertama dipakai
 
 # --- Helper Functions ---
 def color_log(text: str, color: str) -> str:
@@ -31,27 +48,448 @@ def color_log(text: str, color: str) -> str:
     }
     return f"{colors.get(color, '')}{text}{colors['reset']}"
 
-def run_command(command: str) -> bool:
+def tool_command(*args: str) -> List[str]:
+    """Argumen untuk menjalankan tool ini sebagai proses turunan."""
+    return [sys.executable, TOOL_ENTRY, *args]
+
+def run_command(command: str, keep_log: bool = True) -> bool:
     """Menjalankan perintah dan mencetak output secara real-time."""
     print(color_log(f"\n▶️ Menjalankan: ", 'yellow') + command)
-    try:
-        process = subprocess.Popen(command, shell=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
-        for line in process.stdout:
-            sys.stdout.write(line)
-            sys.stdout.flush()
-        process.wait()
-        result_code = process.returncode
-    except FileNotFoundError:
-        print(color_log("❌ Perintah tidak ditemukan.", 'red'))
-        result_code = 1
+    output = run_commands({'': command}, multiplex=False, keep_log=keep_log)['']
+    result_code = output.returncode
     
     if result_code != 0:
         print(color_log(f"❌ Perintah gagal dengan kode error: {result_code}\n", 'red'))
+        if output.log_path:
+            print(color_log(f"Log lengkap: {output.log_path}", 'yellow'))
     else:
         print(color_log("✅ Perintah selesai.\n", 'green'))
     print("--------------------------------------------------------")
     return result_code == 0
 
+# --- Mesin Output Perintah ---
+OUTPUT_CHUNK = 65536  # Ukuran blok baca dari pipe child
+OUTPUT_TAIL_BYTES = 65536  # Ekor output yang disimpan di memori per perintah
+CONSOLE_INTERVAL = 0.1  # Jeda minimum antar render ke terminal (detik)
+CONSOLE_MAX_LINES = 20  # Baris maksimum per perintah per render saat multipleks
+COMMAND_LOG_KEEP = 50  # Jumlah log perintah terkompresi yang disimpan
+
+class CommandOutput:
+    """Output satu perintah: ekor terbatas di memori dan salinan lengkap di log gzip (jika ada `log_dir`)."""
+
+    def __init__(self, label: str, command: str, log_dir: Optional[str]):
+        import codecs
+        import gzip
+        import time
+        self.label = label
+        self.command = command
+        self.log_path = self.log = None
+        if log_dir:
+            safe_label = re.sub(r'[^A-Za-z0-9_.-]', '_', label) or 'cmd'
+            self.log_path = os.path.join(log_dir, f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{safe_label}.log.gz")
+            self.log = gzip.open(self.log_path, 'wb', compresslevel=1)
+            self.log.write(f"$ {command}\n".encode())
+        self.decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self.tail = bytearray()
+        self.pending = ''  # Baris yang belum lengkap (mode multipleks)
+        self.lines = []  # Baris yang menunggu dirender (mode multipleks)
+        self.skipped = 0
+        self.bytes = 0
+        self.returncode = None
+        self.process = None
+
+    def feed(self, chunk: bytes) -> str:
+        """Mencatat satu blok output; mengembalikan teks hasil decode untuk konsol."""
+        self.bytes += len(chunk)
+        if self.log:
+            self.log.write(chunk)
+        self.tail += chunk
+        if len(self.tail) > OUTPUT_TAIL_BYTES:
+            del self.tail[:-OUTPUT_TAIL_BYTES]
+        return self.decoder.decode(chunk)
+
+    def queue_lines(self, text: str):
+        """Memecah teks menjadi baris untuk render multipleks, membuang kelebihan baris."""
+        *complete, self.pending = (self.pending + text).split('\n')
+        self.lines.extend(complete)
+        if len(self.lines) > CONSOLE_MAX_LINES:
+            self.skipped += len(self.lines) - CONSOLE_MAX_LINES
+            del self.lines[:-CONSOLE_MAX_LINES]
+
+    def close(self):
+        if self.log:
+            self.log.close()
+
+    def tail_text(self) -> str:
+        return self.tail.decode(errors='replace')
+
+def command_log_dir() -> str:
+    """Direktori log perintah; log lama dipangkas hingga COMMAND_LOG_KEEP file."""
+    path = os.path.join(get_state_dir(), 'logs', 'commands')
+    os.makedirs(path, exist_ok=True)
+    logs = sorted(os.listdir(path))
+    for old in logs[:max(0, len(logs) - COMMAND_LOG_KEEP)]:
+        try:
+            os.remove(os.path.join(path, old))
+        except OSError:
+            pass
+    return path
+
+def run_commands(commands: dict, multiplex: Optional[bool] = None, echo: bool = True,
+                 span_prefix: Optional[str] = None, keep_log: bool = True) -> dict:
+    """Menjalankan beberapa perintah shell sekaligus dengan pembacaan non-blocking.
+
+    Output dibaca per blok besar lewat `selectors`, ditulis penuh ke log gzip, dan
+    hanya ekornya yang disimpan di memori. Untuk satu perintah, output diteruskan
+    apa adanya ke terminal; untuk beberapa perintah, setiap baris diberi prefix
+    [label] dan render dibatasi tiap CONSOLE_INTERVAL detik. Setiap perintah dicatat
+    sebagai span "<span_prefix>.<label>" (default "cmd.<program>").
+
+    Perintah kontrol ringan (mis. `screen -X quit` untuk puluhan sesi) memakai
+    keep_log=False agar tidak menggeser log provisioning/upgrade dari jatah COMMAND_LOG_KEEP.
+    Mengembalikan {label: CommandOutput}.
+    """
+    import subprocess
+    import selectors
+    import signal
+    import time
+    multiplex = len(commands) > 1 if multiplex is None else multiplex
+    log_dir = command_log_dir() if keep_log else None
+    selector = selectors.DefaultSelector()
+    outputs = {}
+    spans = {}
+    for label, command in commands.items():
+        output = CommandOutput(label, command, log_dir)
+        outputs[label] = output
+        spans[label] = start_span(f"{span_prefix}.{label}" if span_prefix else f"cmd.{command_program(command)}",
+                                  command=command[:TRACE_COMMAND_CHARS])
+        try:
+            output.process = rusage_popen(command, shell=True, stdin=subprocess.DEVNULL if multiplex else None,
+                                         stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        except OSError as e:
+            output.feed(f"{e}\n".encode())
+            output.returncode = 127
+            output.close()
+            spans[label].finish(e)
+            continue
+        selector.register(output.process.stdout, selectors.EVENT_READ, output)
+
+    console = []
+    last_render = 0.0
+
+    def render(force: bool = False):
+        nonlocal last_render
+        now = time.monotonic()
+        if not echo or (not force and now - last_render < CONSOLE_INTERVAL):
+            return
+        last_render = now
+        if multiplex:
+            for output in outputs.values():
+                if output.skipped:
+                    console.append(color_log(f"[{output.label}] ... {output.skipped} baris dilewati (lihat log)\n", 'yellow'))
+                    output.skipped = 0
+                console.extend(f"{color_log(f'[{output.label}]', 'blue')} {line}\n" for line in output.lines)
+                output.lines.clear()
+        if console:
+            sys.stdout.write(''.join(console))
+            sys.stdout.flush()
+            console.clear()
+
+    interrupted = False
+    while selector.get_map():
+        try:
+            events = selector.select(timeout=CONSOLE_INTERVAL)
+        except KeyboardInterrupt:
+            # CTRL+C juga diterima child (satu process group); CTRL+C kedua mematikan paksa.
+            if interrupted:
+                for output in outputs.values():
+                    if output.process and output.process.poll() is None:
+                        output.process.send_signal(signal.SIGKILL)
+            interrupted = True
+            continue
+        for key, _ in events:
+            output = key.data
+            chunk = os.read(key.fd, OUTPUT_CHUNK)
+            if not chunk:
+                selector.unregister(key.fileobj)
+                text = output.decoder.decode(b'', final=True)
+                if multiplex:
+                    output.queue_lines(text + ('\n' if output.pending or text else ''))
+                else:
+                    console.append(text)
+                continue
+            text = output.feed(chunk)
+            if multiplex:
+                output.queue_lines(text)
+            else:
+                console.append(text)
+        render()
+    render(force=True)
+    selector.close()
+
+    for label, output in outputs.items():
+        if output.process:
+            output.returncode = output.process.wait()
+            output.process.stdout.close()
+            output.close()
+            spans[label].set_process(output.process, output.bytes)
+            spans[label].finish()
+    return outputs
+
+# --- Tracing Span dan Profiling ---
+# Setiap operasi dan subprocess dicatat sebagai span ke file JSON-lines harian di direktori state:
+# nama, durasi, kode exit, byte output, dan RSS puncak child (rusage dari wait4). Satu baris
+# ditulis dengan satu write() O_APPEND, jadi beberapa proses dapat menulis ke file yang sama.
+TRACE_DEFAULTS = {'enabled': True, 'keepDays': 14}
+TRACE_COMMAND_CHARS = 200  # Panjang maksimum teks perintah yang disimpan per span
+PROFILE_TOP = 25  # Jumlah fungsi teratas yang dicetak oleh --profile
+
+def get_trace_settings() -> dict:
+    """Pengaturan tracing digabung dengan nilai default."""
+    return {**TRACE_DEFAULTS, **tool_settings.get('trace', {})}
+
+def trace_dir() -> str:
+    path = os.path.join(get_state_dir(), 'traces')
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def open_trace_file() -> Optional[int]:
+    """Membuka file trace hari ini (sekali per proses) dan memangkas file yang lebih tua dari keepDays.
+
+    Mengembalikan None jika tracing nonaktif atau file tidak dapat dibuka; tracing tidak
+    boleh membuat operasi yang dicatat ikut gagal.
+    """
+    global trace_fd, trace_run_id
+    import time
+    settings = get_trace_settings()
+    if not settings['enabled'] or trace_fd == -1:
+        return None
+    if trace_fd is None:
+        try:
+            directory = trace_dir()
+            cutoff = time.strftime('%Y%m%d', time.localtime(time.time() - settings['keepDays'] * 86400))
+            for name in os.listdir(directory):
+                if name.startswith('trace-') and name[6:14] < cutoff:
+                    os.remove(os.path.join(directory, name))
+            path = os.path.join(directory, f"trace-{time.strftime('%Y%m%d')}.jsonl")
+            trace_fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        except OSError:
+            trace_fd = -1
+            return None
+        trace_run_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+    return trace_fd
+
+class Span:
+    """Satu span yang sedang berjalan; atribut tambahan dicatat dengan set()."""
+
+    def __init__(self, name: str, parent: Optional[str], attrs: dict):
+        import time
+        self.record = {'name': name, 'id': f"{os.getpid()}-{next(trace_counter)}", 'parent': parent,
+                       'start': round(time.time(), 3), **attrs}
+        self.started = time.monotonic()
+
+    def set(self, **attrs):
+        self.record.update(attrs)
+
+    def set_process(self, process, output_bytes: int):
+        """Mencatat kode exit, byte output, dan RSS puncak child (KiB) dari process yang sudah selesai.
+
+        ru_maxrss ikut menghitung halaman yang diwarisi dari fork sebelum exec, jadi child yang
+        sangat kecil tampak sebesar RSS tool ini; untuk apt/rustc/prover nilainya akurat.
+        """
+        rusage = getattr(process, 'rusage', None)
+        self.set(exitCode=process.returncode, bytes=output_bytes, maxRssKb=rusage.ru_maxrss if rusage else None)
+
+    def finish(self, error: Optional[BaseException] = None):
+        import time
+        record = self.record
+        record['seconds'] = round(time.monotonic() - self.started, 6)
+        if error is not None:
+            record['error'] = type(error).__name__
+        record['ok'] = error is None and record.get('ok', True) and record.get('exitCode') in (None, 0)
+        fd = open_trace_file()
+        if fd is not None:
+            record['run'] = trace_run_id
+            os.write(fd, (json.dumps(record, default=str) + '\n').encode())
+
+def current_span() -> Optional[Span]:
+    """Span aktif di thread ini; diteruskan sebagai parent ke span di thread worker."""
+    stack = getattr(trace_local, 'stack', None)
+    return stack[-1] if stack else None
+
+def start_span(name: str, parent: Optional[Span] = None, **attrs) -> Span:
+    """Span tanpa context manager (mis. beberapa perintah paralel); default parent adalah span aktif."""
+    parent = parent or current_span()
+    return Span(name, parent.record['id'] if parent else None, attrs)
+
+class trace_span:
+    """Context manager span; span di dalamnya menjadi child. Exception dicatat lalu diteruskan."""
+
+    def __init__(self, name: str, parent: Optional[Span] = None, **attrs):
+        self.name = name
+        self.parent = parent
+        self.attrs = attrs
+
+    def __enter__(self) -> Span:
+        self.span = start_span(self.name, self.parent, **self.attrs)
+        if not hasattr(trace_local, 'stack'):
+            trace_local.stack = []
+        trace_local.stack.append(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb):
+        trace_local.stack.remove(self.span)
+        self.span.finish(exc if exc_type and not issubclass(exc_type, SystemExit) else None)
+        return False
+
+def rusage_popen(*args, **kwargs):
+    """Popen yang menunggu child dengan os.wait4 sehingga rusage child (RSS puncak) tersedia.
+
+    Popen me-reap child lewat dua hook privat: _try_wait (wait/communicate) dan
+    _internal_poll (poll, send_signal). Keduanya diarahkan ke wait4 agar RSS puncak tidak
+    hilang saat child di-reap oleh poll(), mis. di jalur CTRL+C run_commands.
+
+    Kelasnya dibuat saat pertama dipakai agar perintah yang tidak menjalankan proses
+    (status, list, history, ...) tidak perlu meng-import subprocess saat startup.
+    """
+    global rusage_popen_class
+    if rusage_popen_class is None:
+        import subprocess
+
+        class RusagePopen(subprocess.Popen):
+            rusage = None
+
+            def _wait4(self, pid, wait_flags):
+                pid, status, rusage = os.wait4(pid, wait_flags)
+                if pid == self.pid:
+                    self.rusage = rusage
+                return pid, status
+
+            def _try_wait(self, wait_flags):
+                try:
+                    return self._wait4(self.pid, wait_flags)
+                except ChildProcessError:
+                    return self.pid, 0
+
+            def _internal_poll(self, _deadstate=None, **kwargs):
+                return super()._internal_poll(_deadstate, _waitpid=self._wait4)
+        rusage_popen_class = RusagePopen
+    return rusage_popen_class(*args, **kwargs)
+
+def command_program(command) -> str:
+    """Nama program sebuah perintah (tanpa sudo/VAR=nilai) untuk nama span."""
+    words = command.split() if isinstance(command, str) else [str(c) for c in command]
+    for word in words:
+        if word != 'sudo' and '=' not in word:
+            return os.path.basename(word)
+    return 'sh'
+
+def run_traced(name: str, args, input=None, timeout: Optional[float] = None, check: bool = False,
+               capture_output: bool = False, **kwargs):
+    """Pengganti subprocess.run yang mencatat span (kode exit, byte output, RSS puncak child)."""
+    import subprocess
+    import shlex
+    if capture_output:
+        kwargs['stdout'] = kwargs['stderr'] = subprocess.PIPE
+    if input is not None:
+        kwargs['stdin'] = subprocess.PIPE
+    text = args if isinstance(args, str) else shlex.join(str(a) for a in args)
+    with trace_span(name, command=text[:TRACE_COMMAND_CHARS]) as span:
+        with rusage_popen(args, **kwargs) as process:
+            try:
+                stdout, stderr = process.communicate(input, timeout=timeout)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.communicate()
+                span.set_process(process, 0)
+                raise
+        span.set_process(process, sum(len(o) for o in (stdout, stderr) if o))
+    if check and process.returncode:
+        raise subprocess.CalledProcessError(process.returncode, args, stdout, stderr)
+    return subprocess.CompletedProcess(args, process.returncode, stdout, stderr)
+
+def run_profiled(func, *args):
+    """Menjalankan func di bawah cProfile; statistik disimpan (.prof) dan ringkasannya dicetak ke stderr."""
+    import cProfile
+    import pstats
+    import time
+    path = os.path.join(trace_dir(), f"profile-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.prof")
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(func, *args)
+    finally:
+        profiler.dump_stats(path)
+        pstats.Stats(profiler, stream=sys.stderr).sort_stats('cumulative').print_stats(PROFILE_TOP)
+        print(color_log(f"Profil disimpan di {path} (buka dengan: python3 -m pstats {path})", 'cyan'), file=sys.stderr)
+
+def read_trace_spans(since: Optional[float] = None):
+    """Menghasilkan span tersimpan, dimulai dari file harian yang mungkin berisi span setelah `since`."""
+    import time
+    first = time.strftime('%Y%m%d', time.localtime(since)) if since else ''
+    for name in sorted(os.listdir(trace_dir())):
+        if not (name.startswith('trace-') and name.endswith('.jsonl')) or name[6:14] < first:
+            continue
+        with open(os.path.join(trace_dir(), name)) as f:
+            for line in f:
+                try:
+                    span = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Baris terakhir yang terpotong
+                if not since or span['start'] >= since:
+                    yield span
+
+def summarize_trace(since: Optional[float] = None, pattern: Optional[str] = None, sort: str = 'p95',
+                    limit: int = 20) -> List[dict]:
+    """Mengelompokkan span per nama dan mengurutkan langkah yang paling lambat."""
+    import fnmatch
+    groups = {}
+    for span in read_trace_spans(since):
+        if pattern and not fnmatch.fnmatchcase(span['name'], pattern):
+            continue
+        groups.setdefault(span['name'], []).append(span)
+    rows = []
+    for name, spans in groups.items():
+        durations = sorted(s['seconds'] for s in spans)
+        slowest = max(spans, key=lambda s: s['seconds'])
+        rss = [s['maxRssKb'] for s in spans if s.get('maxRssKb')]
+        rows.append({
+            'name': name,
+            'count': len(spans),
+            'runs': len({s.get('run') for s in spans}),
+            'failed': sum(1 for s in spans if not s.get('ok', True)),
+            'total': round(sum(durations), 3),
+            'mean': round(sum(durations) / len(durations), 3),
+            'p95': round(durations[min(len(durations) - 1, int(len(durations) * 0.95))], 3),
+            'max': round(durations[-1], 3),
+            'maxRssKb': max(rss) if rss else None,
+            'slowest': {'run': slowest.get('run'), 'command': slowest.get('command')},
+        })
+    rows.sort(key=lambda r: r[sort], reverse=True)
+    return rows[:limit] if limit else rows
+
+def print_trace_summary(rows: List[dict]):
+    """Mencetak ringkasan trace sebagai tabel."""
+    if not rows:
+        print(color_log("Belum ada span tercatat untuk filter ini.", 'yellow'))
+        return
+    width = max(len('LANGKAH'), *(len(r['name']) for r in rows))
+    print(f"{'LANGKAH':<{width}}  {'JUMLAH':>6}  {'GAGAL':>5}  {'RATA2':>8}  {'P95':>8}  {'MAKS':>8}  {'RSS MAKS':>9}")
+    for r in rows:
+        rss = f"{r['maxRssKb'] / 1024:.1f}MB" if r['maxRssKb'] else '-'
+        failed = color_log(f"{r['failed']:>5}", 'red') if r['failed'] else f"{r['failed']:>5}"
+        print(f"{r['name']:<{width}}  {r['count']:>6}  {failed}  {r['mean']:>7.3f}s  {r['p95']:>7.3f}s  "
+              f"{r['max']:>7.3f}s  {rss:>9}")
+
+def show_trace_summary_menu():
+    """Menu interaktif ringkasan langkah paling lambat."""
+    since = get_input("Rentang waktu (mis. 1h, 1d, 7d) [7d]: ").strip() or '7d'
+    try:
+        rows = summarize_trace(parse_time_arg(since))
+    except ValueError:
+        print(color_log("Format waktu tidak valid.\n", 'red'))
+        return
+    print_trace_summary(rows)
+
 def get_user_home() -> str:
     """Mendapatkan direktori home pengguna yang menjalankan sudo."""
     sudo_user = os.getenv('SUDO_USER')
@@ -78,42 +516,406 @@ def find_executable(command: str, user_home: Optional[str] = None) -> Optional[s
         if os.path.isfile(full_path) and os.access(full_path, os.X_OK):
             return full_path
     
+    return None
+
+def executable_cache_path() -> str:
+    """File cache hasil pencarian executable di direktori state tool."""
+    return os.path.join(get_state_dir(), 'executables.json')
+
+def load_executable_cache() -> dict:
+    """Memuat cache executable dari disk (sekali per proses)."""
+    global executable_cache
+    if executable_cache is None:
+        try:
+            with open(executable_cache_path()) as f:
+                executable_cache = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            executable_cache = {}
+    return executable_cache
+
+def save_executable_cache(cache: dict):
+    """Menyimpan cache executable; best-effort, karena cache hanya mempercepat pencarian.
+
+    Direktori state yang read-only (mis. dijalankan tanpa sudo) tidak boleh membuat
+    perintah baca seperti `status` gagal.
+    """
     try:
-        which_output = subprocess.check_output(['which', command], text=True).strip()
-        if which_output and os.access(which_output, os.X_OK):
-            return which_output
-    except (subprocess.CalledProcessError, FileNotFoundError):
+        write_json_atomic(executable_cache_path(), cache)
+    except OSError:
         pass
-    
-    return None
+
+def resolve_executable(command: str, user_home: Optional[str] = None) -> Optional[str]:
+    """Seperti find_executable, tetapi memakai cache yang dikunci dengan path dan mtime binary.
+
+    Jika binary yang tersimpan masih ada dan mtime-nya sama, hanya perlu satu stat()
+    tanpa memindai PATH. Cache dihapus setiap kali versi Nexus CLI diganti.
+    """
+    cache = load_executable_cache()
+    entry = cache.get(command)
+    if entry:
+        try:
+            if os.stat(entry['path']).st_mtime_ns == entry['mtime'] and os.access(entry['path'], os.X_OK):
+                return entry['path']
+        except OSError:
+            pass
+    # Hanya pencarian PATH yang dicatat sebagai span; cache hit terlalu murah untuk dilacak.
+    with trace_span('lookup.executable', executable=command) as span:
+        path = find_executable(command, user_home)
+        span.set(found=path is not None)
+    if path is None:
+        if cache.pop(command, None):
+            save_executable_cache(cache)
+        return None
+    cache[command] = {'path': path, 'mtime': os.stat(path).st_mtime_ns}
+    save_executable_cache(cache)
+    return path
+
+def get_cli_version() -> Optional[str]:
+    """Versi nexus-network, di-cache bersama path dan mtime agar tidak fork setiap kali."""
+    global nexus_cli_path
+    if not nexus_cli_path:
+        return None
+    cache = load_executable_cache()
+    entry = next((e for e in cache.values() if e.get('path') == nexus_cli_path), None)
+    if entry and 'version' in entry:
+        return entry['version']
+    import subprocess
+    try:
+        output = run_traced('nexus.version', [nexus_cli_path, '--version'], capture_output=True, text=True,
+                            timeout=10).stdout
+        version = output.strip().splitlines()[0] if output.strip() else None
+    except (OSError, subprocess.TimeoutExpired):
+        version = None
+    if entry:
+        entry['version'] = version
+        save_executable_cache(cache)
+    return version
+
+def invalidate_executable_cache():
+    """Menghapus cache executable, mis. setelah Nexus CLI diperbarui."""
+    global executable_cache
+    executable_cache = {}
+    try:
+        os.remove(executable_cache_path())
+    except OSError:
+        pass
+
+def resolve_nexus_cli() -> Optional[str]:
+    """Binary versi terkelola (lihat upgrade_nexus_cli) jika ada, selain itu hasil pencarian PATH."""
+    managed = managed_cli_path()
+    return resolve_executable(managed if os.access(managed, os.X_OK) else 'nexus-network', user_home)
+
+def init_paths():
+    """Mengisi variabel global path (home, config, executable) untuk proses ini."""
+    global user_home, config_file, screen_path, nexus_cli_path, taskset_path
+    user_home = get_user_home()
+    config_file = os.path.join(user_home, '.nexus_tool_config.json')
+    screen_path = resolve_executable('screen')
+    taskset_path = resolve_executable('taskset')
+    nexus_cli_path = resolve_nexus_cli()
+
+def clear_screen():
+    """Membersihkan layar dengan escape ANSI (tanpa fork 'clear')."""
+    sys.stdout.write("\033[H\033[2J\033[3J")
+    sys.stdout.flush()
 
 def get_input(prompt: str) -> str:
     """Menangani input pengguna dengan pesan yang dikodekan."""
     return input(color_log(prompt, 'cyan'))
 
 # --- Fungsi untuk Manajemen Konfigurasi ---
-def save_configuration():
-    """Menyimpan konfigurasi ke file JSON."""
-    global config_file, wallet_address, node_id
-    config = {'walletAddress': wallet_address, 'nodeId': node_id}
-    try:
-        with open(config_file, 'w') as f:
-            json.dump(config, f, indent=4)
-    except IOError as e:
+# Konfigurasi disimpan di SQLite (mode WAL) di direktori state tool. File JSON lama
+# (~/.nexus_tool_config.json) dimigrasikan sekali lalu diganti nama menjadi *.migrated.
+STORE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS settings (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS wallets (
+    address TEXT PRIMARY KEY,
+    registered_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS nodes (
+    node_id TEXT PRIMARY KEY,
+    threads INTEGER,
+    tags TEXT NOT NULL DEFAULT '',
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS launches (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    node_id TEXT NOT NULL,
+    session TEXT NOT NULL,
+    threads INTEGER,
+    pid INTEGER,
+    started_at REAL NOT NULL,
+    stopped_at REAL,
+    exit_code INTEGER
+);
+CREATE INDEX IF NOT EXISTS launches_node_idx ON launches (node_id, started_at);
+CREATE INDEX IF NOT EXISTS launches_session_idx ON launches (session, started_at);
+CREATE INDEX IF NOT EXISTS launches_active_idx ON launches (session) WHERE stopped_at IS NULL;
+CREATE TABLE IF NOT EXISTS run_stats (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    launch_id INTEGER REFERENCES launches (id),
+    node_id TEXT NOT NULL,
+    session TEXT NOT NULL,
+    recorded_at REAL NOT NULL,
+    proofs_ok INTEGER,
+    proofs_failed INTEGER,
+    proofs_per_min REAL,
+    peak_rss_kb INTEGER
+);
+CREATE INDEX IF NOT EXISTS run_stats_node_idx ON run_stats (node_id, recorded_at);
+CREATE INDEX IF NOT EXISTS run_stats_session_idx ON run_stats (session, recorded_at);
+CREATE TABLE IF NOT EXISTS node_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    node_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    recorded_at REAL NOT NULL,
+    reason TEXT NOT NULL,
+    detail TEXT
+);
+CREATE INDEX IF NOT EXISTS node_events_node_idx ON node_events (node_id, recorded_at);
+"""
+
+def store_path() -> str:
+    """Path database SQLite tool."""
+    return os.path.join(get_state_dir(), 'nexus_tool.db')
+
+def open_store():
+    """Membuka (dan menyiapkan) koneksi SQLite milik proses ini."""
+    global store_connection
+    if store_connection is None:
+        import sqlite3
+        db = sqlite3.connect(store_path(), timeout=30, isolation_level=None, check_same_thread=False)
+        db.row_factory = sqlite3.Row
+        db.execute('PRAGMA journal_mode=WAL')
+        db.execute('PRAGMA synchronous=NORMAL')
+        db.execute('PRAGMA foreign_keys=ON')
+        db.executescript(STORE_SCHEMA)
+        store_connection = db
+        migrate_json_config(db)
+    return store_connection
+
+class store_transaction:
+    """Context manager transaksi tulis (BEGIN IMMEDIATE) yang aman dipakai dari beberapa thread."""
+
+    def __init__(self, db):
+        self.db = db
+
+    def __enter__(self):
+        store_lock.acquire()
+        try:
+            self.db.execute('BEGIN IMMEDIATE')
+        except BaseException:
+            # BEGIN gagal (mis. database sibuk): lepaskan lock agar tulisan berikutnya tidak deadlock.
+            store_lock.release()
+            raise
+        return self.db
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self.db.execute('ROLLBACK' if exc_type else 'COMMIT')
+        except BaseException:
+            # COMMIT gagal: batalkan transaksi agar BEGIN berikutnya di koneksi ini tidak ditolak.
+            if self.db.in_transaction:
+                self.db.execute('ROLLBACK')
+            raise
+        finally:
+            store_lock.release()
+        return False
+
+def migrate_json_config(db):
+    """Memindahkan konfigurasi JSON lama ke SQLite (hanya sekali)."""
+    import time
+    if not config_file or not os.path.exists(config_file):
+        return
+    if db.execute("SELECT 1 FROM settings WHERE key = 'migratedFrom'").fetchone():
+        return
+    try:
+        with open(config_file) as f:
+            config = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return
+    now = time.time()
+    with store_transaction(db):
+        rows = [('walletAddress', json.dumps(config.get('walletAddress'))),
+                ('nodeId', json.dumps(config.get('nodeId'))),
+                ('migratedFrom', json.dumps(config_file))]
+        rows.extend((f'settings.{key}', json.dumps(value)) for key, value in (config.get('settings') or {}).items())
+        db.executemany('INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)', rows)
+        if config.get('walletAddress'):
+            db.execute('INSERT OR IGNORE INTO wallets (address, registered_at) VALUES (?, ?)',
+                       (config['walletAddress'], now))
+        db.executemany('INSERT OR IGNORE INTO nodes (node_id, threads, created_at) VALUES (?, ?, ?)',
+                       [(n['nodeId'], n.get('threads'), now) for n in config.get('nodes', []) if n.get('nodeId')])
+    os.replace(config_file, config_file + '.migrated')
+
+def current_setting_rows() -> dict:
+    """Konfigurasi di memori dalam bentuk baris tabel settings (nilai JSON)."""
+    rows = {'walletAddress': json.dumps(wallet_address), 'nodeId': json.dumps(node_id)}
+    rows.update((f'settings.{key}', json.dumps(value, sort_keys=True)) for key, value in tool_settings.items())
+    return rows
+
+def save_configuration() -> bool:
+    """Menyimpan konfigurasi ke database. Mengembalikan False (dan mengisi store_error) jika gagal.
+
+    Hanya kunci yang berubah sejak dimuat yang ditulis, sehingga beberapa instance
+    yang mengubah pengaturan berbeda tidak saling menimpa.
+    """
+    global stored_settings, store_error
+    import sqlite3
+    import time
+    rows = current_setting_rows()
+    changed = [(key, value) for key, value in rows.items() if stored_settings.get(key) != value]
+    removed = [(key,) for key in stored_settings if key.startswith('settings.') and key not in rows]
+    if not changed and not removed:
+        return True
+    try:
+        db = open_store()
+        with store_transaction(db):
+            db.executemany('INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)', changed)
+            db.executemany('DELETE FROM settings WHERE key = ?', removed)
+            if wallet_address and ('walletAddress', rows['walletAddress']) in changed:
+                db.execute('INSERT OR IGNORE INTO wallets (address, registered_at) VALUES (?, ?)',
+                           (wallet_address, time.time()))
+        stored_settings = rows
+        return True
+    except (sqlite3.Error, OSError) as e:
+        store_error = str(e)
         print(color_log(f"❌ Gagal menyimpan konfigurasi: {e}", 'red'))
+        return False
+
+def store_load_nodes() -> List[dict]:
+    """Memuat daftar node fleet sesuai urutan penambahan."""
+    rows = open_store().execute('SELECT node_id, threads, tags FROM nodes ORDER BY rowid')
+    return [{'nodeId': r['node_id'], 'threads': r['threads'],
+             'tags': [t for t in r['tags'].split(',') if t]} for r in rows]
+
+def append_fleet_nodes(new_nodes: List[dict]):
+    """Menambahkan node ke fleet dalam satu transaksi; Node ID yang sudah ada diabaikan."""
+    global fleet_nodes
+    import time
+    db = open_store()
+    with store_transaction(db):
+        db.executemany('INSERT INTO nodes (node_id, threads, tags, created_at) VALUES (?, ?, ?, ?) '
+                       'ON CONFLICT (node_id) DO NOTHING',
+                       [(n['nodeId'], n.get('threads'), ','.join(n.get('tags', [])), time.time()) for n in new_nodes])
+    fleet_nodes = store_load_nodes()
+
+def remove_fleet_nodes(node_ids: List[str]):
+    """Menghapus node dari fleet."""
+    global fleet_nodes
+    db = open_store()
+    with store_transaction(db):
+        db.executemany('DELETE FROM nodes WHERE node_id = ?', [(i,) for i in node_ids])
+    fleet_nodes = store_load_nodes()
+
+def update_fleet_node(target_id: str, **fields):
+    """Memperbarui kolom 'threads' dan/atau 'tags' satu node fleet."""
+    global fleet_nodes
+    db = open_store()
+    with store_transaction(db):
+        if 'threads' in fields:
+            db.execute('UPDATE nodes SET threads = ? WHERE node_id = ?', (fields['threads'], target_id))
+        if 'tags' in fields:
+            db.execute('UPDATE nodes SET tags = ? WHERE node_id = ?', (','.join(fields['tags']), target_id))
+    fleet_nodes = store_load_nodes()
+
+def record_launch(launch_node_id: str, session: str, threads: Optional[int] = None,
+                  pid: Optional[int] = None) -> Optional[int]:
+    """Mencatat peluncuran node ke riwayat. Mengembalikan id peluncuran."""
+    import sqlite3
+    import time
+    try:
+        db = open_store()
+        with store_transaction(db):
+            cursor = db.execute('INSERT INTO launches (node_id, session, threads, pid, started_at) VALUES (?, ?, ?, ?, ?)',
+                                (launch_node_id, session, threads, pid, time.time()))
+        return cursor.lastrowid
+    except sqlite3.Error:
+        return None
+
+def record_launch_end(launch_id: Optional[int], exit_code: Optional[int], stats: Optional[dict] = None):
+    """Menandai peluncuran selesai dan menyimpan statistik run-nya."""
+    import sqlite3
+    import time
+    if launch_id is None:
+        return
+    try:
+        db = open_store()
+        with store_transaction(db):
+            now = time.time()
+            db.execute('UPDATE launches SET stopped_at = ?, exit_code = ? WHERE id = ?', (now, exit_code, launch_id))
+            if stats:
+                db.execute('INSERT INTO run_stats (launch_id, node_id, session, recorded_at, proofs_ok, proofs_failed, '
+                           'proofs_per_min, peak_rss_kb) SELECT id, node_id, session, ?, ?, ?, ?, ? FROM launches '
+                           'WHERE id = ?', (now, stats.get('proofsOk'), stats.get('proofsFailed'),
+                                            stats.get('proofsPerMin'), stats.get('peakRssKb'), launch_id))
+    except sqlite3.Error:
+        pass
+
+def launch_history(history_node_id: Optional[str] = None, session: Optional[str] = None,
+                   limit: int = 20) -> List[dict]:
+    """Riwayat peluncuran terbaru, memakai indeks node_id/session."""
+    query, params = 'SELECT * FROM launches', []
+    if history_node_id:
+        query, params = query + ' WHERE node_id = ?', [history_node_id]
+    elif session:
+        query, params = query + ' WHERE session = ?', [session]
+    rows = open_store().execute(query + ' ORDER BY started_at DESC LIMIT ?', params + [limit])
+    return [dict(r) for r in rows]
+
+def record_node_event(event_node_id: str, kind: str, reason: str, detail: Optional[dict] = None):
+    """Mencatat tindakan otomatis (governor, watchdog) pada node beserta alasannya."""
+    import sqlite3
+    import time
+    try:
+        db = open_store()
+        with store_transaction(db):
+            db.execute('INSERT INTO node_events (node_id, kind, recorded_at, reason, detail) VALUES (?, ?, ?, ?, ?)',
+                       (event_node_id, kind, time.time(), reason, json.dumps(detail) if detail else None))
+    except sqlite3.Error:
+        pass
+
+def node_events(event_node_id: Optional[str] = None, kind: Optional[str] = None, limit: int = 20) -> List[dict]:
+    """Event node terbaru, terbaru lebih dulu."""
+    query, clauses, params = 'SELECT * FROM node_events', [], []
+    if event_node_id:
+        clauses.append('node_id = ?')
+        params.append(event_node_id)
+    if kind:
+        clauses.append('kind = ?')
+        params.append(kind)
+    if clauses:
+        query += ' WHERE ' + ' AND '.join(clauses)
+    rows = open_store().execute(query + ' ORDER BY recorded_at DESC LIMIT ?', params + [limit])
+    return [{**dict(r), 'detail': json.loads(r['detail']) if r['detail'] else None} for r in rows]
+
+def load_configuration(quiet: bool = False) -> bool:
+    """Memuat konfigurasi dari database (memigrasikan file JSON lama jika ada).
 
-def load_configuration():
-    """Memuat konfigurasi dari file JSON."""
-    global config_file, wallet_address, node_id
-    if os.path.exists(config_file):
-        try:
-            with open(config_file, 'r') as f:
-                config = json.load(f)
-                wallet_address = config.get('walletAddress')
-                node_id = config.get('nodeId')
-                print(color_log("Konfigurasi sebelumnya berhasil dimuat.\n", 'green'))
-        except (IOError, json.JSONDecodeError) as e:
-            print(color_log(f"❌ Gagal memuat konfigurasi: {e}", 'red'))
+    Mengembalikan False (dan mengisi store_error) jika database tidak dapat dibuka atau dibaca.
+    """
+    global wallet_address, node_id, fleet_nodes, tool_settings, stored_settings, store_error
+    import sqlite3
+    try:
+        db = open_store()
+        rows = {r['key']: r['value'] for r in db.execute('SELECT key, value FROM settings')}
+        wallet_address = json.loads(rows.get('walletAddress', 'null'))
+        node_id = json.loads(rows.get('nodeId', 'null'))
+        tool_settings = {key[len('settings.'):]: json.loads(value)
+                         for key, value in rows.items() if key.startswith('settings.')}
+        fleet_nodes = store_load_nodes()
+        stored_settings = current_setting_rows()
+        if rows and not quiet:
+            print(color_log("Konfigurasi sebelumnya berhasil dimuat.\n", 'green'))
+        store_error = None
+        return True
+    except (sqlite3.Error, OSError, ValueError) as e:
+        store_error = str(e)
+        print(color_log(f"❌ Gagal memuat konfigurasi: {e}", 'red'))
+        return False
             
 # --- Fungsi untuk setiap bagian menu ---
 
@@ -138,6 +940,7 @@ def check_status():
     print("- Perintah 'nexus-network': ", end='')
     if nexus_cli_path and os.access(nexus_cli_path, os.X_OK):
         print(color_log("DITEMUKAN", 'green') + f" di {color_log(nexus_cli_path, 'yellow')}")
+        print(f"  Versi: {color_log(get_cli_version() or 'tidak diketahui', 'yellow')}")
     else:
         print(color_log("TIDAK DITEMUKAN", 'red') + ". Jalankan 'Update versi Nexus CLI' (Menu Utama -> 2).")
 
@@ -145,33 +948,39 @@ def initial_setup():
     """Menjalankan instalasi awal dan setup dependensi."""
     global user_home
     print(color_log("🚀 Memulai Instalasi Awal & Setup Dependensi...\n", 'cyan'))
-    run_command("sudo apt update && sudo apt upgrade -y")
-    run_command("sudo apt install screen curl build-essential pkg-config libssl-dev git-all -y")
-    run_command("sudo apt install protobuf-compiler -y")
-    run_command("sudo apt update")
-    
-    print(color_log("\n Rust akan diinstal...\n", 'yellow'))
-    if not run_command("curl --proto '=https' --tlsv1.2 -sSf https://sh.rustup.rs | sh -s -- -y"):
+    if not run_provisioning():
         sys.exit(1)
 
     cargo_path = os.path.join(user_home, '.cargo', 'bin')
     os.environ['PATH'] = f"{cargo_path}:{os.environ['PATH']}"
-    run_command("rustup target add riscv32i-unknown-none-elf")
-
-    print(color_log("\n Menginstal Nexus CLI...\n", 'cyan'))
-    update_nexus_cli()
+    invalidate_executable_cache()
 
     print(color_log("🎉 Instalasi Awal Selesai! Jalankan ulang skrip untuk masuk ke menu utama.\n", 'green'))
     sys.exit(0)
 
 def update_nexus_cli():
-    """Memperbarui versi Nexus CLI."""
+    """Memperbarui versi Nexus CLI dengan rolling restart node yang sedang berjalan."""
     print(color_log("🔄 Memperbarui versi Nexus CLI...\n", 'cyan'))
-    run_command("curl https://cli.nexus.xyz/ | sh")
-    print(color_log("Nexus CLI telah diperbarui. Mohon jalankan ulang skrip agar path terdeteksi.\n", 'yellow'))
+    for version in list_cli_versions():
+        marker = ' (aktif)' if version['current'] else ' (sebelumnya)' if version['previous'] else ''
+        print(f"- {version['hash']} {version['version'] or '-'}{marker}")
+    choice = get_input("\n1. Unduh & rolling upgrade  2. Rollback ke versi sebelumnya  [Enter] batal: ").strip()
+    if choice not in ('1', '2'):
+        return
+    batch = get_input(f"Jumlah node per batch [{get_upgrade_settings()['batchSize']}]: ").strip()
+    batch_size = int(batch) if batch.isdigit() and int(batch) > 0 else None
+    with trace_span('menu.upgrade' if choice == '1' else 'menu.rollback'):
+        result = upgrade_nexus_cli(batch_size=batch_size) if choice == '1' else rollback_nexus_cli(batch_size)
+    if result.get('rolledBack'):
+        print(color_log(f"❌ Node {result['failed']} gagal ({result['reason']}); versi dikembalikan ke {result['rolledBack']}.\n", 'red'))
+    elif result['ok']:
+        print(color_log(f"✅ Nexus CLI versi {result['version']} aktif di {managed_cli_path()}.\n", 'green'))
+    else:
+        print(color_log(f"❌ {result.get('error') or result.get('reason')}\n", 'red'))
 
 def register_wallet():
     """Mendaftarkan alamat dompet."""
+    import shlex
     global wallet_address, nexus_cli_path
     if not nexus_cli_path:
         print(color_log("Perintah 'nexus-network' tidak ditemukan. Jalankan 'Cek Status' (#1) dan 'Update CLI' (#2).\n", 'red'))
@@ -183,13 +992,21 @@ def register_wallet():
         return
     
     wallet_address = address_input.strip()
-    command = f"{nexus_cli_path} register-user --wallet-address {subprocess.list2cmdline([wallet_address])}"
-    if run_command(command):
-        save_configuration()
+    command = f"{shlex.quote(nexus_cli_path)} register-user --wallet-address {shlex.quote(wallet_address)}"
+    with trace_span('menu.register_wallet'):
+        registered = run_command(command) and save_configuration()
+    if registered:
         print(color_log(f"Alamat wallet '{wallet_address}' telah disimpan.\n", 'yellow'))
 
+def parse_node_id(output: str) -> Optional[str]:
+    """Mengambil Node ID dari output 'register-node'."""
+    # Regex yang lebih fleksibel untuk menangkap Node ID
+    match = re.search(r'(?:Node registered successfully with ID|Successfully registered node with ID):\s*([a-zA-Z0-9\-]+)', output)
+    return match.group(1).strip() if match else None
+
 def create_node_id():
     """Membuat dan menyimpan ID node baru."""
+    import subprocess
     global node_id, nexus_cli_path
     if not nexus_cli_path:
         print(color_log("Perintah 'nexus-network' tidak ditemukan. Jalankan 'Cek Status' (#1) dan 'Update CLI' (#2).\n", 'red'))
@@ -200,15 +1017,14 @@ def create_node_id():
     
     try:
         print(color_log(f"\n▶️ Menjalankan: ", 'yellow') + command)
-        result = subprocess.run(command, shell=True, check=True, text=True, capture_output=True)
+        result = run_traced('nexus.register-node', command, shell=True, check=True, text=True, capture_output=True)
         full_output = result.stdout
         print(full_output) # Tampilkan seluruh output untuk debugging
 
         found_id = False
-        # Regex yang lebih fleksibel untuk menangkap Node ID
-        match = re.search(r'(?:Node registered successfully with ID|Successfully registered node with ID):\s*([a-zA-Z0-9\-]+)', full_output)
-        if match:
-            node_id = match.group(1).strip()
+        new_id = parse_node_id(full_output)
+        if new_id:
+            node_id = new_id
             save_configuration()
             print(color_log(f"\n✅ Node ID berhasil dibuat dan disimpan: {node_id}\n", 'green'))
             found_id = True
@@ -219,9 +1035,14 @@ def create_node_id():
     except subprocess.CalledProcessError as e:
         print(color_log(f"Gagal membuat Node ID. Pastikan wallet Anda sudah terdaftar. Kode error: {e.returncode}\n", 'red'))
 
-def start_node(background: bool = False, max_threads: Optional[int] = None):
-    """Menjalankan node."""
+def start_node(background: bool = False, max_threads: Optional[int] = None, ask=None):
+    """Menjalankan node.
+
+    `ask` menggantikan get_input untuk prompt Node ID (mis. benchmark tanpa terminal).
+    """
+    import shlex
     global node_id, screen_path, nexus_cli_path
+    ask = ask or get_input
     if background and not screen_path:
         print(color_log("Perintah 'screen' tidak ditemukan. Jalankan 'Cek Status' (#1) untuk info.\n", 'red'))
         return
@@ -234,53 +1055,96 @@ def start_node(background: bool = False, max_threads: Optional[int] = None):
     id_to_use = node_id
     if not id_to_use:
         print(color_log("Node ID belum disimpan. Masukkan secara manual.", 'yellow'))
-        id_to_use = get_input("Masukkan Node ID: ")
+        id_to_use = ask("Masukkan Node ID: ")
     else:
-        confirm = get_input(f"Gunakan Node ID yang tersimpan: {color_log(id_to_use, 'green')}? (Y/n): ").lower()
+        confirm = ask(f"Gunakan Node ID yang tersimpan: {color_log(id_to_use, 'green')}? (Y/n): ").lower()
         if confirm == 'n':
-            id_to_use = get_input("Masukkan Node ID baru: ")
+            id_to_use = ask("Masukkan Node ID baru: ")
 
     if not id_to_use.strip():
         print(color_log("Node ID tidak boleh kosong.\n", 'red'))
         return
 
-    command = [f"{nexus_cli_path}", "start", "--node-id", id_to_use.strip()]
+    with trace_span('menu.start_node', nodeId=id_to_use.strip(), background=background):
+        if max_threads is None:
+            max_threads = get_tuned_threads()
+            if max_threads:
+                print(color_log(f"Memakai {max_threads} thread hasil autotune untuk host ini.", 'cyan'))
+
+        command = build_start_command(id_to_use.strip(), max_threads)
+
+        if background:
+            print(color_log("Node ID yang akan digunakan: ", 'cyan') + color_log(id_to_use, 'yellow'))
+            screen_name = tool_screen_name(id_to_use.strip())
+            running = running_node_sessions().get(id_to_use.strip())
+            if running:
+                print(color_log(f"Node sudah berjalan di sesi screen '{running}'.\n", 'yellow'))
+                return
+            print(color_log(f"Nama sesi screen: ", 'cyan') + color_log(screen_name, 'yellow'))
+
+            if launch_in_screen(screen_name, command, id_to_use.strip(), max_threads):
+                print(color_log(f"✅ Node telah dimulai di dalam screen bernama '{screen_name}'.\n", 'green'))
+        else:
+            print(color_log("Untuk menghentikan node, tekan CTRL+C.\n", 'yellow'))
+            run_command(shlex.join(command))
+
+def build_start_command(target_id: str, max_threads: Optional[int] = None) -> List[str]:
+    """Menyusun perintah 'nexus-network start', termasuk pinning CPU jika aktif."""
+    global nexus_cli_path
+    command = [f"{nexus_cli_path}", "start", "--node-id", target_id]
     if max_threads:
         command.extend(["--max-threads", str(max_threads)])
+        if tool_settings.get('cpuPinning'):
+            reserved = held_cpus({target_id})
+            command = pin_command(command, show_cpu_placement([target_id], [max_threads], reserved, True)[0])
+    return command
 
-    if background:
-        print(color_log("Node ID yang akan digunakan: ", 'cyan') + color_log(id_to_use, 'yellow'))
-        import random
-        screen_name = f"nexus-{random.randint(100, 999)}"
-        if max_threads:
-            screen_name = f"nexus-prover-{random.randint(100, 999)}"
-        
-        print(color_log(f"Nama screen yang dibuat secara acak: ", 'cyan') + color_log(screen_name, 'yellow'))
-        
-        screen_command = " ".join([subprocess.list2cmdline(command)])
-        full_command = f"{screen_path} -S {screen_name} -dm bash -c {subprocess.list2cmdline([screen_command])}"
-        run_command(full_command)
-        print(color_log(f"✅ Node telah dimulai di dalam screen bernama '{screen_name}'.\n", 'green'))
-    else:
-        print(color_log("Untuk menghentikan node, tekan CTRL+C.\n", 'yellow'))
-        run_command(subprocess.list2cmdline(command))
+def launch_in_screen(screen_name: str, command: List[str], launch_node_id: Optional[str] = None,
+                     threads: Optional[int] = None) -> bool:
+    """Menjalankan perintah di dalam sesi screen baru yang terlepas (detached)."""
+    with trace_span('screen.launch', session=screen_name) as span:
+        ok = run_command(screen_launch_command(screen_name, command, launch_node_id), keep_log=False)
+        if ok and launch_node_id:
+            record_launch(launch_node_id, screen_name, threads, screen_live_sessions().get(screen_name))
+        span.set(ok=ok)
+    return ok
+
+def screen_launch_command(screen_name: str, command: List[str], launch_node_id: Optional[str] = None) -> str:
+    """Perintah shell 'screen -dm' untuk sebuah sesi.
+
+    Perintah di dalam sesi di-quote untuk bash -c, lalu seluruh string di-quote sekali lagi
+    untuk shell luar, sehingga nama sesi, Node ID, dan path tidak pernah ditafsirkan shell.
+    """
+    import shlex
+    global screen_path
+    screen_command = shlex.join(command)
+    if launch_node_id:
+        # Output node juga dialirkan ke log terkompresi agar tetap ada setelah sesi screen mati.
+        sink = shlex.join(tool_command('log-sink', '--node-id', launch_node_id))
+        screen_command = f"set -o pipefail; {screen_command} 2>&1 | {sink}"
+    return f"{shlex.quote(screen_path)} -S {shlex.quote(screen_name)} -dm bash -c {shlex.quote(screen_command)}"
 
 def list_screen_sessions() -> List[str]:
-    """Mendapatkan daftar sesi screen yang berjalan."""
+    """Mendapatkan daftar sesi screen yang berjalan (format pid.nama)."""
     global screen_path
     if not screen_path:
         return []
+    sessions = screen_socket_sessions()
+    if sessions is not None:
+        return sorted(f"{pid}.{name}" for name, pid in sessions.items())
 
     try:
-        output = subprocess.check_output([screen_path, '-ls'], text=True).splitlines()
-        sessions = []
-        for line in output:
-            match = re.search(r'^\s+([0-9]+\..*?)\s+\(', line)
-            if match:
-                sessions.append(match.group(1).strip())
-        return sessions
-    except (subprocess.CalledProcessError, FileNotFoundError):
+        # 'screen -ls' keluar dengan kode bukan nol meski ada sesi, jadi stdout selalu diparse.
+        output = run_traced('screen.ls', [screen_path, '-ls'], capture_output=True, text=True).stdout
+    except OSError:
         return []
+    return parse_screen_sessions(output)
+
+SCREEN_SESSION_PATTERN = re.compile(r'^\s+([0-9]+\..*?)\s+\(', re.MULTILINE)
+
+def parse_screen_sessions(output: str) -> List[str]:
+    """Mengambil nama sesi (pid.nama) dari output 'screen -ls'."""
+    return [match.strip() for match in SCREEN_SESSION_PATTERN.findall(output)]
 
 def view_screen_logs():
     """Menyambungkan ke sesi screen yang dipilih."""
@@ -309,14 +1173,20 @@ def view_screen_logs():
         if 0 <= choice_index < len(sessions):
             selected_session = sessions[choice_index]
             print(color_log(f"Menyambungkan ke sesi '{selected_session}'...\n", 'green'))
-            os.system('clear')
-            subprocess.run([screen_path, '-r', selected_session])
+            clear_screen()
+            run_traced('screen.attach', [screen_path, '-r', selected_session])
             get_input(color_log("\nKembali dari sesi screen. Tekan [Enter] untuk melanjutkan.", 'cyan'))
         else:
             print(color_log("Pilihan tidak valid.\n", 'red'))
     except ValueError:
         print(color_log("Input tidak valid.\n", 'red'))
 
+def quit_screen_session(session: str) -> bool:
+    """Menghentikan satu sesi screen."""
+    import shlex
+    global screen_path
+    return run_command(f"{shlex.quote(screen_path)} -X -S {shlex.quote(session)} quit", keep_log=False)
+
 def stop_screen():
     """Menghentikan sesi screen yang dipilih."""
     global screen_path
@@ -324,39 +1194,40 @@ def stop_screen():
         print(color_log("Perintah 'screen' tidak ditemukan. Jalankan 'Cek Status' (#1) untuk info.\n", 'red'))
         return
     print(color_log("🛑 Menghentikan sesi screen...\n", 'cyan'))
-    sessions = list_screen_sessions()
+    entries = reconcile_sessions()
 
-    if not sessions:
+    if not entries:
         print(color_log("Tidak ada sesi screen yang sedang berjalan.\n", 'yellow'))
         return
 
     print(color_log("Sesi screen yang ditemukan:\n", 'green'))
-    for i, session in enumerate(sessions, 1):
-        print(f"{i}. {color_log(session, 'yellow')}")
-
-    choice = get_input("\nPilih sesi untuk dihentikan (ketik nomornya), atau 'x' untuk kembali: ")
+    show_session_table(entries)
 
+    choice = get_input("\nPilih sesi (nomor dipisah koma, glob mis. 'nexus-fleet-*', 'tag:<tag>', 'all'), "
+                       "tambahkan ' restart' untuk restart, atau 'x' untuk kembali: ")
     if choice.lower() == 'x' or not choice.strip():
         return
-
-    try:
-        choice_index = int(choice) - 1
-        if 0 <= choice_index < len(sessions):
-            selected_session = sessions[choice_index]
-            command = f"{screen_path} -X -S {subprocess.list2cmdline([selected_session])} quit"
-            run_command(command)
-            print(color_log(f"Sesi '{selected_session}' telah dihentikan.\n", "green"))
-        else:
-            print(color_log("Pilihan tidak valid.\n", 'red'))
-    except ValueError:
-        print(color_log("Input tidak valid.\n", 'red'))
+    restart = choice.rstrip().endswith(' restart')
+    selected = select_sessions_input(entries, choice.rstrip()[:-len(' restart')] if restart else choice)
+    if not selected:
+        print(color_log("Tidak ada sesi yang cocok.\n", 'red'))
+        return
+    with trace_span('menu.restart_sessions' if restart else 'menu.stop_sessions', sessions=len(selected)):
+        results = restart_sessions(selected) if restart else stop_sessions(selected)
+    for result in results:
+        ok = result.get('restarted', result['ok']) if restart else result['ok']
+        print(color_log(f"{'✅' if ok else '❌'} {result['session']}", 'green' if ok else 'red'))
+    print(color_log(f"{sum(r['ok'] for r in results)} dari {len(results)} sesi telah "
+                    f"{'di-restart' if restart else 'dihentikan'}.\n", 'green'))
 
 def manage_glibc():
     """Mengecek dan memperbarui versi GLIBC."""
+    import subprocess
     global user_home
     print(color_log("🔎 Mengecek versi GLIBC...\n", 'cyan'))
     try:
-        output = subprocess.check_output(['ldd', '--version'], text=True).splitlines()
+        output = run_traced('glibc.ldd', ['ldd', '--version'], check=True, text=True,
+                            capture_output=True).stdout.splitlines()
         version_line = output[0]
         match = re.search(r'([0-9]+\.[0-9]+)$', version_line)
         if not match:
@@ -375,27 +1246,28 @@ def manage_glibc():
             confirm = get_input("\nSetuju untuk update ke GLIBC 2.39? (Ketik 'SETUJU'): ")
             if confirm == 'SETUJU':
                 print(color_log("Konfirmasi diterima. Memulai proses update GLIBC...", 'green'))
-                
-                original_dir = os.getcwd()
-                os.chdir(user_home) # Pindah ke home directory untuk proses
-                
-                run_command("sudo apt update")
-                run_command("sudo apt install -y gawk bison gcc make wget tar")
-                run_command("wget -c https://ftp.gnu.org/gnu/glibc/glibc-2.39.tar.gz")
-                
-                update_commands = [
-                    'tar -zxvf glibc-2.39.tar.gz',
-                    'cd glibc-2.39',
-                    'mkdir -p glibc-build',
-                    'cd glibc-build',
-                    f'../configure --prefix=/opt/glibc-2.39',
-                    'make -j$(nproc)',
-                    'sudo make install'
-                ]
-                run_command(" && ".join(update_commands))
-                
-                os.chdir(original_dir) # Kembali ke direktori awal
-                print(color_log("Proses update GLIBC selesai. Disarankan untuk me-reboot sistem Anda.", "green"))
+                print("\n1. Build GLIBC (memakai cache & build inkremental)")
+                print("2. Instal dari artefak hasil build host lain (beberapa detik)")
+                print("3. Paketkan /opt/glibc-2.39 menjadi artefak")
+                method = get_input("Pilih metode [1-3]: ").strip()
+
+                if method == '1':
+                    tarball = get_input("Path tarball lokal (kosongkan untuk unduh): ").strip() or None
+                    expected, allow_unpinned = glibc_pinned_sha256(), False
+                    if not expected:
+                        expected = get_input("SHA-256 tarball (kosongkan untuk mempercayai arsip tanpa pin): ").strip()
+                        allow_unpinned = not expected and get_input(
+                            "Tarball tidak dapat diverifikasi. Tetap lanjutkan? (y/N): ").lower() == 'y'
+                    if build_glibc(tarball, expected or None, allow_unpinned):
+                        print(color_log("Proses update GLIBC selesai. Disarankan untuk me-reboot sistem Anda.", "green"))
+                elif method == '2':
+                    default_artifact = os.path.join(glibc_cache_dir(), f'glibc-{GLIBC_VERSION}-{host_platform_id()}.tar.gz')
+                    artifact = get_input(f"Path artefak [{default_artifact}]: ").strip() or default_artifact
+                    install_glibc_artifact(artifact)
+                elif method == '3':
+                    package_glibc_artifact()
+                else:
+                    print(color_log("Pilihan tidak valid.\n", 'red'))
             else:
                 print(color_log("Update dibatalkan.\n", 'red'))
         else:
@@ -404,6 +1276,190 @@ def manage_glibc():
     except (subprocess.CalledProcessError, FileNotFoundError):
         print(color_log("Tidak dapat mengecek versi GLIBC.\n", 'red'))
 
+# --- Cache Build GLIBC ---
+GLIBC_VERSION = '2.39'
+GLIBC_URL = f'https://ftp.gnu.org/gnu/glibc/glibc-{GLIBC_VERSION}.tar.gz'
+GLIBC_PREFIX = f'/opt/glibc-{GLIBC_VERSION}'
+
+def glibc_cache_dir() -> str:
+    path = os.path.join(get_state_dir(), 'glibc')
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def host_platform_id() -> str:
+    """Identitas distro + arsitektur, mis. 'ubuntu-22.04-x86_64', untuk mencocokkan artefak."""
+    release = {}
+    try:
+        with open('/etc/os-release') as f:
+            for line in f:
+                key, _, value = line.strip().partition('=')
+                release[key] = value.strip('"')
+    except OSError:
+        pass
+    return f"{release.get('ID', 'linux')}-{release.get('VERSION_ID', 'unknown')}-{os.uname().machine}"
+
+class HashingReader:
+    """File-like yang menghitung sha256 dan (opsional) menyalin data yang dibaca ke file lain."""
+
+    def __init__(self, source, sink=None):
+        import hashlib
+        self.source = source
+        self.sink = sink
+        self.sha256 = hashlib.sha256()
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.source.read(size)
+        self.sha256.update(data)
+        if self.sink is not None:
+            self.sink.write(data)
+        return data
+
+def safe_extract(archive, destination: str):
+    """extractall dengan filter 'data' jika tersedia (menolak path absolut/traversal)."""
+    import tarfile
+    if hasattr(tarfile, 'data_filter'):
+        archive.extractall(destination, filter='data')
+    else:
+        archive.extractall(destination)
+
+def load_glibc_manifest() -> dict:
+    try:
+        with open(os.path.join(glibc_cache_dir(), 'manifest.json')) as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+def glibc_pinned_sha256(expected_sha256: Optional[str] = None) -> str:
+    """Checksum tarball GLIBC yang di-pin: argumen, pengaturan 'glibcSha256', atau hash unduhan pertama."""
+    return (expected_sha256 or tool_settings.get('glibcSha256') or load_glibc_manifest().get('sha256') or '').lower()
+
+def fetch_glibc_source(tarball: Optional[str] = None, expected_sha256: Optional[str] = None,
+                       allow_unpinned: bool = False) -> Optional[str]:
+    """Menyiapkan source tree GLIBC di cache: unduh, verifikasi sha256, lalu ekstrak secara streaming.
+
+    Arsip di-hash seluruhnya sebelum satu file pun diekstrak dan ditolak jika checksum tidak
+    cocok dengan pin (lihat glibc_pinned_sha256). Tanpa pin arsip juga ditolak kecuali
+    `allow_unpinned`; hash-nya lalu dicatat sebagai pin. Mengembalikan path source tree.
+    """
+    import shutil
+    import tarfile
+    import urllib.request
+    cache = glibc_cache_dir()
+    source_dir = os.path.join(cache, f'glibc-{GLIBC_VERSION}')
+    cached_tarball = os.path.join(cache, f'glibc-{GLIBC_VERSION}.tar.gz')
+    manifest = load_glibc_manifest()
+    expected = glibc_pinned_sha256(expected_sha256)
+
+    if os.path.exists(os.path.join(source_dir, 'configure')) and manifest.get('extracted'):
+        print(color_log("✔ Source GLIBC sudah ada di cache, ekstraksi dilewati.", 'green'))
+        return source_dir
+
+    tarball = tarball or (cached_tarball if os.path.exists(cached_tarball) else None)
+    partial = cached_tarball + '.part'
+    try:
+        if tarball:
+            digest = file_sha256(tarball)
+        else:
+            print(color_log(f"⬇️ Mengunduh {GLIBC_URL}...", 'cyan'))
+            with urllib.request.urlopen(GLIBC_URL, timeout=60) as source, open(partial, 'wb') as sink:
+                reader = HashingReader(source, sink)
+                while reader.read(1024 * 1024):
+                    pass
+            digest = reader.sha256.hexdigest()
+            tarball = partial
+    except OSError as e:
+        print(color_log(f"❌ Gagal mengambil tarball GLIBC: {e}\n", 'red'))
+        if os.path.exists(partial):
+            os.remove(partial)
+        return None
+
+    if digest != expected and (expected or not allow_unpinned):
+        if expected:
+            print(color_log(f"❌ Checksum tidak cocok: {digest} (diharapkan {expected}).\n", 'red'))
+        else:
+            print(color_log(f"❌ Belum ada checksum GLIBC yang di-pin (arsip ini: {digest}). Berikan --sha256, "
+                            f"atau --allow-unpinned untuk mempercayai arsip ini.\n", 'red'))
+        if tarball == partial:
+            os.remove(partial)
+        return None
+    if tarball == partial:
+        os.replace(partial, cached_tarball)
+        tarball = cached_tarball
+
+    print(color_log(f"📦 Mengekstrak {tarball} (streaming)...", 'cyan'))
+    try:
+        with tarfile.open(tarball, mode='r|gz') as archive:
+            safe_extract(archive, cache)
+    except (OSError, tarfile.TarError) as e:
+        print(color_log(f"❌ Gagal mengekstrak source GLIBC: {e}\n", 'red'))
+        shutil.rmtree(source_dir, ignore_errors=True)
+        return None
+    manifest.update({'sha256': digest, 'extracted': True})
+    write_json_atomic(os.path.join(cache, 'manifest.json'), manifest)
+    print(color_log(f"✔ sha256 {digest}", 'green'))
+    return source_dir
+
+def build_glibc(tarball: Optional[str] = None, expected_sha256: Optional[str] = None,
+                allow_unpinned: bool = False) -> bool:
+    """Build dan instal GLIBC ke GLIBC_PREFIX memakai build tree yang di-cache (inkremental)."""
+    import shlex
+    if not run_command("sudo apt install -y gawk bison gcc make tar"):
+        return False
+    source_dir = fetch_glibc_source(tarball, expected_sha256, allow_unpinned)
+    if not source_dir:
+        return False
+    build_dir = os.path.join(source_dir, 'glibc-build')
+    os.makedirs(build_dir, exist_ok=True)
+    steps = [f"cd {shlex.quote(build_dir)}"]
+    if os.path.exists(os.path.join(build_dir, 'config.status')):
+        print(color_log("✔ Build tree sudah dikonfigurasi, configure dilewati (build inkremental).", 'green'))
+    else:
+        steps.append(f"../configure --prefix={GLIBC_PREFIX}")
+    steps.extend(['make -j$(nproc)', 'sudo make install'])
+    return run_command(" && ".join(steps))
+
+def package_glibc_artifact(destination: Optional[str] = None) -> Optional[str]:
+    """Memaketkan GLIBC_PREFIX yang sudah terinstal menjadi artefak untuk host lain dengan distro sama."""
+    import tarfile
+    import time
+    if not os.path.isdir(GLIBC_PREFIX):
+        print(color_log(f"{GLIBC_PREFIX} belum ada. Build GLIBC terlebih dahulu.\n", 'red'))
+        return None
+    platform_id = host_platform_id()
+    destination = destination or os.path.join(glibc_cache_dir(), f'glibc-{GLIBC_VERSION}-{platform_id}.tar.gz')
+    manifest = json.dumps({'version': GLIBC_VERSION, 'prefix': GLIBC_PREFIX, 'platform': platform_id,
+                           'createdAt': time.time()}).encode()
+    import io
+    with tarfile.open(destination + '.part', 'w:gz', compresslevel=6) as archive:
+        info = tarfile.TarInfo('glibc-artifact.json')
+        info.size = len(manifest)
+        archive.addfile(info, io.BytesIO(manifest))
+        archive.add(GLIBC_PREFIX, arcname=GLIBC_PREFIX.lstrip('/'))
+    os.replace(destination + '.part', destination)
+    print(color_log(f"✅ Artefak GLIBC dibuat: {destination}\n", 'green'))
+    return destination
+
+def install_glibc_artifact(artifact: str, force: bool = False) -> bool:
+    """Menginstal artefak GLIBC ke '/' setelah memastikan distro dan arsitekturnya cocok."""
+    import tarfile
+    try:
+        with tarfile.open(artifact, 'r:gz') as archive:
+            manifest = json.load(archive.extractfile('glibc-artifact.json'))
+            if manifest.get('platform') != host_platform_id() and not force:
+                print(color_log(f"❌ Artefak untuk {manifest.get('platform')}, host ini {host_platform_id()}.\n", 'red'))
+                return False
+            prefix = manifest['prefix'].lstrip('/')
+            members = [m for m in archive.getmembers() if m.name == prefix or m.name.startswith(prefix + '/')]
+            if hasattr(tarfile, 'data_filter'):
+                archive.extractall('/', members=members, filter='data')
+            else:
+                archive.extractall('/', members=members)
+    except (OSError, KeyError, tarfile.TarError, json.JSONDecodeError) as e:
+        print(color_log(f"❌ Gagal menginstal artefak: {e}\n", 'red'))
+        return False
+    print(color_log(f"✅ GLIBC {manifest['version']} terinstal di {manifest['prefix']} dari artefak.\n", 'green'))
+    return True
+
 def manage_swap():
     """Membuat dan mengaktifkan swap file."""
     print(color_log("💾 Mengelola Swap File untuk Mengatasi VPS 'Killed'...\n", 'cyan'))
@@ -412,22 +1468,46 @@ def manage_swap():
     print("1. 4G (Untuk VPS dengan RAM 4GB atau kurang)")
     print("2. 8G (Untuk VPS dengan RAM 8GB)")
     print("3. 16G (Untuk VPS dengan RAM 16GB atau lebih)")
+    print("4. " + color_log("Otomatis", 'green') + " (Dihitung dari RSS puncak node yang terukur)")
     
-    choice = get_input("Masukkan pilihan Anda [1-3]: ")
+    choice = get_input("Masukkan pilihan Anda [1-4]: ")
     size = ''
 
     if choice == '1': size = '4G'
     elif choice == '2': size = '8G'
     elif choice == '3': size = '16G'
+    elif choice == '4':
+        peaks = list(load_memory_peaks().values())
+        if not peaks:
+            tuned = tool_settings.get('autotune', {}).get(get_host_key(), {})
+            peaks = [int(t['peakRssMb'] * 1024) for t in tuned.get('trials', []) if t['threads'] == tuned.get('threads')]
+        if not peaks:
+            print(color_log("Belum ada data RSS puncak. Jalankan node lewat supervisor atau autotune terlebih dahulu.\n", 'yellow'))
+            return
+        gigabytes = recommend_swap_size(peaks)
+        print(f"Total RSS puncak terukur: {sum(peaks) // 1024} MB")
+        if not gigabytes:
+            print(color_log("RAM dan swap yang ada sudah mencukupi. Tidak perlu swap tambahan.\n", 'green'))
+            return
+        size = f'{gigabytes}G'
     else:
         print(color_log("Pilihan tidak valid.\n", 'red'))
         return
 
-    confirm = get_input(f"Anda memilih untuk membuat swap file sebesar {size}. Lanjutkan? (y/n): ")
+    use_zram = False
+    if find_executable('zramctl'):
+        use_zram = get_input("Gunakan zram (swap terkompresi di RAM) alih-alih swap file? (y/N): ").lower() == 'y'
+
+    confirm = get_input(f"Anda memilih untuk membuat {'zram' if use_zram else 'swap file'} sebesar {size}. Lanjutkan? (y/n): ")
     if confirm.lower() != 'y':
         print(color_log("Pembuatan swap dibatalkan.\n", 'red'))
         return
 
+    if use_zram:
+        if run_command(f"sudo modprobe zram && DEV=$(sudo zramctl --find --size {size}) && sudo mkswap $DEV && sudo swapon -p 100 $DEV"):
+            print(color_log(f"zram sebesar {size} berhasil dibuat dan diaktifkan.\n", 'green'))
+        return
+
     if not run_command(f"sudo fallocate -l {size} /swapfile"): return
     if not run_command("sudo chmod 600 /swapfile"): return
     if not run_command("sudo mkswap /swapfile"): return
@@ -462,40 +1542,4069 @@ def start_node_with_custom_threads():
     # Memanggil fungsi start_node dengan thread yang ditentukan
     start_node(background=True, max_threads=threads)
 
-def show_system_utilities_menu():
-    """Menampilkan submenu utilitas sistem."""
+# --- Pipeline Provisioning ---
+APT_PACKAGES = ['screen', 'curl', 'build-essential', 'pkg-config', 'libssl-dev', 'git-all', 'protobuf-compiler']
+APT_FRESH_SECONDS = 6 * 3600  # Indeks apt yang lebih baru dari ini tidak perlu di-update
+RISCV_TARGET = 'riscv32i-unknown-none-elf'
+
+class ProvisionStep:
+    """Satu langkah provisioning: perintah, dependensi, dan pemeriksaan 'sudah terpenuhi'."""
+
+    def __init__(self, name: str, title: str, command: str, deps: List[str], satisfied=None):
+        self.name = name
+        self.title = title
+        self.command = command
+        self.deps = deps
+        self.satisfied = satisfied or (lambda: False)
+
+def apt_lists_fresh() -> bool:
+    import time
+    try:
+        return time.time() - os.stat('/var/lib/apt/lists').st_mtime < APT_FRESH_SECONDS
+    except OSError:
+        return False
+
+def apt_packages_installed() -> bool:
+    try:
+        result = run_traced('provision.check.dpkg', ['dpkg-query', '-W', '-f=${db:Status-Abbrev}\n'] + APT_PACKAGES,
+                            capture_output=True, text=True)
+    except OSError:
+        return False
+    statuses = result.stdout.split()
+    return result.returncode == 0 and len(statuses) == len(APT_PACKAGES) and all(s == 'ii' for s in statuses)
+
+def rust_target_installed() -> bool:
+    import glob
+    pattern = os.path.join(user_home, '.rustup', 'toolchains', '*', 'lib', 'rustlib', RISCV_TARGET)
+    return bool(glob.glob(pattern))
+
+def provisioning_steps() -> List[ProvisionStep]:
+    """Graf langkah instalasi awal. Langkah tanpa saling ketergantungan berjalan paralel."""
+    cargo_bin = os.path.join(user_home, '.cargo', 'bin')
+    # Unduhan rustup dan Nexus CLI hanya perlu curl; jika curl sudah ada, keduanya
+    # tidak perlu menunggu instalasi paket apt.
+    download_deps = [] if find_executable('curl') else ['apt-packages']
+    return [
+        ProvisionStep('apt-update', "Update indeks apt", "sudo apt update", [], apt_lists_fresh),
+        ProvisionStep('apt-upgrade', "Upgrade paket sistem",
+                      "sudo DEBIAN_FRONTEND=noninteractive apt upgrade -y", ['apt-update']),
+        # apt memakai lock dpkg yang sama, jadi instalasi paket menunggu upgrade.
+        ProvisionStep('apt-packages', "Instal paket dependensi",
+                      f"sudo DEBIAN_FRONTEND=noninteractive apt install -y {' '.join(APT_PACKAGES)}",
+                      ['apt-upgrade'], apt_packages_installed),
+        ProvisionStep('rustup', "Instal Rust (rustup)",
+                      "curl --proto '=https' --tlsv1.2 -sSf https://sh.rustup.rs | sh -s -- -y", download_deps,
+                      lambda: os.access(os.path.join(cargo_bin, 'rustup'), os.X_OK)),
+        ProvisionStep('rust-target', f"Tambah target {RISCV_TARGET}",
+                      f"{os.path.join(cargo_bin, 'rustup')} target add {RISCV_TARGET}", ['rustup'],
+                      rust_target_installed),
+        ProvisionStep('nexus-cli', "Instal Nexus CLI", "curl https://cli.nexus.xyz/ | NONINTERACTIVE=1 sh",
+                      download_deps, lambda: bool(find_executable('nexus-network', user_home))),
+    ]
+
+def provision_state_path() -> str:
+    return os.path.join(get_state_dir(), 'provision_state.json')
+
+def run_provisioning(dry_run: bool = False, stub: Optional[str] = None, reset: bool = False) -> bool:
+    """Menjalankan graf provisioning secara bergelombang (wave) dan dapat dilanjutkan.
+
+    Langkah yang sudah selesai (file state) atau sudah terpenuhi dilewati. Setiap
+    gelombang menjalankan semua langkah yang dependensinya sudah selesai secara
+    paralel. Langkah yang gagal menghentikan turunannya saja. `stub` mengganti setiap
+    perintah (mis. "echo {command}") untuk pengujian tanpa jaringan.
+    """
+    import shlex
+    import time
+    steps = {step.name: step for step in provisioning_steps()}
+    state = {}
+    if not reset:
+        try:
+            with open(provision_state_path()) as f:
+                state = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            state = {}
+
+    done = {name for name, info in state.items() if info.get('ok') and name in steps}
+    for name, step in steps.items():
+        if name not in done and step.satisfied():
+            done.add(name)
+            print(color_log(f"✔ {step.title}: sudah terpenuhi, dilewati.", 'green'))
+    for name in sorted(done & set(state)):
+        print(color_log(f"✔ {steps[name].title}: selesai pada run sebelumnya, dilewati.", 'green'))
+
+    failed = set()
+    wave_number = 0
     while True:
-        os.system('clear')
-        print(color_log("========== MENU UTILITAS SISTEM ==========\n", 'yellow'))
-        print("1. Cek & Update Versi GLIBC")
-        print("2. Mengatasi VPS Killed (Buat Swap)")
-        print("3. Reboot VPS")
-        print("4. Kembali ke Menu Utama")
-        
-        choice = get_input("Masukkan pilihan Anda [1-4]: ")
-        
-        if choice == '1': manage_glibc()
-        elif choice == '2': manage_swap()
-        elif choice == '3': reboot_vps()
-        elif choice == '4': return
-        else: print(color_log("Pilihan tidak valid. Silakan coba lagi.\n", 'red'))
-        
-        get_input(color_log("\nTekan [Enter] untuk kembali ke menu utilitas...", 'cyan'))
+        blocked = {n for n, s in steps.items() if n not in done | failed and any(d in failed for d in s.deps)}
+        if blocked:
+            failed |= blocked
+            continue
+        ready = [s for n, s in steps.items() if n not in done and n not in failed and all(d in done for d in s.deps)]
+        if not ready:
+            break
+        wave_number += 1
+        print(color_log(f"\n▶️ Gelombang {wave_number}: " + ', '.join(s.title for s in ready), 'cyan'))
+        if dry_run:
+            for step in ready:
+                print(f"   [{step.name}] {step.command}")
+            done.update(s.name for s in ready)
+            continue
+        commands = {}
+        for step in ready:
+            commands[step.name] = stub.format(command=shlex.quote(step.command)) if stub else step.command
+        started = time.time()
+        outputs = run_commands(commands, multiplex=True, span_prefix='provision')
+        for step in ready:
+            output = outputs[step.name]
+            ok = output.returncode == 0
+            state[step.name] = {'ok': ok, 'at': time.time(), 'seconds': round(time.time() - started, 1),
+                                'log': output.log_path}
+            if ok:
+                done.add(step.name)
+                print(color_log(f"✅ {step.title} selesai.", 'green'))
+            else:
+                failed.add(step.name)
+                print(color_log(f"❌ {step.title} gagal (kode {output.returncode}). Log: {output.log_path}", 'red'))
+        write_json_atomic(provision_state_path(), state)
 
-# --- Main Program Logic ---
-def main():
-    """Logika utama program."""
-    global user_home, config_file, screen_path, nexus_cli_path
-    
-    if os.geteuid() != 0:
-        print(color_log("Error: Skrip ini harus dijalankan dengan sudo.", 'red'))
-        print(f"Silakan coba lagi dengan: {color_log('sudo python3 ' + os.path.basename(__file__), 'yellow')}")
-        sys.exit(1)
-    
-    user_home = get_user_home()
-    config_file = os.path.join(user_home, '.nexus_tool_config.json')
-    screen_path = find_executable('screen')
-    nexus_cli_path = find_executable('nexus-network', user_home)
+    if failed:
+        print(color_log(f"\nProvisioning belum lengkap. Gagal/terblokir: {', '.join(sorted(failed))}. "
+                        "Jalankan ulang untuk melanjutkan dari langkah yang gagal.\n", 'red'))
+        return False
+    return True
+
+# --- Autotune --max-threads ---
+PROOF_SUCCESS_PATTERN = re.compile(r'(?i)proof\b.*\b(submitted|completed|success)')
+TUNING_STOP_TIMEOUT = 15.0  # Detik menunggu prover trial berhenti setelah SIGTERM sebelum SIGKILL
+
+def get_host_key() -> str:
+    """Kunci host untuk menyimpan hasil autotune."""
+    return os.uname().nodename
+
+def default_thread_candidates(total: Optional[int] = None) -> List[int]:
+    """Kandidat jumlah thread: pangkat dua hingga jumlah core, plus jumlah core itu sendiri."""
+    total = total or os.cpu_count() or 1
+    candidates = []
+    threads = 1
+    while threads < total:
+        candidates.append(threads)
+        threads *= 2
+    candidates.append(total)
+    return candidates
+
+def run_tuning_trial(binary: str, trial_node_id: str, threads: int, duration: float) -> dict:
+    """Menjalankan prover selama `duration` detik dan mengukur proofs/min serta RSS puncak."""
+    import subprocess
+    import selectors
+    import signal
+    import time
+
+    command = [binary, "start", "--node-id", trial_node_id, "--max-threads", str(threads)]
+    started = time.monotonic()
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                               stdin=subprocess.DEVNULL, start_new_session=True)
+    proofs = 0
+    buffer = b''
+    selector = selectors.DefaultSelector()
+    selector.register(process.stdout, selectors.EVENT_READ)
+    deadline = started + duration
+    eof = False
+    while not eof:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        if not selector.select(timeout=remaining):
+            continue
+        chunk = os.read(process.stdout.fileno(), 65536)
+        if not chunk:
+            eof = True
+        buffer += chunk
+        *lines, buffer = buffer.split(b'\n')
+        proofs += sum(1 for line in lines if PROOF_SUCCESS_PATTERN.search(line.decode(errors='replace')))
+    if buffer and PROOF_SUCCESS_PATTERN.search(buffer.decode(errors='replace')):
+        proofs += 1
+    elapsed = time.monotonic() - started
+    selector.close()
+
+    # Direap dengan wait4 (bukan poll/wait milik Popen) agar rusage, termasuk RSS puncak, ikut terbaca.
+    # Output yang tertutup sebelum durasi habis berarti prover sudah (sedang) keluar sendiri.
+    pid, status, rusage = os.wait4(process.pid, os.WNOHANG)
+    exited_early = eof or pid != 0
+    if not exited_early:
+        try:
+            os.killpg(process.pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+    stop_deadline = time.monotonic() + TUNING_STOP_TIMEOUT
+    while not pid and time.monotonic() < stop_deadline:
+        time.sleep(0.05)
+        pid, status, rusage = os.wait4(process.pid, os.WNOHANG)
+    if not pid:
+        # Prover mengabaikan SIGTERM atau macet saat berhenti.
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        _, status, rusage = os.wait4(process.pid, 0)
+    process.returncode = os.waitstatus_to_exitcode(status)
+    process.stdout.close()
+
+    return {
+        'threads': threads,
+        'proofs': proofs,
+        'proofsPerMin': round(proofs * 60.0 / max(elapsed, 1e-6), 3),
+        'peakRssMb': round(rusage.ru_maxrss / 1024.0, 1),
+        'seconds': round(elapsed, 1),
+        'killed': exited_early and process.returncode == -signal.SIGKILL,
+        'exitedEarly': exited_early,
+    }
+
+def autotune_threads(binary: str, trial_node_id: str, candidates: List[int], duration: float) -> Optional[dict]:
+    """Menjalankan trial untuk setiap kandidat thread dan menyimpan setting terbaik untuk host ini."""
+    trials = []
+    for threads in candidates:
+        print(color_log(f"⏱️ Trial {threads} thread selama {duration:.0f} detik...", 'cyan'))
+        trial = run_tuning_trial(binary, trial_node_id, threads, duration)
+        trials.append(trial)
+        note = color_log(" (KILLED - kehabisan memori)", 'red') if trial['killed'] else ''
+        print(f"   {trial['proofsPerMin']} proofs/min, RSS puncak {trial['peakRssMb']} MB{note}")
+        if trial['killed']:
+            print(color_log("Menghentikan autotune: thread lebih banyak akan ikut kehabisan memori.", 'yellow'))
+            break
+
+    healthy = [t for t in trials if not t['exitedEarly']]
+    if not healthy:
+        print(color_log("Tidak ada trial yang berjalan stabil. Setting tidak disimpan.\n", 'red'))
+        return None
+    best = max(healthy, key=lambda t: (t['proofsPerMin'], -t['threads']))
+    result = {'threads': best['threads'], 'proofsPerMin': best['proofsPerMin'], 'trials': trials}
+    tool_settings.setdefault('autotune', {})[get_host_key()] = result
+    save_configuration()
+    print(color_log(f"\n✅ Setting terbaik: {best['threads']} thread ({best['proofsPerMin']} proofs/min). "
+                    "Disimpan sebagai default untuk host ini.\n", 'green'))
+    return result
+
+def get_tuned_threads() -> Optional[int]:
+    """Jumlah thread hasil autotune untuk host ini, jika ada."""
+    tuned = tool_settings.get('autotune', {}).get(get_host_key())
+    return tuned.get('threads') if tuned else None
+
+def run_autotune():
+    """Menu interaktif autotune --max-threads."""
+    global nexus_cli_path
+    print(color_log("🎯 Autotune --max-threads\n", 'cyan'))
+    binary = get_input("Path binary prover (kosongkan untuk nexus-network): ").strip() or nexus_cli_path
+    if not binary or not os.access(binary, os.X_OK):
+        print(color_log("Binary prover tidak ditemukan atau tidak dapat dieksekusi.\n", 'red'))
+        return
+    trial_node_id = get_input(f"Node ID untuk trial [{node_id or ''}]: ").strip() or node_id
+    if not trial_node_id:
+        print(color_log("Node ID tidak boleh kosong.\n", 'red'))
+        return
+    candidates = default_thread_candidates()
+    candidates_input = get_input(f"Kandidat thread [{','.join(map(str, candidates))}]: ").strip()
+    try:
+        if candidates_input:
+            candidates = sorted({int(c) for c in candidates_input.split(',') if int(c) > 0})
+        duration = float(get_input("Durasi per trial dalam detik [180]: ").strip() or 180)
+    except ValueError:
+        print(color_log("Input tidak valid.\n", 'red'))
+        return
+    with trace_span('menu.autotune'):
+        autotune_threads(binary, trial_node_id, candidates, duration)
+
+# --- Penempatan CPU (Topology-Aware Pinning) ---
+CPU_SYSFS = '/sys/devices/system/cpu'
+NODE_SYSFS = '/sys/devices/system/node'
+
+def parse_cpu_list(text: str) -> List[int]:
+    """Mengubah format cpulist kernel (mis. '0-3,8,10-11') menjadi daftar CPU."""
+    cpus = []
+    for part in text.strip().split(','):
+        if not part:
+            continue
+        if '-' in part:
+            start, end = part.split('-', 1)
+            cpus.extend(range(int(start), int(end) + 1))
+        else:
+            cpus.append(int(part))
+    return cpus
+
+def format_cpu_list(cpus: List[int]) -> str:
+    """Mengubah daftar CPU menjadi format cpulist yang ringkas untuk taskset."""
+    ranges = []
+    for cpu in sorted(cpus):
+        if ranges and cpu == ranges[-1][1] + 1:
+            ranges[-1][1] = cpu
+        else:
+            ranges.append([cpu, cpu])
+    return ','.join(f"{a}-{b}" if a != b else str(a) for a, b in ranges)
+
+def read_sysfs(path: str) -> Optional[str]:
+    """Membaca file sysfs, mengembalikan None jika tidak tersedia."""
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+def read_cpu_topology(sysfs_root: str = CPU_SYSFS, node_root: str = NODE_SYSFS) -> List[dict]:
+    """Membaca topologi CPU dari sysfs.
+
+    Mengembalikan daftar core fisik: {'numa': N, 'cpus': [cpu logis SMT sibling]}.
+    """
+    online = read_sysfs(os.path.join(sysfs_root, 'online'))
+    cpus = parse_cpu_list(online) if online else list(range(os.cpu_count() or 1))
+
+    numa_of = {}
+    if os.path.isdir(node_root):
+        for entry in os.listdir(node_root):
+            match = re.match(r'^node([0-9]+)$', entry)
+            cpulist = read_sysfs(os.path.join(node_root, entry, 'cpulist')) if match else None
+            if cpulist:
+                for cpu in parse_cpu_list(cpulist):
+                    numa_of[cpu] = int(match.group(1))
+
+    cores = {}
+    for cpu in cpus:
+        topology = os.path.join(sysfs_root, f'cpu{cpu}', 'topology')
+        package = read_sysfs(os.path.join(topology, 'physical_package_id')) or '0'
+        core = read_sysfs(os.path.join(topology, 'core_id')) or str(cpu)
+        key = (numa_of.get(cpu, 0), package, core)
+        cores.setdefault(key, []).append(cpu)
+
+    return [{'numa': key[0], 'cpus': sorted(siblings)}
+            for key, siblings in sorted(cores.items(), key=lambda item: min(item[1]))]
+
+def assign_cpu_sets(thread_plan: List[int], topology: Optional[List[dict]] = None,
+                    reserved: Optional[set] = None, incremental: bool = False) -> List[Optional[List[int]]]:
+    """Membagi core fisik secara disjoint ke setiap prover.
+
+    Jumlah core fisik per prover sebanding dengan jumlah thread-nya, dan setiap
+    prover diusahakan berada di satu node NUMA. Seluruh SMT sibling dari core yang
+    dipilih ikut masuk ke mask sehingga tidak ada dua prover yang berbagi core.
+    Prover yang tidak kebagian core (lebih banyak prover daripada core) bernilai None.
+
+    Core yang memuat CPU di `reserved` (milik prover lain yang sedang berjalan, lihat
+    held_cpus) selalu dilewati. Secara default rencana dibagi ke seluruh core yang tersisa
+    (mode fleet). Dengan `incremental`, setiap prover hanya mendapat core sebanyak porsi
+    thread-nya terhadap seluruh CPU logis, sehingga sisa core tetap bebas untuk node lain.
+    """
+    topology = topology if topology is not None else read_cpu_topology()
+    if not thread_plan:
+        return []
+    machine_cores, logical = len(topology), sum(len(core['cpus']) for core in topology) or 1
+    if reserved:
+        topology = [core for core in topology if not reserved.intersection(core['cpus'])]
+    total_cores = len(topology)
+    if incremental:
+        wanted = [max(1, -(-t * machine_cores // logical)) for t in thread_plan]
+    else:
+        total_threads = sum(thread_plan) or 1
+        wanted = [max(1, t * total_cores // total_threads) for t in thread_plan]
+
+    while sum(wanted) > total_cores and max(wanted) > 1:
+        wanted[wanted.index(max(wanted))] -= 1
+
+    free = {}
+    for core in topology:
+        free.setdefault(core['numa'], []).append(core)
+
+    assignment: List[Optional[List[int]]] = [None] * len(thread_plan)
+    # Prover terbesar ditempatkan lebih dulu agar paling mungkin muat di satu node NUMA.
+    for index in sorted(range(len(wanted)), key=lambda i: -wanted[i]):
+        need = wanted[index]
+        if sum(len(c) for c in free.values()) < need:
+            continue
+        fitting = [numa for numa, cores in free.items() if len(cores) >= need]
+        if fitting:
+            order = [min(fitting, key=lambda numa: len(free[numa]))]
+        else:
+            order = sorted(free, key=lambda numa: -len(free[numa]))
+        chosen = []
+        for numa in order:
+            take = free[numa][:need - len(chosen)]
+            free[numa] = free[numa][len(take):]
+            chosen.extend(take)
+            if len(chosen) == need:
+                break
+        assignment[index] = sorted(cpu for core in chosen for cpu in core['cpus'])
+    return assignment
+
+def pin_command(command: List[str], cpus: Optional[List[int]]) -> List[str]:
+    """Menambahkan prefix taskset agar prover hanya berjalan di CPU yang ditentukan."""
+    global taskset_path
+    if not cpus or not taskset_path:
+        return command
+    return [taskset_path, '-c', format_cpu_list(cpus)] + command
+
+def held_cpus(exclude=()) -> set:
+    """CPU yang sudah dipin ke prover lain yang sedang berjalan, dibaca dari affinity prosesnya.
+
+    Prover yang tidak dipin (affinity = semua CPU online) tidak dihitung; node di `exclude`
+    (yang akan di-restart) juga diabaikan.
+    """
+    online = {cpu for core in read_cpu_topology() for cpu in core['cpus']}
+    held = set()
+    for prover_id, pid in discover_prover_processes().items():
+        if prover_id in exclude:
+            continue
+        try:
+            cpus = os.sched_getaffinity(pid)
+        except OSError:
+            continue
+        if cpus < online:
+            held |= cpus
+    return held
+
+def show_cpu_placement(labels: List[str], thread_plan: List[int], reserved: Optional[set] = None,
+                       incremental: bool = False) -> List[Optional[List[int]]]:
+    """Menghitung dan menampilkan pemetaan prover ke CPU."""
+    topology = read_cpu_topology()
+    numa_nodes = sorted({core['numa'] for core in topology})
+    print(color_log(f"Topologi: {len(topology)} core fisik, {sum(len(c['cpus']) for c in topology)} CPU logis, "
+                    f"{len(numa_nodes)} node NUMA", 'cyan'))
+    if reserved:
+        print(color_log(f"CPU {format_cpu_list(reserved)} sudah dipakai prover lain dan dilewati.", 'cyan'))
+    assignment = assign_cpu_sets(thread_plan, topology, reserved, incremental)
+    numa_of = {cpu: core['numa'] for core in topology for cpu in core['cpus']}
+    for label, threads, cpus in zip(labels, thread_plan, assignment):
+        if cpus:
+            numa = ','.join(str(n) for n in sorted({numa_of[c] for c in cpus}))
+            print(f"- {color_log(label, 'yellow')}: {threads} thread -> CPU {format_cpu_list(cpus)} (NUMA {numa})")
+        else:
+            print(f"- {color_log(label, 'yellow')}: {threads} thread -> " + color_log("tidak dipin (core habis)", 'red'))
+    if not taskset_path:
+        print(color_log("⚠️ 'taskset' tidak ditemukan, pinning tidak dapat diterapkan (apt install util-linux).", 'yellow'))
+    return assignment
+
+# --- Mode Fleet (Multi-Node) ---
+FLEET_SCREEN_PREFIX = 'nexus-fleet-'
+
+def fleet_screen_name(fleet_node_id: str) -> str:
+    """Nama screen deterministik untuk node fleet."""
+    return f"{FLEET_SCREEN_PREFIX}{fleet_node_id}"
+
+def plan_fleet_threads(nodes: List[dict], total_cores: Optional[int] = None) -> List[int]:
+    """Membagi anggaran core CPU ke setiap node fleet.
+
+    Node dengan nilai 'threads' memakai nilai tersebut, sisa core dibagi rata ke
+    node tanpa nilai. Jika total melebihi jumlah core, semua diperkecil secara
+    proporsional (minimal 1 thread per node).
+    """
+    total = total_cores or os.cpu_count() or 1
+    requested = [int(n.get('threads') or 0) for n in nodes]
+    auto_count = requested.count(0)
+    remaining = max(total - sum(requested), 0)
+    share, extra = divmod(remaining, auto_count) if auto_count else (0, 0)
+
+    plan = []
+    for threads in requested:
+        if not threads:
+            threads = share + (1 if extra > 0 else 0)
+            extra -= 1
+        plan.append(max(1, threads))
+
+    budget = sum(plan)
+    if budget > total:
+        plan = [max(1, t * total // budget) for t in plan]
+    return plan
+
+def show_fleet():
+    """Menampilkan daftar node fleet beserta pembagian thread dan statusnya."""
+    if not fleet_nodes:
+        print(color_log("Belum ada node di fleet. Tambahkan node terlebih dahulu.\n", 'yellow'))
+        return
+    plan = plan_fleet_threads(fleet_nodes)
+    running = running_node_sessions()
+    total = os.cpu_count() or 1
+    print(color_log(f"Fleet: {len(fleet_nodes)} node, {total} core tersedia, {sum(plan)} thread terpakai\n", 'cyan'))
+    for i, (node, threads) in enumerate(zip(fleet_nodes, plan), 1):
+        mode = 'manual' if node.get('threads') else 'auto'
+        status = color_log('BERJALAN', 'green') if node['nodeId'] in running else color_log('BERHENTI', 'red')
+        print(f"{i}. {color_log(node['nodeId'], 'yellow')} - {threads} thread ({mode}) - {status}")
+    if sum(plan) > total:
+        print(color_log("\n⚠️ Jumlah node melebihi jumlah core. Prover akan saling berebut CPU.", 'yellow'))
+
+def add_fleet_node():
+    """Menambahkan Node ID ke fleet."""
+    new_id = get_input("Masukkan Node ID: ").strip()
+    if not new_id:
+        print(color_log("Node ID tidak boleh kosong.\n", 'red'))
+        return
+    if any(n['nodeId'] == new_id for n in fleet_nodes):
+        print(color_log("Node ID sudah ada di fleet.\n", 'yellow'))
+        return
+    threads_input = get_input("Jumlah thread (kosongkan untuk pembagian otomatis): ").strip()
+    threads = None
+    if threads_input:
+        try:
+            threads = int(threads_input)
+            if threads <= 0:
+                raise ValueError
+        except ValueError:
+            print(color_log("Jumlah thread harus berupa angka lebih besar dari 0.\n", 'red'))
+            return
+    append_fleet_nodes([{'nodeId': new_id, 'threads': threads}])
+    print(color_log(f"Node '{new_id}' ditambahkan ke fleet.\n", 'green'))
+
+def select_fleet_node(prompt: str) -> Optional[dict]:
+    """Meminta pengguna memilih satu node dari fleet."""
+    show_fleet()
+    if not fleet_nodes:
+        return None
+    choice = get_input(prompt)
+    try:
+        index = int(choice) - 1
+        if 0 <= index < len(fleet_nodes):
+            return fleet_nodes[index]
+    except ValueError:
+        pass
+    print(color_log("Pilihan tidak valid.\n", 'red'))
+    return None
+
+def remove_fleet_node():
+    """Menghapus Node ID dari fleet."""
+    node = select_fleet_node("\nPilih node yang akan dihapus (nomor): ")
+    if node:
+        remove_fleet_nodes([node['nodeId']])
+        print(color_log(f"Node '{node['nodeId']}' dihapus dari fleet.\n", 'green'))
+
+def set_fleet_node_threads():
+    """Mengatur jumlah thread untuk satu node fleet."""
+    node = select_fleet_node("\nPilih node yang akan diatur (nomor): ")
+    if not node:
+        return
+    threads_input = get_input("Jumlah thread baru (kosongkan untuk otomatis): ").strip()
+    try:
+        threads = int(threads_input) if threads_input else None
+        if threads is not None and threads <= 0:
+            raise ValueError
+    except ValueError:
+        print(color_log("Jumlah thread harus berupa angka lebih besar dari 0.\n", 'red'))
+        return
+    update_fleet_node(node['nodeId'], threads=threads)
+    print(color_log(f"Thread untuk node '{node['nodeId']}' diperbarui.\n", 'green'))
+
+def start_fleet():
+    """Menjalankan seluruh node fleet di screen masing-masing."""
+    global screen_path, nexus_cli_path
+    if not screen_path:
+        print(color_log("Perintah 'screen' tidak ditemukan. Jalankan 'Cek Status' (#1) untuk info.\n", 'red'))
+        return
+    if not nexus_cli_path:
+        print(color_log("Perintah 'nexus-network' tidak ditemukan. Jalankan 'Cek Status' (#1) dan 'Update CLI' (#2).\n", 'red'))
+        return
+    if not fleet_nodes:
+        print(color_log("Belum ada node di fleet.\n", 'yellow'))
+        return
+
+    print(color_log(f"⚡ Menjalankan {len(fleet_nodes)} node fleet...\n", 'cyan'))
+    running = running_node_sessions()
+    plan = plan_fleet_threads(fleet_nodes)
+    placement = [None] * len(plan)
+    if tool_settings.get('cpuPinning'):
+        fleet_ids = [n['nodeId'] for n in fleet_nodes]
+        placement = show_cpu_placement(fleet_ids, plan, held_cpus(set(fleet_ids)))
+    started = 0
+    for node, threads, cpus in zip(fleet_nodes, plan, placement):
+        fleet_node_id = node['nodeId']
+        if fleet_node_id in running:
+            print(color_log(f"Node '{fleet_node_id}' sudah berjalan, dilewati.", 'yellow'))
+            continue
+        command = [nexus_cli_path, "start", "--node-id", fleet_node_id, "--max-threads", str(threads)]
+        command = pin_command(command, cpus)
+        if launch_in_screen(fleet_screen_name(fleet_node_id), command, fleet_node_id, threads):
+            started += 1
+    print(color_log(f"✅ {started} node fleet telah dimulai.\n", 'green'))
+
+def stop_fleet():
+    """Menghentikan seluruh sesi screen fleet."""
+    global screen_path
+    if not screen_path:
+        print(color_log("Perintah 'screen' tidak ditemukan. Jalankan 'Cek Status' (#1) untuk info.\n", 'red'))
+        return
+    fleet_ids = {n['nodeId'] for n in fleet_nodes}
+    running = [entry for entry in reconcile_sessions() if entry['nodeId'] in fleet_ids]
+    if not running:
+        print(color_log("Tidak ada node fleet yang sedang berjalan.\n", 'yellow'))
+        return
+    print(color_log(f"🛑 Menghentikan {len(running)} node fleet...\n", 'cyan'))
+    stop_sessions(running)
+    print(color_log("Semua node fleet telah dihentikan.\n", 'green'))
+
+def toggle_cpu_pinning():
+    """Mengaktifkan/menonaktifkan pinning CPU berbasis topologi untuk fleet."""
+    tool_settings['cpuPinning'] = not tool_settings.get('cpuPinning')
+    save_configuration()
+    state = color_log('AKTIF', 'green') if tool_settings['cpuPinning'] else color_log('NONAKTIF', 'red')
+    print(f"Pinning CPU sekarang {state}.\n")
+    if tool_settings['cpuPinning'] and fleet_nodes:
+        fleet_ids = [n['nodeId'] for n in fleet_nodes]
+        show_cpu_placement(fleet_ids, plan_fleet_threads(fleet_nodes), held_cpus(set(fleet_ids)))
+    print(color_log("Perubahan berlaku untuk node yang dijalankan berikutnya.\n", 'yellow'))
+
+def restart_fleet():
+    """Menghentikan lalu menjalankan ulang seluruh node fleet."""
+    stop_fleet()
+    start_fleet()
+
+def show_fleet_menu():
+    """Menampilkan submenu mode fleet."""
+    while True:
+        clear_screen()
+        print(color_log("========== MENU FLEET (MULTI-NODE) ==========\n", 'yellow'))
+        show_fleet()
+        print("\n1. Tambah Node ke Fleet")
+        print("2. Hapus Node dari Fleet")
+        print("3. Atur Thread Node")
+        print("4. " + color_log("Jalankan Semua Node", 'green'))
+        print("5. " + color_log("Hentikan Semua Node", 'red'))
+        print("6. Restart Semua Node")
+        pinning = color_log('AKTIF', 'green') if tool_settings.get('cpuPinning') else color_log('NONAKTIF', 'red')
+        print(f"7. Pinning CPU per Topologi [{pinning}]")
+        print("8. Daftarkan Banyak Node ID Sekaligus")
+        print("9. Watchdog Node Macet")
+        print("10. Kembali ke Menu Utama")
+
+        choice = get_input("Masukkan pilihan Anda [1-10]: ")
+
+        if choice == '1': add_fleet_node()
+        elif choice == '2': remove_fleet_node()
+        elif choice == '3': set_fleet_node_threads()
+        elif choice == '4': start_fleet()
+        elif choice == '5': stop_fleet()
+        elif choice == '6': restart_fleet()
+        elif choice == '7': toggle_cpu_pinning()
+        elif choice == '8': bulk_register_nodes()
+        elif choice == '9': show_watchdog_menu()
+        elif choice == '10': return
+        else: print(color_log("Pilihan tidak valid. Silakan coba lagi.\n", 'red'))
+
+        get_input(color_log("\nTekan [Enter] untuk kembali ke menu fleet...", 'cyan'))
+
+# --- Registry Sesi Screen ---
+# Setiap peluncuran screen tercatat di tabel launches (nama sesi, PID, Node ID, thread, waktu
+# mulai). Sesi aktif = baris tanpa stopped_at; registry dicocokkan dengan sesi yang benar-benar
+# hidup lewat direktori socket screen (tanpa fork 'screen -ls') sebelum dipakai.
+NODE_SCREEN_PREFIX = 'nexus-node-'
+
+def node_screen_name(screen_node_id: str) -> str:
+    """Nama screen deterministik untuk node tunggal (menu 6/6b)."""
+    return f"{NODE_SCREEN_PREFIX}{screen_node_id}"
+
+def tool_screen_name(target_id: str) -> str:
+    """Nama sesi sebuah node: nama fleet jika node ada di fleet, selain itu nama node tunggal."""
+    if any(n['nodeId'] == target_id for n in fleet_nodes):
+        return fleet_screen_name(target_id)
+    return node_screen_name(target_id)
+
+def screen_socket_dir() -> Optional[str]:
+    """Direktori socket screen milik user ini, jika ada."""
+    if os.environ.get('SCREENDIR'):
+        return os.environ['SCREENDIR'] if os.path.isdir(os.environ['SCREENDIR']) else None
+    try:
+        import pwd
+        user = pwd.getpwuid(os.geteuid()).pw_name
+    except (ImportError, KeyError):
+        return None
+    for base in ('/run/screen', '/var/run/screen', '/tmp/screens', '/tmp/uscreens'):
+        if os.path.isdir(os.path.join(base, f"S-{user}")):
+            return os.path.join(base, f"S-{user}")
+    return None
+
+def screen_socket_sessions() -> Optional[dict]:
+    """{nama: pid} sesi hidup dari direktori socket screen; None jika direktori tidak ditemukan."""
+    directory = screen_socket_dir()
+    if directory is None:
+        return None
+    sessions = {}
+    try:
+        entries = os.listdir(directory)
+    except OSError:
+        return None
+    for entry in entries:
+        pid, _, name = entry.partition('.')
+        if not pid.isdigit() or not name:
+            continue
+        try:
+            os.kill(int(pid), 0)
+        except ProcessLookupError:
+            continue  # Socket basi dari sesi yang mati
+        except PermissionError:
+            pass
+        sessions[name] = int(pid)
+    return sessions
+
+def screen_live_sessions() -> dict:
+    """{nama: pid} semua sesi screen yang hidup."""
+    sessions = screen_socket_sessions()
+    if sessions is not None:
+        return sessions
+    live = {}
+    for session in list_screen_sessions():
+        pid, _, name = session.partition('.')
+        live[name] = int(pid)
+    return live
+
+def session_node_id(name: str) -> Optional[str]:
+    for prefix in (FLEET_SCREEN_PREFIX, NODE_SCREEN_PREFIX):
+        if name.startswith(prefix):
+            return name[len(prefix):]
+    return None
+
+def running_node_sessions() -> dict:
+    """{Node ID: nama sesi} semua sesi node milik tool (fleet maupun node tunggal) yang hidup."""
+    running = {}
+    for name in sorted(screen_live_sessions()):
+        session_id = session_node_id(name)
+        if session_id is not None:
+            running[session_id] = name
+    return running
+
+def reconcile_sessions() -> List[dict]:
+    """Registry sesi aktif setelah dicocokkan dengan PID hidup; sesi yang sudah mati ditutup."""
+    import sqlite3
+    import time
+    live = screen_live_sessions()
+    db = open_store()
+    rows = db.execute("SELECT id, node_id, session, threads, pid, started_at FROM launches "
+                      "WHERE stopped_at IS NULL AND session != 'supervisor' ORDER BY started_at").fetchall()
+    newest = {row['session']: row for row in rows}
+    closed = [(row['id'],) for row in rows if row['session'] not in live or newest[row['session']] is not row]
+    repaired = [(live[row['session']], row['id']) for row in newest.values()
+                if row['session'] in live and row['pid'] != live[row['session']]]
+    if closed or repaired:
+        try:
+            with store_transaction(db):
+                db.executemany('UPDATE launches SET stopped_at = ? WHERE id = ?', [(time.time(), i) for (i,) in closed])
+                db.executemany('UPDATE launches SET pid = ? WHERE id = ?', repaired)
+        except sqlite3.Error:
+            pass
+    tags = {n['nodeId']: n.get('tags', []) for n in fleet_nodes}
+    entries = []
+    for name, pid in sorted(live.items()):
+        row = newest.get(name)
+        entry_node_id = row['node_id'] if row else session_node_id(name)
+        entries.append({'session': name, 'pid': pid, 'nodeId': entry_node_id, 'threads': row['threads'] if row else None,
+                        'startedAt': row['started_at'] if row else None, 'tags': tags.get(entry_node_id, []),
+                        'registered': row is not None})
+    return entries
+
+def match_sessions(entries: List[dict], pattern: Optional[str] = None, tag: Optional[str] = None) -> List[dict]:
+    """Memilih sesi dengan glob (nama sesi atau Node ID) dan/atau tag node."""
+    import fnmatch
+    selected = []
+    for entry in entries:
+        if pattern and not (fnmatch.fnmatchcase(entry['session'], pattern)
+                            or (entry['nodeId'] and fnmatch.fnmatchcase(entry['nodeId'], pattern))):
+            continue
+        if tag and tag not in entry['tags']:
+            continue
+        selected.append(entry)
+    return selected
+
+def stop_sessions(entries: List[dict]) -> List[dict]:
+    """Menghentikan banyak sesi secara paralel dan menutupnya di registry."""
+    import shlex
+    import sqlite3
+    import time
+    if not entries:
+        return []
+    commands = {}
+    for entry in entries:
+        target = f"{entry['pid']}.{entry['session']}"
+        commands[entry['session']] = f"{shlex.quote(screen_path)} -X -S {shlex.quote(target)} quit"
+    outputs = run_commands(commands, multiplex=True, echo=False, keep_log=False)
+    stopped = [name for name, output in outputs.items() if output.returncode == 0]
+    try:
+        db = open_store()
+        with store_transaction(db):
+            db.executemany('UPDATE launches SET stopped_at = ? WHERE session = ? AND stopped_at IS NULL',
+                           [(time.time(), name) for name in stopped])
+    except sqlite3.Error:
+        pass
+    return [{'session': e['session'], 'nodeId': e['nodeId'], 'ok': e['session'] in stopped} for e in entries]
+
+def node_launch_command(target_id: str, threads: Optional[int] = None, reserved: Optional[set] = None) -> tuple:
+    """Perintah peluncuran (ulang) sebuah node: (command, threads).
+
+    Node fleet memakai thread dan CPU dari rencana fleet; node lain memakai `threads` (atau
+    hasil autotune) dan, jika pinning aktif, core yang belum dipakai prover lain. CPU yang
+    dipilih ditambahkan ke `reserved` agar peluncuran lain dalam batch yang sama tidak berbagi core.
+    """
+    plan = dict(zip([n['nodeId'] for n in fleet_nodes], plan_fleet_threads(fleet_nodes)))
+    threads = threads or plan.get(target_id) or get_tuned_threads()
+    command = [nexus_cli_path, "start", "--node-id", target_id]
+    if threads:
+        command.extend(["--max-threads", str(threads)])
+    cpus = None
+    if tool_settings.get('cpuPinning') and target_id in plan:
+        cpus = assign_cpu_sets(list(plan.values()), reserved=held_cpus(set(plan)))[list(plan).index(target_id)]
+    elif tool_settings.get('cpuPinning') and threads:
+        reserved = held_cpus({target_id}) if reserved is None else reserved
+        cpus = assign_cpu_sets([threads], reserved=reserved, incremental=True)[0]
+        reserved.update(cpus or [])
+    return pin_command(command, cpus), threads
+
+def restart_sessions(entries: List[dict]) -> List[dict]:
+    """Menghentikan lalu meluncurkan ulang sesi node (paralel) dengan Node ID dan thread dari registry."""
+    results = {r['session']: r for r in stop_sessions(entries)}
+    relaunch = [e for e in entries if e['nodeId'] and results[e['session']]['ok']]
+    # Node fleet kembali ke core rencana fleet, jadi core-nya tetap dianggap terpakai oleh node lain.
+    fleet_ids = {n['nodeId'] for n in fleet_nodes}
+    reserved = (held_cpus({e['nodeId'] for e in relaunch if e['nodeId'] not in fleet_ids})
+                if tool_settings.get('cpuPinning') else None)
+    launches = {}
+    for entry in relaunch:
+        command, entry['threads'] = node_launch_command(entry['nodeId'], entry['threads'], reserved)
+        launches[entry['session']] = screen_launch_command(entry['session'], command, entry['nodeId'])
+    outputs = run_commands(launches, multiplex=True, echo=False, keep_log=False) if launches else {}
+    live = screen_live_sessions() if outputs else {}
+    for entry in relaunch:
+        ok = outputs[entry['session']].returncode == 0
+        if ok:
+            record_launch(entry['nodeId'], entry['session'], entry['threads'], live.get(entry['session']))
+        results[entry['session']]['restarted'] = ok
+    return list(results.values())
+
+def show_session_table(entries: List[dict]):
+    import time
+    for i, entry in enumerate(entries, 1):
+        uptime = format_duration(time.time() - entry['startedAt']) if entry['startedAt'] else '-'
+        tags = f" [{','.join(entry['tags'])}]" if entry['tags'] else ''
+        print(f"{i:>3}. {color_log(entry['session'], 'yellow'):<40} node={entry['nodeId'] or '-'} "
+              f"thread={entry['threads'] or '-'} pid={entry['pid']} uptime={uptime}{tags}")
+
+def select_sessions_input(entries: List[dict], choice: str) -> List[dict]:
+    """Pilihan menu: nomor dipisah koma, 'all', 'tag:<nama>', atau glob nama/Node ID."""
+    choice = choice.strip()
+    if choice.lower() == 'all':
+        return entries
+    if choice.startswith('tag:'):
+        return match_sessions(entries, tag=choice[4:].strip())
+    if re.fullmatch(r'[0-9,\s]+', choice):
+        indexes = {int(part) - 1 for part in choice.split(',') if part.strip()}
+        return [entry for i, entry in enumerate(entries) if i in indexes]
+    return match_sessions(entries, pattern=choice)
+
+# --- Registrasi Node Massal ---
+class RateLimiter:
+    """Membatasi laju global: paling banyak `rate` panggilan per detik dari semua thread."""
+
+    def __init__(self, rate: float):
+        import threading
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self.lock = threading.Lock()
+        self.next_at = 0.0
+
+    def wait(self):
+        import time
+        with self.lock:
+            now = time.monotonic()
+            start = max(now, self.next_at)
+            self.next_at = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+def register_one_node(limiter: RateLimiter, retries: int, backoff: float, parent: Optional[Span] = None) -> dict:
+    """Menjalankan 'register-node' dengan retry dan exponential backoff."""
+    with trace_span('register.node', parent) as span:
+        result = register_node_attempts(limiter, retries, backoff)
+        span.set(attempts=result['attempts'], ok=result['ok'])
+    return result
+
+def register_node_attempts(limiter: RateLimiter, retries: int, backoff: float) -> dict:
+    import subprocess
+    import random
+    import time
+    last_error = ''
+    for attempt in range(retries + 1):
+        limiter.wait()
+        try:
+            result = run_traced('nexus.register-node', [nexus_cli_path, 'register-node'], capture_output=True,
+                                text=True, timeout=120)
+            new_id = parse_node_id(result.stdout) if result.returncode == 0 else None
+            if new_id:
+                return {'ok': True, 'nodeId': new_id, 'attempts': attempt + 1}
+            last_error = (result.stderr or result.stdout).strip()[-200:] or f"kode error {result.returncode}"
+        except (OSError, subprocess.TimeoutExpired) as e:
+            last_error = str(e)
+        if attempt < retries:
+            time.sleep(backoff * (2 ** attempt) * (1 + random.random() * 0.25))
+    return {'ok': False, 'error': last_error, 'attempts': retries + 1}
+
+def register_nodes_bulk(count: int, workers: int = 4, rate: float = 2.0, retries: int = 3,
+                        backoff: float = 2.0, threads: Optional[int] = None) -> List[dict]:
+    """Mendaftarkan `count` node secara paralel dan menyimpan setiap ID baru ke fleet segera setelah berhasil."""
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    limiter = RateLimiter(rate)
+    results = []
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = [pool.submit(register_one_node, limiter, retries, backoff, current_span()) for _ in range(count)]
+        for done, future in enumerate(as_completed(futures), 1):
+            result = future.result()
+            results.append(result)
+            if result['ok']:
+                append_fleet_nodes([{'nodeId': result['nodeId'], 'threads': threads}])
+                print(color_log(f"[{done}/{count}] ✅ {result['nodeId']} (percobaan {result['attempts']})", 'green'))
+            else:
+                print(color_log(f"[{done}/{count}] ❌ gagal setelah {result['attempts']} percobaan: {result['error']}", 'red'))
+    return results
+
+def bulk_register_nodes():
+    """Menu interaktif registrasi node massal."""
+    global nexus_cli_path
+    if not nexus_cli_path:
+        print(color_log("Perintah 'nexus-network' tidak ditemukan. Jalankan 'Cek Status' (#1) dan 'Update CLI' (#2).\n", 'red'))
+        return
+    print(color_log("🆔 Registrasi Node ID Massal\n", 'cyan'))
+    try:
+        count = int(get_input("Jumlah node yang akan didaftarkan: "))
+        workers = int(get_input("Jumlah worker paralel [4]: ").strip() or 4)
+        rate = float(get_input("Batas laju (registrasi per detik) [2]: ").strip() or 2)
+        retries = int(get_input("Jumlah retry per node [3]: ").strip() or 3)
+    except ValueError:
+        print(color_log("Input tidak valid. Silakan masukkan angka.\n", 'red'))
+        return
+    if count <= 0:
+        print(color_log("Jumlah node harus lebih besar dari 0.\n", 'red'))
+        return
+    results = register_nodes_bulk(count, workers, rate, retries)
+    ok = sum(1 for r in results if r['ok'])
+    print(color_log(f"\n{ok} dari {count} node berhasil didaftarkan dan ditambahkan ke fleet.\n",
+                    'green' if ok == count else 'yellow'))
+
+# --- Metrik Node (Streaming Log Parser) ---
+PROOF_FAILURE_PATTERN = re.compile(r'(?i)(proof\b.*\b(fail(ed|ure)?|error|rejected)|failed to (submit|prove))')
+TASK_FETCH_PATTERN = re.compile(r'(?i)(fetch(ed|ing)?\b.*\btask|(got|received|new) task)')
+PROOF_LATENCY_BUCKETS = (5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0)
+RATE_WINDOW_MINUTES = 15  # Jendela rata-rata proofs/min
+METRICS_SNAPSHOT_SECONDS = 10.0  # Interval log-sink menulis snapshot metrik node screen
+
+class NodeMetrics:
+    """Parser inkremental output node dengan memori konstan.
+
+    Setiap baris hanya memperbarui counter, histogram latensi (dari task diambil
+    hingga proof selesai) dan ring counter per menit untuk menghitung proofs/min.
+    """
+
+    def __init__(self):
+        self.lines = 0
+        self.proofs_ok = 0
+        self.proofs_failed = 0
+        self.tasks_fetched = 0
+        self.latency_buckets = [0] * (len(PROOF_LATENCY_BUCKETS) + 1)
+        self.latency_sum = 0.0
+        self.latency_count = 0
+        self.task_started_at = None
+        self.last_proof_at = None
+        self.minute_counts = [0] * RATE_WINDOW_MINUTES
+        self.minute_stamps = [0] * RATE_WINDOW_MINUTES
+
+    def observe_latency(self, seconds: float):
+        for i, bound in enumerate(PROOF_LATENCY_BUCKETS):
+            if seconds <= bound:
+                self.latency_buckets[i] += 1
+                break
+        else:
+            self.latency_buckets[-1] += 1
+        self.latency_sum += seconds
+        self.latency_count += 1
+
+    def feed(self, line: str, now: Optional[float] = None):
+        """Memproses satu baris output node."""
+        import time
+        now = time.time() if now is None else now
+        self.lines += 1
+        if PROOF_FAILURE_PATTERN.search(line):
+            self.proofs_failed += 1
+            self.finish_task(now)
+        elif PROOF_SUCCESS_PATTERN.search(line):
+            self.proofs_ok += 1
+            self.last_proof_at = now
+            minute = int(now // 60)
+            slot = minute % RATE_WINDOW_MINUTES
+            if self.minute_stamps[slot] != minute:
+                self.minute_stamps[slot] = minute
+                self.minute_counts[slot] = 0
+            self.minute_counts[slot] += 1
+            self.finish_task(now)
+        elif TASK_FETCH_PATTERN.search(line):
+            self.tasks_fetched += 1
+            self.task_started_at = now
+
+    def finish_task(self, now: float):
+        if self.task_started_at is not None:
+            self.observe_latency(max(now - self.task_started_at, 0.0))
+            self.task_started_at = None
+
+    def proofs_per_minute(self, now: Optional[float] = None) -> float:
+        """Rata-rata proofs/min pada jendela RATE_WINDOW_MINUTES menit terakhir."""
+        import time
+        minute = int((time.time() if now is None else now) // 60)
+        recent = sum(count for count, stamp in zip(self.minute_counts, self.minute_stamps)
+                     if minute - RATE_WINDOW_MINUTES < stamp <= minute)
+        return round(recent / RATE_WINDOW_MINUTES, 3)
+
+    def snapshot(self) -> dict:
+        return {
+            'lines': self.lines,
+            'proofsOk': self.proofs_ok,
+            'proofsFailed': self.proofs_failed,
+            'tasksFetched': self.tasks_fetched,
+            'proofsPerMin': self.proofs_per_minute(),
+            'lastProofAt': self.last_proof_at,
+            'latency': {
+                'buckets': dict(zip([str(b) for b in PROOF_LATENCY_BUCKETS] + ['+Inf'], self.latency_buckets)),
+                'sum': round(self.latency_sum, 3),
+                'count': self.latency_count,
+            },
+        }
+
+# Node screen tidak diawasi supervisor: log-sink yang menerima output-nya menjalankan NodeMetrics
+# dan menulis snapshot ke state/metrics/<node>.json. Snapshot dihapus saat log-sink selesai.
+def node_metrics_path(metrics_node_id: str) -> str:
+    return os.path.join(get_state_dir(), 'metrics', re.sub(r'[^A-Za-z0-9_.-]', '_', metrics_node_id) + '.json')
+
+def save_node_metrics(metrics_node_id: str, metrics: NodeMetrics):
+    """Menulis snapshot metrik node screen; gagal tulis diabaikan agar log-sink tetap berjalan."""
+    import time
+    path = node_metrics_path(metrics_node_id)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        write_json_atomic(path, {'nodeId': metrics_node_id, 'pid': os.getpid(), 'updatedAt': time.time(),
+                                 'metrics': metrics.snapshot()})
+    except OSError:
+        pass
+
+def load_screen_node_metrics(exclude=()) -> List[dict]:
+    """Metrik node screen dari snapshot log-sink yang masih hidup, berbentuk seperti status supervisor."""
+    directory = os.path.join(get_state_dir(), 'metrics')
+    try:
+        names = sorted(os.listdir(directory))
+    except OSError:
+        return []
+    nodes = []
+    for name in names:
+        if not name.endswith('.json'):
+            continue
+        try:
+            with open(os.path.join(directory, name)) as f:
+                snapshot = json.load(f)
+            os.kill(snapshot['pid'], 0)
+        except PermissionError:
+            pass  # log-sink milik user lain (mis. root) tetap hidup
+        except (OSError, ValueError, KeyError, TypeError):
+            continue
+        if snapshot['nodeId'] not in exclude:
+            nodes.append({'nodeId': snapshot['nodeId'], 'source': 'screen', 'state': 'running',
+                          'metrics': snapshot['metrics']})
+    return nodes
+
+def prometheus_label_value(value) -> str:
+    """Escape nilai label sesuai format eksposisi teks Prometheus."""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def render_prometheus(nodes: List[dict]) -> str:
+    """Merender snapshot metrik node ke format teks Prometheus.
+
+    `nodes` berisi dict status supervisor (atau node screen dari load_screen_node_metrics)
+    yang memiliki kunci 'metrics'.
+    """
+    out = []
+
+    def family(name: str, kind: str, help_text: str):
+        out.append(f"# HELP {name} {help_text}")
+        out.append(f"# TYPE {name} {kind}")
+
+    def label(node: dict, **extra) -> str:
+        pairs = {'node_id': node['nodeId'], **extra}
+        return '{' + ','.join(f'{k}="{prometheus_label_value(v)}"' for k, v in pairs.items()) + '}'
+
+    family('nexus_node_up', 'gauge', 'Apakah proses node sedang berjalan.')
+    out.extend(f"nexus_node_up{label(n)} {int(n['state'] == 'running')}" for n in nodes)
+    family('nexus_node_restarts_total', 'counter', 'Jumlah restart node oleh supervisor.')
+    out.extend(f"nexus_node_restarts_total{label(n)} {n['restarts']}" for n in nodes if 'restarts' in n)
+    family('nexus_output_lines_total', 'counter', 'Jumlah baris output node.')
+    out.extend(f"nexus_output_lines_total{label(n)} {n['metrics']['lines']}" for n in nodes)
+    family('nexus_proofs_total', 'counter', 'Jumlah proof per hasil.')
+    for n in nodes:
+        out.append(f"nexus_proofs_total{label(n, result='success')} {n['metrics']['proofsOk']}")
+        out.append(f"nexus_proofs_total{label(n, result='failure')} {n['metrics']['proofsFailed']}")
+    family('nexus_tasks_fetched_total', 'counter', 'Jumlah task yang diambil.')
+    out.extend(f"nexus_tasks_fetched_total{label(n)} {n['metrics']['tasksFetched']}" for n in nodes)
+    family('nexus_proofs_per_minute', 'gauge', f'Rata-rata proofs/min {RATE_WINDOW_MINUTES} menit terakhir.')
+    out.extend(f"nexus_proofs_per_minute{label(n)} {n['metrics']['proofsPerMin']}" for n in nodes)
+    family('nexus_proof_duration_seconds', 'histogram', 'Latensi dari task diambil hingga proof selesai.')
+    for n in nodes:
+        latency = n['metrics']['latency']
+        cumulative = 0
+        for bound, count in latency['buckets'].items():
+            cumulative += count
+            out.append(f"nexus_proof_duration_seconds_bucket{label(n, le=bound)} {cumulative}")
+        out.append(f"nexus_proof_duration_seconds_sum{label(n)} {latency['sum']}")
+        out.append(f"nexus_proof_duration_seconds_count{label(n)} {latency['count']}")
+    return '\n'.join(out) + '\n'
+
+# --- Governor Memori (Pencegah OOM) ---
+CGROUP_ROOT = '/sys/fs/cgroup'
+GOVERNOR_INTERVAL = 5.0  # Jeda sampling memori (detik)
+GOVERNOR_COOLDOWN = 60.0  # Jeda minimum antar tindakan governor pada node yang sama
+GOVERNOR_DEFAULTS = {'enabled': True, 'minHeadroomPct': 10, 'mode': 'threads'}
+GOVERNOR_CGROUP_LEAF = 'supervisor'  # Leaf cgroup untuk proses supervisor di subtree terdelegasi
+
+def read_meminfo(path: str = '/proc/meminfo') -> dict:
+    """Membaca /proc/meminfo, nilai dalam kB."""
+    info = {}
+    try:
+        with open(path) as f:
+            for line in f:
+                key, _, value = line.partition(':')
+                info[key] = int(value.split()[0])
+    except (OSError, ValueError, IndexError):
+        pass
+    return info
+
+def read_process_memory(pid: int) -> dict:
+    """Membaca VmRSS dan VmHWM (RSS puncak) sebuah proses dari /proc/<pid>/status, dalam kB."""
+    memory = {}
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for line in f:
+                if line.startswith(('VmRSS:', 'VmHWM:')):
+                    key, value = line.split(':', 1)
+                    memory[key] = int(value.split()[0])
+    except (OSError, ValueError):
+        pass
+    return memory
+
+def get_governor_settings() -> dict:
+    """Pengaturan governor memori digabung dengan nilai default."""
+    return {**GOVERNOR_DEFAULTS, **tool_settings.get('memoryGovernor', {})}
+
+def memory_peaks_path() -> str:
+    """File berisi RSS puncak terukur per node (ditulis oleh supervisor)."""
+    return os.path.join(get_state_dir(), 'memory_peaks.json')
+
+def write_json_atomic(path: str, data):
+    """Menulis JSON ke file sementara lalu me-rename agar pembaca tidak melihat file setengah jadi."""
+    tmp_path = f"{path}.tmp.{os.getpid()}"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, indent=4)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def load_memory_peaks() -> dict:
+    """Memuat RSS puncak per node (kB)."""
+    try:
+        with open(memory_peaks_path()) as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+def cgroup_v2_available() -> bool:
+    return os.path.exists(os.path.join(CGROUP_ROOT, 'cgroup.controllers'))
+
+def delegated_cgroup() -> Optional[str]:
+    """Direktori cgroup v2 proses ini (mis. unit systemd dengan Delegate=yes) sebagai induk cgroup node.
+
+    Root cgroup tidak pernah dipakai: mengaktifkan controller di sana memengaruhi seluruh
+    sistem. None jika proses berada di root atau controller memory tidak didelegasikan.
+    """
+    try:
+        with open('/proc/self/cgroup') as f:
+            path = next((line.strip()[3:] for line in f if line.startswith('0::')), '')
+    except OSError:
+        return None
+    if path in ('', '/'):
+        return None
+    directory = os.path.join(CGROUP_ROOT, path.lstrip('/'))
+    if os.path.basename(directory) == GOVERNOR_CGROUP_LEAF:
+        directory = os.path.dirname(directory)
+    try:
+        with open(os.path.join(directory, 'cgroup.controllers')) as f:
+            controllers = f.read().split()
+    except OSError:
+        return None
+    return directory if 'memory' in controllers else None
+
+def memory_high_limit(limit_node_id: str, peaks_kb: dict, total_kb: int, min_headroom_pct: float) -> int:
+    """Batas memory.high (byte) untuk satu node: bagiannya dari anggaran memori node.
+
+    Anggaran adalah RAM dikurangi headroom yang dikonfigurasi (minHeadroomPct), dibagi ke
+    node yang berjalan sebanding dengan RSS puncak terukur (rata jika belum ada data).
+    """
+    budget = total_kb * 1024 * (100 - min_headroom_pct) / 100
+    total_peak = sum(peaks_kb.values())
+    share = peaks_kb.get(limit_node_id, 0) / total_peak if total_peak else 1 / max(1, len(peaks_kb))
+    return int(budget * share)
+
+def apply_memory_high(cgroup_node_id: str, pid: int, limit_bytes: int) -> Optional[int]:
+    """Memindahkan proses node ke cgroup sendiri di subtree terdelegasi dan memasang memory.high.
+
+    Di atas memory.high kernel melakukan throttle dan reclaim, bukan OOM kill. Batas yang
+    sudah terpasang tidak pernah diturunkan. Mengembalikan batas yang berlaku, atau None
+    jika tidak ada subtree terdelegasi atau penulisan gagal.
+    """
+    base = delegated_cgroup()
+    if base is None:
+        return None
+    leaf = os.path.join(base, GOVERNOR_CGROUP_LEAF)
+    group = os.path.join(base, 'node-' + re.sub(r'[^A-Za-z0-9_.-]', '_', cgroup_node_id))
+    try:
+        # Aturan "no internal processes": semua proses di induk dipindah ke leaf sebelum
+        # controller memory diaktifkan untuk anak-anaknya.
+        os.makedirs(leaf, exist_ok=True)
+        with open(os.path.join(base, 'cgroup.procs')) as f:
+            for other in f.read().split():
+                with open(os.path.join(leaf, 'cgroup.procs'), 'w') as procs:
+                    procs.write(other)
+        with open(os.path.join(base, 'cgroup.subtree_control')) as f:
+            enabled = 'memory' in f.read().split()
+        if not enabled:
+            with open(os.path.join(base, 'cgroup.subtree_control'), 'w') as f:
+                f.write('+memory')
+        os.makedirs(group, exist_ok=True)
+        with open(os.path.join(group, 'cgroup.procs'), 'w') as f:
+            f.write(str(pid))
+        with open(os.path.join(group, 'memory.high')) as f:
+            current = f.read().strip()
+        if current.isdigit() and int(current) >= limit_bytes:
+            return int(current)
+        with open(os.path.join(group, 'memory.high'), 'w') as f:
+            f.write(str(int(limit_bytes)))
+        return int(limit_bytes)
+    except OSError:
+        return None
+
+def recommend_swap_size(peaks_kb: List[int], meminfo: Optional[dict] = None) -> int:
+    """Ukuran swap (GB) dari total RSS puncak terukur ditambah margin 25% dan cadangan sistem 512 MB."""
+    meminfo = meminfo if meminfo is not None else read_meminfo()
+    needed_kb = sum(peaks_kb) * 1.25 + 512 * 1024
+    shortfall_kb = needed_kb - meminfo.get('MemTotal', 0) - meminfo.get('SwapTotal', 0)
+    if shortfall_kb <= 0:
+        return 0
+    return max(1, -(-int(shortfall_kb) // (1024 * 1024)))
+
+def show_memory_governor_menu():
+    """Menampilkan status memori dan pengaturan governor OOM."""
+    settings = get_governor_settings()
+    meminfo = read_meminfo()
+    total = meminfo.get('MemTotal', 0)
+    available = meminfo.get('MemAvailable', 0)
+    print(color_log("🧠 Governor Memori (Pencegah OOM)\n", 'cyan'))
+    if total:
+        print(f"- RAM tersedia : {available // 1024} MB dari {total // 1024} MB ({available * 100 // total}%)")
+    print(f"- Swap         : {meminfo.get('SwapFree', 0) // 1024} MB bebas dari {meminfo.get('SwapTotal', 0) // 1024} MB")
+    for peak_node_id, peak_kb in load_memory_peaks().items():
+        print(f"- RSS puncak {color_log(peak_node_id, 'yellow')}: {peak_kb // 1024} MB")
+    state = color_log('AKTIF', 'green') if settings['enabled'] else color_log('NONAKTIF', 'red')
+    print(f"\nGovernor {state}, ambang headroom {settings['minHeadroomPct']}%, mode '{settings['mode']}'")
+    print("  mode 'threads': turunkan --max-threads node terbesar lalu restart")
+    print("  mode 'cgroup' : pasang batas memory.high (cgroup v2) pada node terbesar dari anggaran RAM minus headroom;")
+    print("                  supervisor harus berjalan di cgroup terdelegasi (mis. unit systemd dengan Delegate=yes)")
+
+    if get_input("\nUbah pengaturan? (y/N): ").lower() != 'y':
+        return
+    settings['enabled'] = get_input("Aktifkan governor? (Y/n): ").lower() != 'n'
+    try:
+        settings['minHeadroomPct'] = int(get_input(f"Ambang headroom % [{settings['minHeadroomPct']}]: ").strip()
+                                         or settings['minHeadroomPct'])
+    except ValueError:
+        print(color_log("Input tidak valid.\n", 'red'))
+        return
+    mode = get_input(f"Mode (threads/cgroup) [{settings['mode']}]: ").strip() or settings['mode']
+    if mode not in ('threads', 'cgroup'):
+        print(color_log("Mode tidak valid.\n", 'red'))
+        return
+    if mode == 'cgroup' and not cgroup_v2_available():
+        print(color_log("cgroup v2 tidak tersedia di sistem ini.\n", 'red'))
+        return
+    settings['mode'] = mode
+    tool_settings['memoryGovernor'] = settings
+    save_configuration()
+    print(color_log("Pengaturan disimpan. Jalankan ulang daemon supervisor agar berlaku.\n", 'green'))
+
+# --- Governor Beban CPU (Steal/PSI) ---
+# Pada VPS bersama, steal time berubah sepanjang hari. Governor ini menurunkan --max-threads
+# saat steal/tekanan CPU tinggi dan menaikkannya kembali saat kapasitas menganggur, dengan
+# histeresis (beberapa sampel berturut-turut + cooldown) agar prover tidak terus di-restart.
+PSI_CPU_PATH = '/proc/pressure/cpu'
+LOAD_GOVERNOR_DEFAULTS = {
+    'enabled': False,
+    'interval': 30,  # Detik antar sampel
+    'holdSamples': 3,  # Sampel berturut-turut di luar ambang sebelum bertindak
+    'cooldown': 300,  # Detik minimum antar penyesuaian
+    'highStealPct': 10, 'lowStealPct': 3,
+    'highPressurePct': 25, 'lowPressurePct': 5,  # PSI cpu 'some avg10'
+    'highIowaitPct': 20,
+    'minIdlePct': 20,  # Idle minimum agar thread boleh dinaikkan
+    'step': 0.25,  # Porsi thread yang diubah per penyesuaian
+}
+
+def get_load_governor_settings() -> dict:
+    """Pengaturan governor beban digabung dengan nilai default."""
+    return {**LOAD_GOVERNOR_DEFAULTS, **tool_settings.get('loadGovernor', {})}
+
+def read_cpu_times(path: str = '/proc/stat') -> List[int]:
+    """Baris 'cpu' agregat: user nice system idle iowait irq softirq steal."""
+    with open(path) as f:
+        return [int(v) for v in f.readline().split()[1:9]]
+
+def cpu_time_shares(previous: List[int], current: List[int]) -> dict:
+    """Persentase steal, iowait, dan idle di antara dua pembacaan /proc/stat."""
+    delta = [c - p for p, c in zip(previous, current)]
+    total = sum(delta) or 1
+    return {'steal': delta[7] * 100 / total, 'iowait': delta[4] * 100 / total, 'idle': delta[3] * 100 / total}
+
+def read_cpu_pressure(path: str = PSI_CPU_PATH) -> Optional[float]:
+    """Nilai PSI 'some avg10' CPU, atau None jika kernel tidak mendukung PSI."""
+    try:
+        with open(path) as f:
+            for line in f:
+                if line.startswith('some'):
+                    return float(dict(field.split('=') for field in line.split()[1:])['avg10'])
+    except (OSError, KeyError, ValueError):
+        pass
+    return None
+
+class LoadGovernor:
+    """Keputusan naik/turun thread dengan histeresis; tidak melakukan I/O sendiri."""
+
+    def __init__(self, settings: dict):
+        self.settings = settings
+        self.high_streak = 0
+        self.low_streak = 0
+        self.last_action = None
+
+    def classify(self, sample: dict) -> tuple:
+        """Mengembalikan ('high'|'low'|None, alasan) untuk satu sampel."""
+        s = self.settings
+        pressure = sample.get('pressure')
+        reasons = []
+        if sample['steal'] >= s['highStealPct']:
+            reasons.append(f"steal {sample['steal']:.1f}% >= {s['highStealPct']}%")
+        if pressure is not None and pressure >= s['highPressurePct']:
+            reasons.append(f"PSI cpu {pressure:.1f}% >= {s['highPressurePct']}%")
+        if sample['iowait'] >= s['highIowaitPct']:
+            reasons.append(f"iowait {sample['iowait']:.1f}% >= {s['highIowaitPct']}%")
+        if reasons:
+            return 'high', ', '.join(reasons)
+        if (sample['steal'] <= s['lowStealPct'] and (pressure is None or pressure <= s['lowPressurePct'])
+                and sample['idle'] >= s['minIdlePct']):
+            return 'low', f"steal {sample['steal']:.1f}%, idle {sample['idle']:.1f}%" + (
+                f", PSI cpu {pressure:.1f}%" if pressure is not None else '')
+        return None, ''
+
+    def decide(self, sample: dict, now: float) -> tuple:
+        """Mengembalikan ('down'|'up'|None, alasan) setelah histeresis dan cooldown."""
+        level, reason = self.classify(sample)
+        self.high_streak = self.high_streak + 1 if level == 'high' else 0
+        self.low_streak = self.low_streak + 1 if level == 'low' else 0
+        if self.last_action is not None and now - self.last_action < self.settings['cooldown']:
+            return None, reason
+        hold = self.settings['holdSamples']
+        if self.high_streak >= hold:
+            direction = 'down'
+        elif self.low_streak >= hold:
+            direction = 'up'
+        else:
+            return None, reason
+        self.high_streak = self.low_streak = 0
+        self.last_action = now
+        return direction, f"{reason} selama {hold} sampel"
+
+def adjusted_threads(threads: int, ceiling: int, direction: str, step: float) -> int:
+    """Jumlah thread baru: turun/naik sebesar `step`, minimal berubah satu, dalam [1, ceiling]."""
+    change = max(1, int(threads * step))
+    if direction == 'down':
+        return max(1, threads - change)
+    return min(ceiling, threads + change)
+
+def show_load_governor_menu():
+    """Menampilkan beban CPU saat ini dan pengaturan governor beban."""
+    import time
+    settings = get_load_governor_settings()
+    print(color_log("⚖️  Governor Beban CPU (Steal/PSI)\n", 'cyan'))
+    first = read_cpu_times()
+    time.sleep(1)
+    shares = cpu_time_shares(first, read_cpu_times())
+    pressure = read_cpu_pressure()
+    print(f"- Steal  : {shares['steal']:.1f}%   iowait: {shares['iowait']:.1f}%   idle: {shares['idle']:.1f}%")
+    print(f"- PSI cpu: {f'{pressure:.1f}%' if pressure is not None else 'tidak tersedia'}")
+    state = color_log('AKTIF', 'green') if settings['enabled'] else color_log('NONAKTIF', 'red')
+    print(f"\nGovernor {state}: turunkan thread jika steal >= {settings['highStealPct']}% / PSI >= "
+          f"{settings['highPressurePct']}%, naikkan jika steal <= {settings['lowStealPct']}% dan idle >= "
+          f"{settings['minIdlePct']}%, setelah {settings['holdSamples']} sampel x {settings['interval']} detik.")
+    for event in node_events(kind='load', limit=5):
+        print(f"  {color_log(event['node_id'], 'yellow')}: {event['reason']}")
+
+    if get_input("\nUbah pengaturan? (y/N): ").lower() != 'y':
+        return
+    settings['enabled'] = get_input("Aktifkan governor beban? (y/N): ").lower() == 'y'
+    try:
+        for key, label in (('highStealPct', "Ambang steal tinggi %"), ('lowStealPct', "Ambang steal rendah %"),
+                           ('highPressurePct', "Ambang PSI tinggi %")):
+            settings[key] = float(get_input(f"{label} [{settings[key]}]: ").strip() or settings[key])
+    except ValueError:
+        print(color_log("Input tidak valid.\n", 'red'))
+        return
+    if settings['lowStealPct'] >= settings['highStealPct']:
+        print(color_log("Ambang rendah harus lebih kecil dari ambang tinggi.\n", 'red'))
+        return
+    tool_settings['loadGovernor'] = settings
+    save_configuration()
+    print(color_log("Pengaturan disimpan. Jalankan ulang daemon supervisor agar berlaku.\n", 'green'))
+
+# --- Log Node Terkompresi (Rotasi + Indeks Waktu) ---
+# Tiap blok baris ditulis sebagai gzip member terpisah sehingga pembaca cukup seek ke offset
+# blok yang waktunya cocok (dari indeks sidecar) tanpa mendekompresi seluruh segmen.
+NODE_LOG_BLOCK_BYTES = 64 * 1024  # Ukuran buffer mentah sebelum satu blok dikompresi
+NODE_LOG_FLUSH_SECONDS = 5.0  # Blok dikompresi paling lambat setelah ini
+NODE_LOG_DEFAULTS = {'segmentMb': 8, 'segmentMinutes': 60, 'maxMb': 64}
+NODE_LOG_LINE_PATTERN = re.compile(r'^(\d+\.\d+)\t(.*)$')
+
+def get_node_log_settings() -> dict:
+    """Pengaturan rotasi log node digabung dengan nilai default."""
+    return {**NODE_LOG_DEFAULTS, **tool_settings.get('nodeLogs', {})}
+
+def node_log_root() -> str:
+    return os.path.join(get_state_dir(), 'logs', 'nodes')
+
+def node_log_dir(log_node_id: str) -> str:
+    """Direktori segmen log satu node."""
+    return os.path.join(node_log_root(), re.sub(r'[^A-Za-z0-9_.-]', '_', log_node_id))
+
+class NodeLogWriter:
+    """Penulis log node: blok gzip + indeks JSONL [t_awal, t_akhir, offset, panjang, jumlah_baris]."""
+
+    def __init__(self, log_node_id: str, settings: Optional[dict] = None):
+        settings = settings or get_node_log_settings()
+        self.directory = node_log_dir(log_node_id)
+        self.segment_bytes = int(settings['segmentMb'] * 1024 * 1024)
+        self.segment_seconds = settings['segmentMinutes'] * 60
+        self.max_bytes = int(settings['maxMb'] * 1024 * 1024)
+        self.buffer = []
+        self.buffer_bytes = 0
+        self.first_time = None
+        self.last_time = None
+        self.segment = None
+        self.index = None
+        self.segment_started = 0.0
+        self.segment_raw = 0
+
+    def write(self, line: str, now: Optional[float] = None):
+        import time
+        now = time.time() if now is None else now
+        entry = f"{now:.3f}\t{line}\n".encode(errors='replace')
+        if self.first_time is None:
+            self.first_time = now
+        self.last_time = now
+        self.buffer.append(entry)
+        self.buffer_bytes += len(entry)
+        if self.buffer_bytes >= NODE_LOG_BLOCK_BYTES or now - self.first_time >= NODE_LOG_FLUSH_SECONDS:
+            self.flush()
+
+    def flush_if_stale(self):
+        import time
+        if self.buffer and time.time() - self.first_time >= NODE_LOG_FLUSH_SECONDS:
+            self.flush()
+
+    def flush(self):
+        """Mengompresi buffer menjadi satu blok dan mencatatnya di indeks."""
+        import gzip
+        if not self.buffer:
+            return
+        if self.segment is None:
+            self.open_segment(self.first_time)
+        block = gzip.compress(b''.join(self.buffer), compresslevel=6, mtime=0)
+        offset = self.segment.tell()
+        self.segment.write(block)
+        self.segment.flush()
+        # Indeks ditulis setelah blok: blok tanpa entri indeks hanya terlewat saat pencarian, tidak merusak.
+        self.index.write(json.dumps([round(self.first_time, 3), round(self.last_time, 3), offset,
+                                     len(block), len(self.buffer)]) + '\n')
+        self.index.flush()
+        self.segment_raw += self.buffer_bytes
+        self.buffer, self.buffer_bytes, self.first_time = [], 0, None
+        if self.segment_raw >= self.segment_bytes or self.last_time - self.segment_started >= self.segment_seconds:
+            self.close_segment()
+
+    def open_segment(self, started: float):
+        os.makedirs(self.directory, exist_ok=True)
+        base = os.path.join(self.directory, f"{int(started * 1000):013d}")
+        self.segment = open(base + '.log.gz', 'ab')
+        self.index = open(base + '.idx', 'a')
+        self.segment_started = started
+        self.segment_raw = 0
+
+    def close_segment(self):
+        if self.segment is not None:
+            self.segment.close()
+            self.index.close()
+            self.segment = self.index = None
+            self.prune()
+
+    def prune(self):
+        """Menghapus segmen tertua hingga total ukuran log node di bawah batas maxMb."""
+        try:
+            segments = sorted(name for name in os.listdir(self.directory) if name.endswith('.log.gz'))
+        except OSError:
+            return
+        sizes = {}
+        for name in segments:
+            try:
+                sizes[name] = os.path.getsize(os.path.join(self.directory, name))
+            except OSError:
+                sizes[name] = 0
+        total = sum(sizes.values())
+        for name in segments:
+            if total <= self.max_bytes:
+                break
+            base = os.path.join(self.directory, name[:-len('.log.gz')])
+            for path in (base + '.log.gz', base + '.idx'):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            total -= sizes[name]
+
+    def close(self):
+        self.flush()
+        self.close_segment()
+
+def run_log_sink(sink_node_id: str):
+    """Meneruskan stdin ke stdout (tampil di screen) sambil menulis log node terkompresi.
+
+    Setiap baris juga diumpankan ke NodeMetrics; snapshot-nya ditulis tiap
+    METRICS_SNAPSHOT_SECONDS untuk supervisor (/metrics), dashboard, dan `metrics`.
+    """
+    import select
+    import signal
+    import time
+
+    def hangup(signum, frame):
+        raise KeyboardInterrupt
+
+    # `screen -X quit` mengirim SIGHUP: blok log terakhir tetap ditulis dan snapshot metrik dihapus.
+    signal.signal(signal.SIGHUP, hangup)
+    signal.signal(signal.SIGTERM, hangup)
+    log = NodeLogWriter(sink_node_id)
+    metrics = NodeMetrics()
+    save_node_metrics(sink_node_id, metrics)
+    next_snapshot = time.monotonic() + METRICS_SNAPSHOT_SECONDS
+    stdin = sys.stdin.buffer.fileno()
+    stdout = sys.stdout.buffer
+    pending = b''
+    try:
+        while True:
+            ready, _, _ = select.select([stdin], [], [], min(NODE_LOG_FLUSH_SECONDS, METRICS_SNAPSHOT_SECONDS))
+            if ready:
+                chunk = os.read(stdin, OUTPUT_CHUNK)
+                if not chunk:
+                    break
+                stdout.write(chunk)
+                stdout.flush()
+                pending += chunk
+                *lines, pending = pending.split(b'\n')
+                now = time.time()
+                for line in lines:
+                    text = line.decode(errors='replace').rstrip('\r')
+                    log.write(text, now)
+                    metrics.feed(text, now)
+            log.flush_if_stale()
+            if time.monotonic() >= next_snapshot:
+                save_node_metrics(sink_node_id, metrics)
+                next_snapshot = time.monotonic() + METRICS_SNAPSHOT_SECONDS
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if pending:
+            log.write(pending.decode(errors='replace'))
+        log.close()
+        try:
+            os.remove(node_metrics_path(sink_node_id))
+        except OSError:
+            pass
+
+def parse_time_arg(value: str) -> float:
+    """'15m', '2h', '1d' (relatif terhadap sekarang) atau waktu ISO lokal, mis. '2024-05-01 13:00'."""
+    import datetime
+    import time
+    match = re.match(r'^(\d+(?:\.\d+)?)([smhd])$', value.strip())
+    if match:
+        return time.time() - float(match.group(1)) * {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}[match.group(2)]
+    return datetime.datetime.fromisoformat(value.strip()).timestamp()
+
+def read_node_log_blocks(log_node_id: str, since: Optional[float] = None, until: Optional[float] = None):
+    """Menghasilkan (waktu, baris) dari blok yang rentang waktunya beririsan dengan [since, until]."""
+    import zlib
+    directory = node_log_dir(log_node_id)
+    try:
+        indexes = sorted(name for name in os.listdir(directory) if name.endswith('.idx'))
+    except OSError:
+        return
+    for name in indexes:
+        base = os.path.join(directory, name[:-len('.idx')])
+        try:
+            with open(base + '.idx') as f:
+                blocks = [json.loads(line) for line in f if line.endswith('\n')]
+            segment = open(base + '.log.gz', 'rb')
+        except (OSError, ValueError):
+            continue
+        with segment:
+            for first, last, offset, length, _ in blocks:
+                if (since is not None and last < since) or (until is not None and first > until):
+                    continue
+                segment.seek(offset)
+                try:
+                    data = zlib.decompressobj(wbits=31).decompress(segment.read(length))
+                except zlib.error:
+                    continue
+                for raw in data.decode(errors='replace').splitlines():
+                    match = NODE_LOG_LINE_PATTERN.match(raw)
+                    if not match:
+                        continue
+                    stamp = float(match.group(1))
+                    if (since is None or stamp >= since) and (until is None or stamp <= until):
+                        yield stamp, match.group(2)
+
+def logged_node_ids() -> List[str]:
+    try:
+        return sorted(os.listdir(node_log_root()))
+    except OSError:
+        return []
+
+def search_node_logs(node_ids: Optional[List[str]] = None, since: Optional[float] = None,
+                     until: Optional[float] = None, pattern: Optional[str] = None, limit: int = 200) -> List[dict]:
+    """Mencari log beberapa node sekaligus; hasil diurutkan menurut waktu, diambil `limit` terakhir."""
+    import collections
+    import heapq
+    matcher = re.compile(pattern) if pattern else None
+
+    def matching(target: str):
+        for stamp, line in read_node_log_blocks(target, since, until):
+            if not matcher or matcher.search(line):
+                yield stamp, target, line
+
+    results = collections.deque(maxlen=limit) if limit else []
+    for stamp, target, line in heapq.merge(*(matching(target) for target in node_ids or logged_node_ids())):
+        results.append({'time': stamp, 'nodeId': target, 'line': line})
+    return list(results)
+
+def format_log_entry(entry: dict) -> str:
+    import datetime
+    stamp = datetime.datetime.fromtimestamp(entry['time']).strftime('%Y-%m-%d %H:%M:%S')
+    return f"{color_log(stamp, 'blue')} {color_log(entry['nodeId'], 'yellow')} {entry['line']}"
+
+def search_node_logs_menu():
+    """Menu interaktif pencarian log node yang tersimpan."""
+    available = logged_node_ids()
+    if not available:
+        print(color_log("Belum ada log node yang tersimpan.\n", 'yellow'))
+        return
+    print(color_log(f"Log tersedia untuk: {', '.join(available)}\n", 'cyan'))
+    targets = get_input("Node ID (pisahkan dengan koma, kosong = semua): ").strip()
+    since = get_input("Sejak (mis. 30m, 2h, 2024-05-01 13:00; kosong = semua): ").strip()
+    until = get_input("Hingga (kosong = sekarang): ").strip()
+    pattern = get_input("Filter regex (kosong = semua baris): ").strip()
+    try:
+        with trace_span('menu.search_logs'):
+            entries = search_node_logs([t.strip() for t in targets.split(',') if t.strip()] or None,
+                                       parse_time_arg(since) if since else None,
+                                       parse_time_arg(until) if until else None, pattern or None)
+    except (ValueError, re.error) as e:
+        print(color_log(f"❌ Input tidak valid: {e}\n", 'red'))
+        return
+    for entry in entries:
+        print(format_log_entry(entry))
+    print(color_log(f"\n{len(entries)} baris ditampilkan.\n", 'cyan'))
+
+# --- Watchdog Node Macet ---
+# Node yang masih "berjalan" tetapi tidak menghasilkan progres dideteksi dari waktu progres
+# terakhir. Untuk node supervisor waktu ini diperbarui langsung dari pipe; untuk node screen
+# dari log terkompresi (log-sink) yang dipantau dengan inotify, tanpa busy polling.
+WATCHDOG_DEFAULTS = {'enabled': True, 'quietMinutes': 30, 'progress': 'proofs'}
+WATCHDOG_RESCAN_SECONDS = 60  # Interval maksimum pemindaian ulang sesi screen
+WATCHDOG_TICK_SECONDS = 15  # Tidur maksimum watchdog supervisor sebelum membaca ulang daftar node
+WATCHDOG_KILL_GRACE = 10  # Detik sebelum SIGKILL jika prover macet mengabaikan SIGTERM
+WATCHDOG_SNAPSHOT_KEEP = 50
+WATCHDOG_SCREEN_SESSION = 'nexus-watchdog'
+
+def get_watchdog_settings() -> dict:
+    """Pengaturan watchdog digabung dengan nilai default."""
+    return {**WATCHDOG_DEFAULTS, **tool_settings.get('watchdog', {})}
+
+def is_progress_line(line: str, mode: str) -> bool:
+    """Mode 'proofs': hanya fetch task/proof yang dihitung progres; mode 'output': baris apa pun."""
+    return mode == 'output' or bool(PROOF_SUCCESS_PATTERN.search(line) or TASK_FETCH_PATTERN.search(line))
+
+def read_proc_text(pid: int, name: str) -> Optional[str]:
+    try:
+        with open(f'/proc/{pid}/{name}') as f:
+            return f.read()
+    except OSError as e:
+        return f"<tidak terbaca: {e.strerror}>"
+
+def capture_stall_snapshot(snapshot_node_id: str, pid: Optional[int], last_lines: List[str], reason: str) -> str:
+    """Menyimpan snapshot diagnostik (stack kernel, wchan, memori, baris terakhir) dan mengembalikan path-nya."""
+    import time
+    snapshot = {'nodeId': snapshot_node_id, 'pid': pid, 'capturedAt': time.time(), 'reason': reason,
+                'lastLines': last_lines[-50:]}
+    if pid:
+        status = read_proc_text(pid, 'status') or ''
+        snapshot.update({
+            'state': next((l.split(':', 1)[1].strip() for l in status.splitlines() if l.startswith('State:')), None),
+            'memory': read_process_memory(pid),
+            'stack': read_proc_text(pid, 'stack'),
+            'wchan': read_proc_text(pid, 'wchan'),
+            'threads': {},
+        })
+        try:
+            for tid in sorted(os.listdir(f'/proc/{pid}/task'), key=int)[:64]:
+                snapshot['threads'][tid] = read_proc_text(pid, f'task/{tid}/wchan')
+        except OSError:
+            pass
+    directory = os.path.join(get_state_dir(), 'diagnostics')
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"stall-{re.sub(r'[^A-Za-z0-9_.-]', '_', snapshot_node_id)}-{int(time.time())}.json")
+    write_json_atomic(path, snapshot)
+    for old in sorted(os.listdir(directory), key=lambda n: os.path.getmtime(os.path.join(directory, n)))[:-WATCHDOG_SNAPSHOT_KEEP]:
+        try:
+            os.remove(os.path.join(directory, old))
+        except OSError:
+            pass
+    return path
+
+def stall_restart_count(count_node_id: str) -> int:
+    return open_store().execute("SELECT COUNT(*) FROM node_events WHERE node_id = ? AND kind = 'stall'",
+                                (count_node_id,)).fetchone()[0]
+
+class DirectoryWatcher:
+    """Menunggu perubahan di beberapa direktori lewat inotify (ctypes); tanpa inotify cukup tidur hingga timeout."""
+    IN_MODIFY = 0x002
+    IN_MOVED_TO = 0x080
+    IN_CREATE = 0x100
+
+    def __init__(self):
+        import ctypes
+        self.watches = {}
+        self.keys = {}
+        try:
+            self.libc = ctypes.CDLL(None, use_errno=True)
+            self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        except (OSError, AttributeError):
+            self.fd = -1
+
+    def add(self, key: str, path: str):
+        if self.fd < 0 or key in self.keys:
+            return
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), self.IN_MODIFY | self.IN_CREATE | self.IN_MOVED_TO)
+        if wd >= 0:
+            self.watches[wd] = key
+            self.keys[key] = wd
+
+    def remove(self, key: str):
+        wd = self.keys.pop(key, None)
+        if wd is not None:
+            self.watches.pop(wd, None)
+            self.libc.inotify_rm_watch(self.fd, wd)
+
+    def wait(self, timeout: float) -> Optional[set]:
+        """Key yang berubah; None jika inotify tidak tersedia (semua harus dicek)."""
+        import select
+        import struct
+        import time
+        if self.fd < 0:
+            time.sleep(timeout)
+            return None
+        changed = set()
+        if not select.select([self.fd], [], [], max(0.0, timeout))[0]:
+            return changed
+        try:
+            data = os.read(self.fd, 65536)
+        except BlockingIOError:
+            return changed
+        offset = 0
+        while offset + 16 <= len(data):
+            wd, _, _, length = struct.unpack_from('iIII', data, offset)
+            offset += 16 + length
+            if wd in self.watches:
+                changed.add(self.watches[wd])
+        return changed
+
+def run_screen_watchdog(settings: Optional[dict] = None):
+    """Watchdog untuk node screen milik tool: memantau log-sink, snapshot + restart node yang macet."""
+    import time
+    settings = settings or get_watchdog_settings()
+    quiet = settings['quietMinutes'] * 60
+    watcher = DirectoryWatcher()
+    progress = {}  # node_id -> [waktu progres terakhir, waktu log yang sudah diperiksa]
+    sessions = {}
+    next_scan = 0.0
+    print(f"[watchdog] memantau node screen, batas diam {settings['quietMinutes']} menit, "
+          f"{'inotify' if watcher.fd >= 0 else 'tanpa inotify'}", flush=True)
+    while True:
+        now = time.time()
+        if now >= next_scan:
+            sessions = running_node_sessions()
+            for gone in set(progress) - set(sessions):
+                watcher.remove(gone)
+                progress.pop(gone)
+            for watched_id in sessions:
+                if watched_id not in progress:
+                    os.makedirs(node_log_dir(watched_id), exist_ok=True)
+                    watcher.add(watched_id, node_log_dir(watched_id))
+                    progress[watched_id] = [now, now]
+            next_scan = now + WATCHDOG_RESCAN_SECONDS
+        deadline = min([p[0] + quiet for p in progress.values()] + [next_scan])
+        changed = watcher.wait(max(0.0, deadline - time.time()))
+        for watched_id in (progress if changed is None else changed & set(progress)):
+            state = progress[watched_id]
+            for stamp, line in read_node_log_blocks(watched_id, since=state[1]):
+                state[1] = max(state[1], stamp)
+                if is_progress_line(line, settings['progress']):
+                    state[0] = max(state[0], stamp)
+        now = time.time()
+        for watched_id, state in list(progress.items()):
+            if now - state[0] < quiet:
+                continue
+            reason = f"tidak ada progres selama {(now - state[0]) / 60:.0f} menit"
+            pid = discover_prover_processes().get(watched_id)
+            last_lines = [e['line'] for e in search_node_logs([watched_id], since=now - quiet - 600, limit=50)]
+            snapshot = capture_stall_snapshot(watched_id, pid, last_lines, reason)
+            record_node_event(watched_id, 'stall', reason, {'pid': pid, 'snapshot': snapshot})
+            print(f"[watchdog] {watched_id}: {reason}, snapshot {snapshot}, restart ke-{stall_restart_count(watched_id)}",
+                  flush=True)
+            restart_running_node({'nodeId': watched_id, 'kind': 'screen', 'session': sessions[watched_id]})
+            state[0] = state[1] = time.time()
+
+def show_watchdog_menu():
+    """Status dan pengaturan watchdog node macet."""
+    settings = get_watchdog_settings()
+    state = color_log('AKTIF', 'green') if settings['enabled'] else color_log('NONAKTIF', 'red')
+    print(color_log("🐕 Watchdog Node Macet\n", 'cyan'))
+    print(f"Watchdog supervisor {state}: restart jika tidak ada progres ('{settings['progress']}') "
+          f"selama {settings['quietMinutes']} menit.")
+    running = WATCHDOG_SCREEN_SESSION in [s.split('.', 1)[-1] for s in list_screen_sessions()]
+    print(f"Watchdog node screen: {color_log('berjalan', 'green') if running else color_log('tidak berjalan', 'yellow')}")
+    for event in node_events(kind='stall', limit=5):
+        print(f"  {color_log(event['node_id'], 'yellow')}: {event['reason']} ({(event['detail'] or {}).get('snapshot')})")
+
+    print("\n1. Ubah pengaturan\n2. Jalankan watchdog node screen (sesi screen terpisah)\n3. Kembali")
+    choice = get_input("Pilihan [1-3]: ").strip()
+    if choice == '2':
+        if not screen_path:
+            print(color_log("Perintah 'screen' tidak ditemukan.\n", 'red'))
+        elif running:
+            print(color_log("Watchdog node screen sudah berjalan.\n", 'yellow'))
+        elif launch_in_screen(WATCHDOG_SCREEN_SESSION, tool_command('watchdog')):
+            print(color_log(f"✅ Watchdog berjalan di sesi screen '{WATCHDOG_SCREEN_SESSION}'.\n", 'green'))
+        return
+    if choice != '1':
+        return
+    settings['enabled'] = get_input("Aktifkan watchdog supervisor? (Y/n): ").lower() != 'n'
+    try:
+        settings['quietMinutes'] = float(get_input(f"Batas diam (menit) [{settings['quietMinutes']}]: ").strip()
+                                         or settings['quietMinutes'])
+    except ValueError:
+        print(color_log("Input tidak valid.\n", 'red'))
+        return
+    mode = get_input(f"Progres dihitung dari (proofs/output) [{settings['progress']}]: ").strip() or settings['progress']
+    if mode not in ('proofs', 'output') or settings['quietMinutes'] <= 0:
+        print(color_log("Input tidak valid.\n", 'red'))
+        return
+    settings['progress'] = mode
+    tool_settings['watchdog'] = settings
+    save_configuration()
+    print(color_log("Pengaturan disimpan. Jalankan ulang daemon supervisor/watchdog agar berlaku.\n", 'green'))
+
+# --- Supervisor Proses (asyncio) ---
+SUPERVISOR_RING_LINES = 2000  # Jumlah baris output terakhir yang disimpan per node
+SUPERVISOR_MAX_LINE = 4096  # Baris yang lebih panjang akan dipotong
+SUPERVISOR_MAX_BACKOFF = 300.0  # Jeda restart maksimum (detik)
+SUPERVISOR_STABLE_SECONDS = 60.0  # Node yang hidup selama ini dianggap stabil, backoff direset
+METRICS_DEFAULT_PORT = 9465  # Port endpoint Prometheus di localhost
+
+def get_state_dir() -> str:
+    """Direktori state tool (socket, log, cache) di home pengguna."""
+    path = os.path.join(user_home or get_user_home(), '.nexus_tool')
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def supervisor_socket_path() -> str:
+    """Path Unix socket milik daemon supervisor."""
+    return os.path.join(get_state_dir(), 'supervisor.sock')
+
+class SupervisedNode:
+    """Satu proses nexus-network yang diawasi oleh supervisor."""
+
+    def __init__(self, node_id: str, threads: Optional[int] = None, cpus: Optional[List[int]] = None):
+        import collections
+        self.node_id = node_id
+        self.threads = threads
+        self.base_threads = threads  # Thread yang diminta operator; batas atas governor beban
+        self.cpus = cpus
+        self.output = collections.deque(maxlen=SUPERVISOR_RING_LINES)
+        self.metrics = NodeMetrics()
+        self.log = NodeLogWriter(node_id)
+        self.listeners = set()
+        self.process = None
+        self.task = None
+        self.wanted = True
+        self.restart_requested = False
+        self.restarts = 0
+        self.started_at = None
+        self.last_exit = None
+        self.next_restart = None
+        self.rss_kb = 0
+        self.peak_rss_kb = 0
+        self.last_governed = 0.0
+        self.governor_actions = 0
+        self.last_progress = 0.0
+        self.stall_restarts = 0
+        self.progress_mode = WATCHDOG_DEFAULTS['progress']
+
+    def emit(self, line: str):
+        """Menyimpan satu baris output ke ring buffer dan meneruskannya ke klien yang attach."""
+        import time
+        line = line[:SUPERVISOR_MAX_LINE]
+        self.output.append(line)
+        self.metrics.feed(line)
+        self.log.write(line)
+        if is_progress_line(line, self.progress_mode):
+            self.last_progress = time.time()
+        for queue in list(self.listeners):
+            if queue.qsize() < SUPERVISOR_RING_LINES:
+                queue.put_nowait(line)
+
+    def status(self) -> dict:
+        """Ringkasan status node untuk perintah 'status'."""
+        import time
+        running = self.process is not None and self.process.returncode is None
+        return {
+            'nodeId': self.node_id,
+            'threads': self.threads,
+            'cpus': format_cpu_list(self.cpus) if self.cpus else None,
+            'pid': self.process.pid if running else None,
+            'state': 'running' if running else ('stopped' if not self.wanted else
+                                                 'backoff' if self.next_restart else 'starting'),
+            'uptime': round(time.time() - self.started_at, 1) if running and self.started_at else 0,
+            'restarts': self.restarts,
+            'lastExit': self.last_exit,
+            'nextRestart': self.next_restart,
+            'peakRssKb': self.peak_rss_kb,
+            'baseThreads': self.base_threads,
+            'lastProgress': round(self.last_progress, 1) or None,
+            'stallRestarts': self.stall_restarts,
+            'governorActions': self.governor_actions,
+            'metrics': self.metrics.snapshot(),
+        }
+
+class Supervisor:
+    """Daemon asyncio yang menjalankan node secara langsung dan me-restart node yang crash."""
+
+    def __init__(self, cli_path: Optional[str], socket_path: str, metrics_port: Optional[int] = None,
+                 governor_settings: Optional[dict] = None, load_settings: Optional[dict] = None,
+                 watchdog_settings: Optional[dict] = None):
+        self.cli_path = cli_path
+        self.socket_path = socket_path
+        self.metrics_port = metrics_port
+        self.governor_settings = governor_settings
+        self.load_settings = load_settings
+        self.watchdog_settings = watchdog_settings
+        self.nodes = {}
+        self.server = None
+        self.stopping = None
+
+    def build_command(self, node: SupervisedNode) -> List[str]:
+        # Versi terkelola dicek setiap spawn agar restart setelah upgrade langsung memakai binary baru.
+        managed = managed_cli_path()
+        cli_path = managed if os.access(managed, os.X_OK) else self.cli_path
+        command = [cli_path, "start", "--node-id", node.node_id]
+        if node.threads:
+            command.extend(["--max-threads", str(node.threads)])
+        return pin_command(command, node.cpus)
+
+    async def pump_output(self, node: SupervisedNode):
+        """Membaca stdout child per blok besar dan memecahnya menjadi baris."""
+        pending = b''
+        while True:
+            chunk = await node.process.stdout.read(65536)
+            if not chunk:
+                break
+            pending += chunk
+            *lines, pending = pending.split(b'\n')
+            for line in lines:
+                node.emit(line.decode(errors='replace').rstrip('\r'))
+            if len(pending) > SUPERVISOR_MAX_LINE:
+                node.emit(pending.decode(errors='replace'))
+                pending = b''
+        if pending:
+            node.emit(pending.decode(errors='replace'))
+
+    async def run_node(self, node: SupervisedNode):
+        """Loop hidup satu node: jalankan, tunggu keluar, restart dengan exponential backoff."""
+        import asyncio
+        import time
+        backoff = 1.0
+        while node.wanted:
+            started = time.time()
+            node.next_restart = None
+            try:
+                node.process = await asyncio.create_subprocess_exec(
+                    *self.build_command(node), stdin=asyncio.subprocess.DEVNULL,
+                    stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT,
+                    start_new_session=True)
+            except OSError as e:
+                node.emit(f"[supervisor] gagal menjalankan node: {e}")
+                node.last_exit = None
+            else:
+                node.started_at = started
+                node.last_progress = started
+                node.emit(f"[supervisor] node dimulai (pid {node.process.pid})")
+                launch_id = record_launch(node.node_id, 'supervisor', node.threads, node.process.pid)
+                await self.pump_output(node)
+                node.last_exit = await node.process.wait()
+                record_launch_end(launch_id, node.last_exit,
+                                  {**node.metrics.snapshot(), 'peakRssKb': node.peak_rss_kb})
+            if not node.wanted:
+                break
+            if node.restart_requested:
+                node.restart_requested = False
+                backoff = 1.0
+                continue
+            if time.time() - started >= SUPERVISOR_STABLE_SECONDS:
+                backoff = 1.0
+            node.restarts += 1
+            node.next_restart = round(time.time() + backoff, 1)
+            node.emit(f"[supervisor] node keluar dengan kode {node.last_exit}, restart dalam {backoff:.0f} detik")
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, SUPERVISOR_MAX_BACKOFF)
+
+    def signal_node(self, node: SupervisedNode, sig: int):
+        """Mengirim sinyal ke seluruh process group node."""
+        if node.process is not None and node.process.returncode is None:
+            try:
+                os.killpg(node.process.pid, sig)
+            except ProcessLookupError:
+                pass
+
+    def start_node(self, node_id: str, threads: Optional[int] = None, cpus: Optional[List[int]] = None) -> dict:
+        import asyncio
+        if not self.cli_path:
+            return {'ok': False, 'error': "nexus-network tidak ditemukan"}
+        if node_id in self.nodes:
+            return {'ok': False, 'error': f"node {node_id} sudah diawasi"}
+        node = SupervisedNode(node_id, threads, cpus)
+        if self.watchdog_settings:
+            node.progress_mode = self.watchdog_settings['progress']
+        node.task = asyncio.create_task(self.run_node(node))
+        self.nodes[node_id] = node
+        return {'ok': True, 'node': node.status()}
+
+    async def stop_node(self, node_id: str) -> dict:
+        import asyncio
+        import signal
+        node = self.nodes.pop(node_id, None)
+        if node is None:
+            return {'ok': False, 'error': f"node {node_id} tidak ditemukan"}
+        node.wanted = False
+        self.signal_node(node, signal.SIGTERM)
+        try:
+            await asyncio.wait_for(asyncio.shield(node.task), timeout=10)
+        except asyncio.TimeoutError:
+            self.signal_node(node, signal.SIGKILL)
+        node.task.cancel()
+        node.log.close()
+        return {'ok': True}
+
+    def restart_node(self, node_id: str, threads: Optional[int] = None) -> dict:
+        import signal
+        node = self.nodes.get(node_id)
+        if node is None:
+            return {'ok': False, 'error': f"node {node_id} tidak ditemukan"}
+        if threads:
+            node.threads = threads
+        if node.process is not None and node.process.returncode is None:
+            node.restart_requested = True
+            self.signal_node(node, signal.SIGTERM)
+        return {'ok': True}
+
+    async def memory_governor(self, settings: dict):
+        """Memantau headroom memori dan bertindak sebelum kernel melakukan OOM kill."""
+        import asyncio
+        import time
+        peaks = load_memory_peaks()
+        while True:
+            await asyncio.sleep(GOVERNOR_INTERVAL)
+            running = [n for n in self.nodes.values() if n.process is not None and n.process.returncode is None]
+            for node in running:
+                memory = read_process_memory(node.process.pid)
+                node.rss_kb = memory.get('VmRSS', 0)
+                node.peak_rss_kb = max(node.peak_rss_kb, memory.get('VmHWM', 0))
+                if node.peak_rss_kb > peaks.get(node.node_id, 0):
+                    peaks[node.node_id] = node.peak_rss_kb
+                    write_json_atomic(memory_peaks_path(), peaks)
+
+            meminfo = read_meminfo()
+            total = meminfo.get('MemTotal', 0)
+            if not total or not running:
+                continue
+            headroom_pct = meminfo.get('MemAvailable', total) * 100 / total
+            if headroom_pct >= settings['minHeadroomPct']:
+                continue
+
+            now = time.time()
+            candidates = [n for n in running if now - n.last_governed >= GOVERNOR_COOLDOWN]
+            if not candidates:
+                continue
+            node = max(candidates, key=lambda n: n.rss_kb)
+            node.last_governed = now
+            node.governor_actions += 1
+            reason = f"headroom memori {headroom_pct:.1f}% < {settings['minHeadroomPct']}%"
+            if settings['mode'] == 'cgroup':
+                running_peaks = {n.node_id: n.peak_rss_kb for n in running}
+                limit = memory_high_limit(node.node_id, running_peaks, total, settings['minHeadroomPct'])
+                applied = apply_memory_high(node.node_id, node.process.pid, limit)
+                action = (f"memory.high={applied // (1024 * 1024)}MB" if applied
+                          else "gagal memasang memory.high (tidak ada subtree cgroup terdelegasi)")
+                node.emit(f"[governor] {reason}: {action}")
+            else:
+                threads = node.threads or os.cpu_count() or 1
+                if threads <= 1:
+                    node.emit(f"[governor] {reason}: thread sudah minimum, tidak ada tindakan")
+                    continue
+                new_threads = max(1, threads * 3 // 4)
+                node.emit(f"[governor] {reason}: menurunkan --max-threads {threads} -> {new_threads} dan restart")
+                self.restart_node(node.node_id, new_threads)
+            print(f"[governor] {node.node_id}: {reason}", flush=True)
+            record_node_event(node.node_id, 'memory', reason, {'mode': settings['mode'], 'rssKb': node.rss_kb})
+
+    async def load_governor(self, settings: dict):
+        """Menyesuaikan thread satu node per tindakan mengikuti steal/PSI CPU host."""
+        import asyncio
+        import time
+        governor = LoadGovernor(settings)
+        previous = read_cpu_times()
+        while True:
+            await asyncio.sleep(settings['interval'])
+            current = read_cpu_times()
+            sample = {**cpu_time_shares(previous, current), 'pressure': read_cpu_pressure()}
+            previous = current
+            running = [n for n in self.nodes.values() if n.process is not None and n.process.returncode is None]
+            direction, reason = governor.decide(sample, time.time())
+            if not direction or not running:
+                continue
+            ceiling = lambda n: n.base_threads or os.cpu_count() or 1
+            current_threads = lambda n: n.threads or ceiling(n)
+            if direction == 'down':
+                candidates = [n for n in running if current_threads(n) > 1]
+                node = max(candidates, key=current_threads, default=None)
+            else:
+                candidates = [n for n in running if current_threads(n) < ceiling(n)]
+                node = min(candidates, key=lambda n: current_threads(n) / ceiling(n), default=None)
+            if node is None:
+                continue
+            threads = current_threads(node)
+            new_threads = adjusted_threads(threads, ceiling(node), direction, settings['step'])
+            message = f"{reason}: --max-threads {threads} -> {new_threads}"
+            node.governor_actions += 1
+            node.emit(f"[governor-beban] {message}, restart")
+            print(f"[governor-beban] {node.node_id}: {message}", flush=True)
+            record_node_event(node.node_id, 'load', message, {'direction': direction, 'from': threads,
+                                                                'to': new_threads, 'sample': sample})
+            self.restart_node(node.node_id, new_threads)
+
+    async def stall_watchdog(self, settings: dict):
+        """Me-restart node yang diam melebihi quietMinutes.
+
+        Tidur hingga tenggat terdekat, paling lama WATCHDOG_TICK_SECONDS, lalu membaca ulang
+        daftar node sehingga node yang dimulai atau di-restart selama tidur ikut diperiksa.
+        """
+        import asyncio
+        import signal
+        import time
+        quiet = settings['quietMinutes'] * 60
+        running = lambda: [n for n in self.nodes.values() if n.process is not None and n.process.returncode is None]
+        while True:
+            now = time.time()
+            deadline = min((n.last_progress + quiet for n in running()), default=now + WATCHDOG_TICK_SECONDS)
+            await asyncio.sleep(min(max(1.0, deadline - now), WATCHDOG_TICK_SECONDS))
+            now = time.time()
+            for node in running():
+                if now - node.last_progress < quiet:
+                    continue
+                pid = node.process.pid
+                reason = f"tidak ada progres selama {(now - node.last_progress) / 60:.0f} menit"
+                snapshot = capture_stall_snapshot(node.node_id, pid, list(node.output), reason)
+                node.stall_restarts += 1
+                node.emit(f"[watchdog] {reason}, snapshot {snapshot}, restart")
+                print(f"[watchdog] {node.node_id}: {reason}", flush=True)
+                record_node_event(node.node_id, 'stall', reason, {'pid': pid, 'snapshot': snapshot,
+                                                                  'restarts': node.stall_restarts})
+                node.last_progress = now
+                self.restart_node(node.node_id)
+                asyncio.get_running_loop().call_later(
+                    WATCHDOG_KILL_GRACE, lambda n=node, p=pid: n.process and n.process.pid == p
+                    and self.signal_node(n, signal.SIGKILL))
+
+    async def dispatch(self, request: dict) -> dict:
+        """Menjalankan satu perintah dari klien socket."""
+        cmd = request.get('cmd')
+        if cmd == 'ping':
+            return {'ok': True, 'pid': os.getpid()}
+        if cmd == 'status':
+            return {'ok': True, 'nodes': [n.status() for n in self.nodes.values()]}
+        if cmd == 'metrics':
+            nodes = [n.status() for n in self.nodes.values()] + load_screen_node_metrics(self.nodes)
+            return {'ok': True, 'metrics': {n['nodeId']: n['metrics'] for n in nodes}}
+        if cmd == 'start':
+            return self.start_node(request['nodeId'], request.get('threads'), request.get('cpus'))
+        if cmd == 'stop':
+            return await self.stop_node(request['nodeId'])
+        if cmd == 'restart':
+            if request.get('threads') and request['nodeId'] in self.nodes:
+                self.nodes[request['nodeId']].base_threads = request['threads']
+            return self.restart_node(request['nodeId'], request.get('threads'))
+        if cmd == 'logs':
+            node = self.nodes.get(request.get('nodeId'))
+            if node is None:
+                return {'ok': False, 'error': "node tidak ditemukan"}
+            count = int(request.get('lines', 100))
+            return {'ok': True, 'lines': list(node.output)[-count:]}
+        if cmd == 'shutdown':
+            self.stopping.set()
+            return {'ok': True}
+        return {'ok': False, 'error': f"perintah tidak dikenal: {cmd}"}
+
+    async def attach(self, node: SupervisedNode, reader, writer):
+        """Mengalirkan output node ke klien hingga klien melepas (detach)."""
+        import asyncio
+        queue = asyncio.Queue()
+        for line in list(node.output)[-100:]:
+            queue.put_nowait(line)
+        node.listeners.add(queue)
+        closed = asyncio.ensure_future(reader.read())
+        try:
+            while not closed.done():
+                getter = asyncio.ensure_future(queue.get())
+                await asyncio.wait({getter, closed}, return_when=asyncio.FIRST_COMPLETED)
+                if not getter.done():
+                    getter.cancel()
+                    break
+                writer.write(getter.result().encode() + b'\n')
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            node.listeners.discard(queue)
+            closed.cancel()
+
+    async def handle_client(self, reader, writer):
+        try:
+            request = json.loads(await reader.readline() or b'{}')
+            if request.get('cmd') == 'attach' and request.get('nodeId') in self.nodes:
+                await self.attach(self.nodes[request['nodeId']], reader, writer)
+                return
+            try:
+                response = await self.dispatch(request)
+            except (KeyError, TypeError, ValueError) as e:
+                response = {'ok': False, 'error': f"permintaan tidak valid: {e}"}
+            writer.write(json.dumps(response).encode() + b'\n')
+            await writer.drain()
+        except (ConnectionError, json.JSONDecodeError):
+            pass
+        finally:
+            writer.close()
+
+    async def handle_http(self, reader, writer):
+        """Endpoint HTTP minimal: /metrics (Prometheus) dan /metrics.json."""
+        try:
+            request_line = (await reader.readline()).decode(errors='replace').split()
+            while (await reader.readline()).strip():
+                pass
+            path = request_line[1] if len(request_line) > 1 else '/'
+            nodes = [n.status() for n in self.nodes.values()] + load_screen_node_metrics(self.nodes)
+            if path == '/metrics':
+                status, content_type, body = '200 OK', 'text/plain; version=0.0.4', render_prometheus(nodes)
+            elif path == '/metrics.json':
+                status, content_type = '200 OK', 'application/json'
+                body = json.dumps({n['nodeId']: n['metrics'] for n in nodes})
+            else:
+                status, content_type, body = '404 Not Found', 'text/plain', 'not found\n'
+            payload = body.encode()
+            writer.write(f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+                         f"Content-Length: {len(payload)}\r\nConnection: close\r\n\r\n".encode() + payload)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def flush_node_logs(self):
+        """Memastikan output node yang sepi tetap masuk ke log dalam NODE_LOG_FLUSH_SECONDS."""
+        import asyncio
+        while True:
+            await asyncio.sleep(NODE_LOG_FLUSH_SECONDS)
+            for node in list(self.nodes.values()):
+                node.log.flush_if_stale()
+
+    async def serve(self):
+        """Menjalankan server Unix socket hingga menerima perintah shutdown atau SIGTERM."""
+        import asyncio
+        import signal
+        self.stopping = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, self.stopping.set)
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        self.server = await asyncio.start_unix_server(self.handle_client, path=self.socket_path)
+        os.chmod(self.socket_path, 0o600)
+        metrics_server = None
+        if self.metrics_port:
+            try:
+                metrics_server = await asyncio.start_server(self.handle_http, '127.0.0.1', self.metrics_port)
+            except OSError as e:
+                print(f"Endpoint metrik tidak dapat dibuka di port {self.metrics_port}: {e}", flush=True)
+        governor = None
+        if self.governor_settings and self.governor_settings.get('enabled'):
+            governor = asyncio.create_task(self.memory_governor(self.governor_settings))
+        load_governor = None
+        if self.load_settings and self.load_settings.get('enabled'):
+            load_governor = asyncio.create_task(self.load_governor(self.load_settings))
+        watchdog = None
+        if self.watchdog_settings and self.watchdog_settings.get('enabled'):
+            watchdog = asyncio.create_task(self.stall_watchdog(self.watchdog_settings))
+        log_flusher = asyncio.create_task(self.flush_node_logs())
+        try:
+            await self.stopping.wait()
+        finally:
+            log_flusher.cancel()
+            if load_governor:
+                load_governor.cancel()
+            if watchdog:
+                watchdog.cancel()
+            if governor:
+                governor.cancel()
+            self.server.close()
+            if metrics_server:
+                metrics_server.close()
+            for node_id in list(self.nodes):
+                await self.stop_node(node_id)
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+def run_supervisor():
+    """Titik masuk proses daemon supervisor."""
+    import asyncio
+    init_paths()
+    load_configuration(quiet=True)
+    metrics_port = tool_settings.get('metricsPort', METRICS_DEFAULT_PORT)
+    asyncio.run(Supervisor(nexus_cli_path, supervisor_socket_path(), metrics_port,
+                           get_governor_settings(), get_load_governor_settings(),
+                           get_watchdog_settings()).serve())
+
+def supervisor_request(payload: dict, timeout: float = 15.0) -> Optional[dict]:
+    """Mengirim satu perintah ke daemon supervisor. None jika daemon tidak berjalan."""
+    import socket
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(supervisor_socket_path())
+            sock.sendall(json.dumps(payload).encode() + b'\n')
+            data = b''
+            while not data.endswith(b'\n'):
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                data += chunk
+        return json.loads(data) if data else None
+    except (OSError, json.JSONDecodeError):
+        return None
+
+def start_supervisor_daemon() -> bool:
+    """Menjalankan daemon supervisor di background jika belum berjalan."""
+    import subprocess
+    import time
+    if supervisor_request({'cmd': 'ping'}):
+        return True
+    log_path = os.path.join(get_state_dir(), 'supervisor.log')
+    with open(log_path, 'ab') as log:
+        subprocess.Popen(tool_command('supervisor'),
+                         stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT,
+                         start_new_session=True)
+    for _ in range(50):
+        time.sleep(0.1)
+        if supervisor_request({'cmd': 'ping'}, timeout=1.0):
+            return True
+    print(color_log(f"❌ Daemon supervisor gagal berjalan. Periksa {log_path}.\n", 'red'))
+    return False
+
+def print_supervisor_status():
+    """Menampilkan status node yang diawasi supervisor."""
+    response = supervisor_request({'cmd': 'status'})
+    if response is None:
+        print(color_log("Daemon supervisor tidak berjalan.\n", 'yellow'))
+        return
+    if not response['nodes']:
+        print(color_log("Belum ada node yang diawasi supervisor.\n", 'yellow'))
+        return
+    colors = {'running': 'green', 'backoff': 'yellow', 'stopped': 'red'}
+    for node in response['nodes']:
+        state = color_log(node['state'].upper(), colors.get(node['state'], 'reset'))
+        print(f"- {color_log(node['nodeId'], 'yellow')}: {state} pid={node['pid']} thread={node['threads'] or '-'} "
+              f"uptime={node['uptime']:.0f}s restart={node['restarts']} exit_terakhir={node['lastExit']}")
+
+def attach_supervisor_logs(attach_node_id: str):
+    """Menampilkan output langsung dari node supervisor; CTRL+C untuk detach."""
+    import socket
+    print(color_log(f"Attach ke node '{attach_node_id}'. Tekan CTRL+C untuk detach.\n", 'cyan'))
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(supervisor_socket_path())
+            sock.sendall(json.dumps({'cmd': 'attach', 'nodeId': attach_node_id}).encode() + b'\n')
+            while True:
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                sys.stdout.write(chunk.decode(errors='replace'))
+                sys.stdout.flush()
+    except KeyboardInterrupt:
+        print(color_log("\nDetach dari node.\n", 'yellow'))
+    except OSError as e:
+        print(color_log(f"❌ Gagal attach: {e}\n", 'red'))
+
+def print_metrics_snapshot():
+    """Menampilkan snapshot metrik seluruh node supervisor dalam format JSON."""
+    response = supervisor_request({'cmd': 'metrics'})
+    if response is None:
+        print(color_log("Daemon supervisor tidak berjalan.\n", 'yellow'))
+        return
+    print(json.dumps(response['metrics'], indent=2))
+    port = tool_settings.get('metricsPort', METRICS_DEFAULT_PORT)
+    if port:
+        print(color_log(f"\nEndpoint Prometheus: http://127.0.0.1:{port}/metrics", 'cyan'))
+
+def select_supervised_node(prompt: str) -> Optional[str]:
+    """Meminta pengguna memilih node yang sedang diawasi supervisor."""
+    response = supervisor_request({'cmd': 'status'})
+    nodes = [n['nodeId'] for n in response['nodes']] if response else []
+    if not nodes:
+        print(color_log("Belum ada node yang diawasi supervisor.\n", 'yellow'))
+        return None
+    for i, supervised_id in enumerate(nodes, 1):
+        print(f"{i}. {color_log(supervised_id, 'yellow')}")
+    try:
+        index = int(get_input(prompt)) - 1
+        if 0 <= index < len(nodes):
+            return nodes[index]
+    except ValueError:
+        pass
+    print(color_log("Pilihan tidak valid.\n", 'red'))
+    return None
+
+def supervisor_start_single():
+    """Menjalankan satu node di bawah supervisor."""
+    target = get_input(f"Node ID [{node_id or ''}]: ").strip() or node_id
+    if not target:
+        print(color_log("Node ID tidak boleh kosong.\n", 'red'))
+        return
+    threads_input = get_input("Jumlah thread (kosongkan untuk default): ").strip()
+    try:
+        threads = int(threads_input) if threads_input else get_tuned_threads()
+    except ValueError:
+        print(color_log("Input tidak valid.\n", 'red'))
+        return
+    response = supervisor_request({'cmd': 'start', 'nodeId': target, 'threads': threads})
+    if response and response.get('ok'):
+        print(color_log(f"✅ Node '{target}' berjalan di bawah supervisor.\n", 'green'))
+    else:
+        print(color_log(f"❌ Gagal: {response.get('error') if response else 'supervisor tidak merespons'}\n", 'red'))
+
+def supervisor_start_fleet():
+    """Menjalankan seluruh node fleet di bawah supervisor."""
+    if not fleet_nodes:
+        print(color_log("Belum ada node di fleet.\n", 'yellow'))
+        return
+    plan = plan_fleet_threads(fleet_nodes)
+    placement = [None] * len(plan)
+    if tool_settings.get('cpuPinning'):
+        fleet_ids = [n['nodeId'] for n in fleet_nodes]
+        placement = show_cpu_placement(fleet_ids, plan, held_cpus(set(fleet_ids)))
+    for node, threads, cpus in zip(fleet_nodes, plan, placement):
+        response = supervisor_request({'cmd': 'start', 'nodeId': node['nodeId'], 'threads': threads, 'cpus': cpus})
+        if response and response.get('ok'):
+            print(color_log(f"✅ {node['nodeId']}: {threads} thread", 'green'))
+        else:
+            print(color_log(f"❌ {node['nodeId']}: {response.get('error') if response else 'tidak ada respons'}", 'red'))
+
+def show_supervisor_menu():
+    """Menampilkan submenu supervisor (pengganti screen)."""
+    while True:
+        clear_screen()
+        print(color_log("========== MENU SUPERVISOR NODE ==========\n", 'yellow'))
+        print_supervisor_status()
+        print("\n1. Jalankan Daemon Supervisor")
+        print("2. Jalankan Satu Node")
+        print("3. Jalankan Semua Node Fleet")
+        print("4. " + color_log("Hentikan Node", 'red'))
+        print("5. Restart Node")
+        print("6. Attach ke Log Node")
+        print("7. " + color_log("Matikan Daemon Supervisor", 'red'))
+        print("8. Snapshot Metrik (JSON)")
+        print("9. Kembali ke Menu Utama")
+
+        choice = get_input("Masukkan pilihan Anda [1-9]: ")
+
+        if choice == '9':
+            return
+        if choice == '1':
+            if start_supervisor_daemon():
+                print(color_log("✅ Daemon supervisor berjalan.\n", 'green'))
+        elif choice in ('2', '3', '4', '5', '6', '7', '8') and not supervisor_request({'cmd': 'ping'}):
+            print(color_log("Daemon supervisor belum berjalan. Pilih opsi 1 terlebih dahulu.\n", 'yellow'))
+        elif choice == '2': supervisor_start_single()
+        elif choice == '3': supervisor_start_fleet()
+        elif choice in ('4', '5', '6'):
+            target = select_supervised_node("Pilih node (nomor): ")
+            if target and choice == '4':
+                supervisor_request({'cmd': 'stop', 'nodeId': target})
+                print(color_log(f"Node '{target}' dihentikan.\n", 'green'))
+            elif target and choice == '5':
+                supervisor_request({'cmd': 'restart', 'nodeId': target})
+                print(color_log(f"Node '{target}' di-restart.\n", 'green'))
+            elif target:
+                attach_supervisor_logs(target)
+        elif choice == '7':
+            supervisor_request({'cmd': 'shutdown'})
+            print(color_log("Daemon supervisor dimatikan. Semua node yang diawasi dihentikan.\n", 'green'))
+        elif choice == '8': print_metrics_snapshot()
+        else: print(color_log("Pilihan tidak valid. Silakan coba lagi.\n", 'red'))
+
+        get_input(color_log("\nTekan [Enter] untuk kembali ke menu supervisor...", 'cyan'))
+
+# --- Upgrade Nexus CLI (Instalasi Berversi + Rolling Restart) ---
+# Setiap binary disimpan di ~/.nexus_tool/versions/<sha256>/nexus-network. Symlink 'current'
+# dan 'previous' dipindah secara atomik (os.replace), sehingga node yang di-restart langsung
+# memakai binary baru tanpa menimpa file yang sedang dieksekusi.
+CLI_INSTALLER_URL = "https://cli.nexus.xyz/"
+UPGRADE_KEEP_VERSIONS = 3  # Versi tidak aktif yang tetap disimpan untuk rollback
+UPGRADE_DEFAULTS = {'batchSize': 1, 'healthSeconds': 30, 'startTimeout': 60}
+
+def get_upgrade_settings() -> dict:
+    """Pengaturan rolling upgrade digabung dengan nilai default."""
+    return {**UPGRADE_DEFAULTS, **tool_settings.get('upgrade', {})}
+
+def cli_versions_dir() -> str:
+    path = os.path.join(get_state_dir(), 'versions')
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def managed_cli_path() -> str:
+    """Path stabil binary yang dikelola; dipakai supervisor dan screen agar restart ikut versi aktif."""
+    return os.path.join(get_state_dir(), 'current', 'nexus-network')
+
+def cli_version_link(name: str) -> Optional[str]:
+    """Hash versi yang ditunjuk symlink 'current' atau 'previous'."""
+    try:
+        return os.path.basename(os.readlink(os.path.join(get_state_dir(), name)))
+    except OSError:
+        return None
+
+def set_cli_version_link(name: str, digest: str):
+    link = os.path.join(get_state_dir(), name)
+    temporary = f"{link}.tmp-{os.getpid()}"
+    os.symlink(os.path.join('versions', digest), temporary)
+    os.replace(temporary, link)
+
+def file_sha256(path: str) -> str:
+    import hashlib
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def install_cli_version(binary: str) -> tuple:
+    """Menyimpan binary ke direktori versinya. Mengembalikan (hash, sudah_ada)."""
+    import subprocess
+    import shutil
+    import time
+    digest = file_sha256(binary)[:16]
+    target = os.path.join(cli_versions_dir(), digest)
+    if os.access(os.path.join(target, 'nexus-network'), os.X_OK):
+        return digest, True
+    staging = f"{target}.tmp-{os.getpid()}"
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+    shutil.copy2(binary, os.path.join(staging, 'nexus-network'))
+    os.chmod(os.path.join(staging, 'nexus-network'), 0o755)
+    try:
+        output = run_traced('nexus.version', [os.path.join(staging, 'nexus-network'), '--version'],
+                            capture_output=True, text=True, timeout=10).stdout.strip()
+    except (OSError, subprocess.TimeoutExpired):
+        output = ''
+    write_json_atomic(os.path.join(staging, 'meta.json'), {
+        'version': output.splitlines()[0] if output else None, 'source': binary, 'installedAt': int(time.time())})
+    os.rename(staging, target)
+    return digest, False
+
+def fetch_cli_release() -> Optional[str]:
+    """Menjalankan installer resmi dengan HOME sementara agar binary live tidak ditimpa."""
+    import shlex
+    import shutil
+    staging = os.path.join(cli_versions_dir(), f".download-{os.getpid()}")
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+    if not run_command(f"curl -sSf {CLI_INSTALLER_URL} | HOME={shlex.quote(staging)} NONINTERACTIVE=1 sh"):
+        return None
+    for root, _, files in os.walk(staging):
+        if 'nexus-network' in files:
+            return os.path.join(root, 'nexus-network')
+    print(color_log("❌ Installer selesai tetapi binary nexus-network tidak ditemukan.\n", 'red'))
+    return None
+
+def list_cli_versions() -> List[dict]:
+    current, previous = cli_version_link('current'), cli_version_link('previous')
+    versions = []
+    for digest in sorted(os.listdir(cli_versions_dir())):
+        meta_path = os.path.join(cli_versions_dir(), digest, 'meta.json')
+        if digest.startswith('.') or '.tmp-' in digest or not os.path.exists(meta_path):
+            continue
+        with open(meta_path) as f:
+            meta = json.load(f)
+        versions.append({'hash': digest, 'version': meta.get('version'), 'installedAt': meta.get('installedAt'),
+                         'current': digest == current, 'previous': digest == previous})
+    return sorted(versions, key=lambda v: v['installedAt'] or 0)
+
+def prune_cli_versions():
+    """Menghapus versi lama di luar 'current', 'previous', dan UPGRADE_KEEP_VERSIONS terbaru."""
+    import shutil
+    inactive = [v for v in list_cli_versions() if not v['current'] and not v['previous']]
+    for version in inactive[:max(0, len(inactive) - UPGRADE_KEEP_VERSIONS)]:
+        shutil.rmtree(os.path.join(cli_versions_dir(), version['hash']), ignore_errors=True)
+
+def switch_cli_version(digest: str):
+    """Mengaktifkan versi secara atomik; versi aktif sebelumnya menjadi 'previous'."""
+    global nexus_cli_path
+    current = cli_version_link('current')
+    if current and current != digest:
+        set_cli_version_link('previous', current)
+    set_cli_version_link('current', digest)
+    invalidate_executable_cache()
+    nexus_cli_path = managed_cli_path()
+
+def upgrade_targets() -> List[dict]:
+    """Node yang sedang berjalan dan dapat di-restart: node supervisor dan semua sesi screen milik tool."""
+    targets = []
+    response = supervisor_request({'cmd': 'status'}) if os.path.exists(supervisor_socket_path()) else None
+    for node in (response or {}).get('nodes', []):
+        if node['state'] != 'stopped':
+            targets.append({'nodeId': node['nodeId'], 'kind': 'supervisor'})
+    supervised = {t['nodeId'] for t in targets}
+    for entry in reconcile_sessions():
+        if entry['nodeId'] and entry['nodeId'] not in supervised:
+            targets.append({'nodeId': entry['nodeId'], 'kind': 'screen', 'session': entry['session']})
+    return targets
+
+def supervised_node_status(target_id: str) -> Optional[dict]:
+    response = supervisor_request({'cmd': 'status'}, timeout=5.0) or {}
+    return next((n for n in response.get('nodes', []) if n['nodeId'] == target_id), None)
+
+def restart_running_node(target: dict) -> dict:
+    """Me-restart satu node supervisor/screen dengan binary aktif. Mengembalikan info awal untuk cek kesehatan."""
+    if target['kind'] == 'supervisor':
+        before = supervised_node_status(target['nodeId']) or {}
+        supervisor_request({'cmd': 'restart', 'nodeId': target['nodeId']})
+        return {'oldPid': before.get('pid'), 'restarts': before.get('restarts', 0)}
+    old_pid = discover_prover_processes().get(target['nodeId'])
+    # Sesi dicari ulang di registry: sesi pada target bisa sudah diganti oleh restart sebelumnya.
+    stop_sessions([e for e in reconcile_sessions() if e['nodeId'] == target['nodeId']])
+    command, threads = node_launch_command(target['nodeId'])
+    launch_in_screen(target.get('session') or tool_screen_name(target['nodeId']), command, target['nodeId'], threads)
+    return {'oldPid': old_pid, 'restarts': 0}
+
+def wait_until_healthy(target: dict, baseline: dict, health_seconds: float, start_timeout: float) -> tuple:
+    """Node sehat jika proses baru hidup >= health_seconds tanpa keluar. Mengembalikan (ok, alasan)."""
+    import time
+    deadline = time.monotonic() + start_timeout
+    pid, since = None, None
+    while True:
+        if target['kind'] == 'supervisor':
+            node = supervised_node_status(target['nodeId'])
+            if node is None:
+                return False, "node hilang dari supervisor"
+            if node['restarts'] > baseline['restarts']:
+                return False, f"proses keluar dengan kode {node['lastExit']}"
+            current = node['pid'] if node['state'] == 'running' else None
+        else:
+            current = discover_prover_processes().get(target['nodeId'])
+        if current and current != baseline['oldPid']:
+            if pid and current != pid:
+                return False, "proses di-restart ulang saat masa uji"
+            if pid is None:
+                pid, since = current, time.monotonic()
+            if time.monotonic() - since >= health_seconds:
+                return True, f"pid {pid} sehat"
+        elif pid is not None:
+            return False, "proses berhenti saat masa uji"
+        elif time.monotonic() > deadline:
+            return False, f"proses baru tidak muncul dalam {start_timeout:.0f} detik"
+        time.sleep(1.0)
+
+def restart_and_check(batch: List[dict], health_seconds: float, start_timeout: float) -> List[tuple]:
+    """Me-restart sekumpulan node lalu menunggu semuanya sehat secara paralel. Mengembalikan [(ok, alasan)]."""
+    import concurrent.futures
+    if not batch:
+        return []
+    baselines = [restart_running_node(target) for target in batch]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(batch)) as pool:
+        checks = list(pool.map(lambda pair: wait_until_healthy(pair[0], pair[1], health_seconds, start_timeout),
+                               zip(batch, baselines)))
+    for target, (healthy, reason) in zip(batch, checks):
+        print(color_log(f"{'✅' if healthy else '❌'} {target['nodeId']}: {reason}", 'green' if healthy else 'red'))
+    return checks
+
+def rolling_restart(targets: List[dict], batch_size: int, health_seconds: float, start_timeout: float) -> dict:
+    """Me-restart node per batch; batch berikutnya hanya dimulai jika batch ini sehat."""
+    restarted = []
+    for start in range(0, len(targets), max(1, batch_size)):
+        batch = targets[start:start + max(1, batch_size)]
+        checks = restart_and_check(batch, health_seconds, start_timeout)
+        restarted.extend(batch)
+        for target, (healthy, reason) in zip(batch, checks):
+            if not healthy:
+                return {'ok': False, 'restarted': restarted, 'failed': target['nodeId'], 'reason': reason}
+    return {'ok': True, 'restarted': restarted}
+
+def upgrade_nexus_cli(binary: Optional[str] = None, batch_size: Optional[int] = None,
+                      health_seconds: Optional[float] = None, restart: bool = True) -> dict:
+    """Instal versi baru (atau pakai dari cache hash), aktifkan, lalu rolling restart dengan rollback."""
+    settings = get_upgrade_settings()
+    batch_size = batch_size or settings['batchSize']
+    health_seconds = settings['healthSeconds'] if health_seconds is None else health_seconds
+    # Binary lama yang belum dikelola diimpor dulu supaya selalu ada versi untuk rollback.
+    if cli_version_link('current') is None and nexus_cli_path and os.access(nexus_cli_path, os.X_OK):
+        switch_cli_version(install_cli_version(nexus_cli_path)[0])
+    source = binary or fetch_cli_release()
+    if not source:
+        return {'ok': False, 'error': "gagal mengunduh Nexus CLI"}
+    digest, reused = install_cli_version(source)
+    if not binary:
+        import shutil
+        shutil.rmtree(os.path.join(cli_versions_dir(), f".download-{os.getpid()}"), ignore_errors=True)
+    previous, older = cli_version_link('current'), cli_version_link('previous')
+    if digest == previous:
+        print(color_log(f"Versi {digest} sudah aktif, tidak ada yang perlu di-restart.\n", 'green'))
+        return {'ok': True, 'version': digest, 'reused': reused, 'restarted': []}
+    switch_cli_version(digest)
+    print(color_log(f"🔄 Versi aktif: {digest} ({'dari cache' if reused else 'baru'}), sebelumnya {previous}\n", 'cyan'))
+    result = {'ok': True, 'version': digest, 'previousVersion': previous, 'reused': reused, 'restarted': []}
+    if restart:
+        targets = upgrade_targets()
+        print(color_log(f"Rolling restart {len(targets)} node, batch {batch_size}, uji sehat {health_seconds:.0f} detik.\n", 'cyan'))
+        result.update(rolling_restart(targets, batch_size, health_seconds, settings['startTimeout']))
+        if not result['ok'] and previous:
+            print(color_log(f"↩️  Rollback ke versi {previous}...\n", 'yellow'))
+            switch_cli_version(previous)
+            if older:
+                set_cli_version_link('previous', older)
+            checks = restart_and_check(result['restarted'], health_seconds, settings['startTimeout'])
+            result['rolledBack'] = previous
+            result['rollback'] = {'ok': all(ok for ok, _ in checks),
+                                  'nodes': [{'nodeId': t['nodeId'], 'ok': ok, 'reason': reason}
+                                            for t, (ok, reason) in zip(result['restarted'], checks)]}
+    prune_cli_versions()
+    return result
+
+def rollback_nexus_cli(batch_size: Optional[int] = None, health_seconds: Optional[float] = None) -> dict:
+    """Kembali ke versi 'previous' dengan rolling restart yang sama."""
+    previous = cli_version_link('previous')
+    if not previous:
+        return {'ok': False, 'error': "tidak ada versi sebelumnya"}
+    return upgrade_nexus_cli(os.path.join(cli_versions_dir(), previous, 'nexus-network'), batch_size, health_seconds)
+
+# --- Benchmark Overhead Tool ---
+# Mengukur biaya tool itu sendiri (bukan prover) dengan binary palsu 'nexus-network' dan
+# 'screen' di direktori sementara. Worker dijalankan di proses terpisah dengan HOME dan PATH
+# sementara agar database dan sesi asli tidak tersentuh. Hasil berupa JSON yang bisa
+# dibandingkan antar rilis dengan --compare.
+BENCH_FAKE_NEXUS = """#!/bin/sh
+if [ "$1" = "--version" ]; then echo "nexus-network 0.0.0-bench"; exit 0; fi
+while true; do echo "Fetching task"; sleep 60; done
+"""
+# Meniru screen: sesi dicatat sebagai file "pid.nama" di $SCREENDIR (PID worker agar dianggap hidup),
+# -ls keluar dengan kode 1 seperti screen asli.
+BENCH_FAKE_SCREEN = """#!/bin/sh
+dir="$BENCH_SCREEN_DIR"
+case "$1" in
+-ls)
+    echo "There are screens on:"
+    for f in "$dir"/*; do [ -e "$f" ] && printf '\\t%s\\t(01/01/2024 00:00:00 AM)\\t(Detached)\\n' "${f##*/}"; done
+    echo "Sockets in /run/screen/S-bench."
+    exit 1 ;;
+-S) : > "$dir/$BENCH_SESSION_PID.$2" ;;
+-X) for f in "$dir"/*."${3#*.}"; do rm -f "$f"; done ;;
+esac
+exit 0
+"""
+BENCH_LAUNCH_COUNTS = (1, 10, 100)
+BENCH_SESSION_COUNT = 1000
+BENCH_STOP_COUNT = 40
+BENCH_CONFIG_NODES = 10000
+
+def bench_timing(function, repeat: int) -> dict:
+    """Statistik waktu (ms) dari `repeat` kali pemanggilan."""
+    import statistics
+    import time
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {'n': repeat, 'min': round(samples[0], 4), 'median': round(statistics.median(samples), 4),
+            'p95': round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 4), 'max': round(samples[-1], 4)}
+
+def create_bench_fixture(root: str) -> dict:
+    """Membuat bin palsu dan direktori sesi; mengembalikan environment untuk worker."""
+    bin_dir = os.path.join(root, 'bin')
+    for directory in (bin_dir, os.path.join(root, 'home'), os.path.join(root, 'screens')):
+        os.makedirs(directory, exist_ok=True)
+    for name, script in (('nexus-network', BENCH_FAKE_NEXUS), ('screen', BENCH_FAKE_SCREEN)):
+        with open(os.path.join(bin_dir, name), 'w') as f:
+            f.write(script)
+        os.chmod(os.path.join(bin_dir, name), 0o755)
+    env = {k: v for k, v in os.environ.items() if k not in ('SUDO_USER', 'SUDO_UID', 'SUDO_GID')}
+    env.update({'HOME': os.path.join(root, 'home'), 'PATH': f"{bin_dir}:/usr/bin:/bin",
+                'BENCH_SCREEN_DIR': os.path.join(root, 'screens'), 'SCREENDIR': os.path.join(root, 'screens')})
+    return env
+
+def run_bench_worker(quick: bool = False) -> dict:
+    """Dijalankan di dalam proses worker (HOME/PATH sementara)."""
+    import contextlib
+    import io
+    repeat = 20 if quick else 200
+    screens = os.environ['BENCH_SCREEN_DIR']
+    os.environ['BENCH_SESSION_PID'] = str(os.getpid())
+    results = {}
+
+    results['find_executable.hit'] = bench_timing(lambda: find_executable('nexus-network', user_home), repeat)
+    results['find_executable.miss'] = bench_timing(lambda: find_executable('nexus-bench-missing', user_home), repeat)
+    results['resolve_executable.cached'] = bench_timing(lambda: resolve_executable('nexus-network', user_home), repeat)
+
+    def launch(count: int):
+        global node_id
+        for index in range(count):
+            node_id = f"bench-node-{index}"
+            # start_node() interaktif: jawab semua prompt dengan Enter (pakai Node ID tersimpan).
+            start_node(background=True, max_threads=2, ask=lambda prompt: '')
+
+    for count in BENCH_LAUNCH_COUNTS[:2] if quick else BENCH_LAUNCH_COUNTS:
+        for name in os.listdir(screens):
+            os.remove(os.path.join(screens, name))
+        with contextlib.redirect_stdout(io.StringIO()):
+            timing = bench_timing(lambda: launch(count), 1)
+        results[f'start_node.launch_{count}'] = {'total': timing['median'], 'perNode': round(timing['median'] / count, 4),
+                                                 'sessions': len(os.listdir(screens))}
+
+    entries = match_sessions(reconcile_sessions(), 'nexus-node-*')[:BENCH_STOP_COUNT]
+    # Nama metrik memakai jumlah sebenarnya (mode quick meluncurkan lebih sedikit sesi) dan
+    # jalur yang benar-benar diukur, agar laporan dengan kunci sama selalu sebanding.
+    results[f'stop_sessions.{len(entries)}'] = bench_timing(lambda: stop_sessions(entries), 1)
+
+    for index in range(BENCH_SESSION_COUNT - len(os.listdir(screens))):
+        open(os.path.join(screens, f"{os.getpid()}.nexus-bench-{index}"), 'w').close()
+    output = run_traced('bench.screen_ls', [screen_path, '-ls'], capture_output=True, text=True).stdout
+    listing = 'socketdir' if screen_socket_sessions() is not None else 'screen_ls'
+    results[f'list_screen_sessions.{listing}_{len(list_screen_sessions())}'] = bench_timing(
+        list_screen_sessions, max(5, repeat // 10))
+    results[f'parse_screen_sessions.{len(parse_screen_sessions(output))}'] = bench_timing(
+        lambda: parse_screen_sessions(output), repeat)
+
+    nodes = [{'nodeId': f"bench-{i:05d}", 'threads': 1 + i % 8, 'tags': ['bench']} for i in range(BENCH_CONFIG_NODES)]
+    results['append_fleet_nodes.10k'] = bench_timing(lambda: append_fleet_nodes(nodes), 1)
+    results['load_configuration.10k'] = bench_timing(lambda: load_configuration(quiet=True), max(3, repeat // 20))
+    results['save_configuration.unchanged'] = bench_timing(save_configuration, max(3, repeat // 20))
+
+    def save_changed():
+        tool_settings['benchCounter'] = tool_settings.get('benchCounter', 0) + 1
+        save_configuration()
+    results['save_configuration.changed'] = bench_timing(save_changed, max(3, repeat // 20))
+    return results
+
+def bench_primary(value: dict) -> Optional[float]:
+    return value.get('median', value.get('total'))
+
+def compare_bench_results(current: dict, baseline: dict, threshold: float) -> dict:
+    """Rasio current/baseline per metrik; ditandai regresi jika rasio > threshold."""
+    comparison = {}
+    for name, value in current.items():
+        before = baseline.get(name)
+        if not before or not bench_primary(before) or bench_primary(value) is None:
+            continue
+        ratio = bench_primary(value) / bench_primary(before)
+        comparison[name] = {'baseline': bench_primary(before), 'current': bench_primary(value),
+                            'ratio': round(ratio, 3), 'regression': ratio > threshold}
+    return comparison
+
+def run_benchmarks(quick: bool = False, baseline_path: Optional[str] = None, threshold: float = 1.2) -> dict:
+    """Menyiapkan fixture, menjalankan worker, dan menyusun laporan JSON."""
+    import platform
+    import shutil
+    import tempfile
+    import time
+    root = tempfile.mkdtemp(prefix='nexus-bench-')
+    try:
+        env = create_bench_fixture(root)
+        command = tool_command('bench', '--worker', '--json') + (['--quick'] if quick else [])
+        worker = run_traced('bench.worker', command, env=env, capture_output=True, text=True)
+        if worker.returncode != 0:
+            return {'ok': False, 'error': f"worker benchmark gagal: {worker.stderr.strip()[-500:]}"}
+        results = json.loads(worker.stdout)['results']
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    import hashlib
+    with open(TOOL_ENTRY, 'rb') as f:
+        script_hash = hashlib.sha256(f.read()).hexdigest()[:16]
+    report = {'ok': True, 'scriptHash': script_hash, 'python': platform.python_version(),
+              'platform': platform.platform(), 'cpuCount': os.cpu_count(), 'createdAt': int(time.time()),
+              'quick': quick, 'results': results}
+    if baseline_path:
+        with open(baseline_path) as f:
+            comparison = compare_bench_results(results, json.load(f).get('results', {}), threshold)
+        report['comparison'] = comparison
+        report['regressions'] = sorted(name for name, c in comparison.items() if c['regression'])
+        report['ok'] = not report['regressions']
+    return report
+
+# --- Dashboard Live (curses) ---
+DASHBOARD_REFRESH = 2.0  # Interval sampling & render (detik)
+DASHBOARD_DISCOVERY_INTERVAL = 10.0  # Interval pemindaian /proc untuk prover yang dijalankan lewat screen
+
+class ProcessSampler:
+    """Sampling inkremental /proc/<pid>/stat: satu kali baca file per proses per refresh."""
+
+    def __init__(self):
+        self.clock_ticks = os.sysconf('SC_CLK_TCK')
+        self.page_kb = os.sysconf('SC_PAGE_SIZE') // 1024
+        self.previous = {}
+
+    def sample(self, pid: int, uptime: float) -> Optional[dict]:
+        import time
+        try:
+            with open(f'/proc/{pid}/stat', 'rb') as f:
+                data = f.read()
+        except OSError:
+            self.previous.pop(pid, None)
+            return None
+        # Nama proses bisa mengandung spasi; field setelah ')' dimulai dari field ke-3 (state).
+        fields = data[data.rindex(b')') + 2:].split()
+        ticks = int(fields[11]) + int(fields[12])
+        now = time.monotonic()
+        previous = self.previous.get(pid)
+        self.previous[pid] = (ticks, now)
+        cpu = 0.0
+        if previous and now > previous[1]:
+            cpu = (ticks - previous[0]) / self.clock_ticks / (now - previous[1]) * 100
+        return {
+            'cpu': cpu,
+            'rssKb': int(fields[21]) * self.page_kb,
+            'threads': int(fields[17]),
+            'uptime': max(0.0, uptime - int(fields[19]) / self.clock_ticks),
+        }
+
+def read_system_uptime() -> float:
+    try:
+        with open('/proc/uptime') as f:
+            return float(f.read().split()[0])
+    except (OSError, ValueError, IndexError):
+        return 0.0
+
+def discover_prover_processes() -> dict:
+    """Mencari proses 'nexus-network start --node-id X' yang berjalan: {node_id: pid}."""
+    found = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/cmdline', 'rb') as f:
+                argv = f.read().split(b'\0')
+        except OSError:
+            continue
+        # argv[1] ikut diperiksa untuk CLI yang dijalankan lewat interpreter (wrapper script).
+        if b'nexus-network' not in {os.path.basename(a) for a in argv[:2]} or b'--node-id' not in argv:
+            continue
+        position = argv.index(b'--node-id') + 1
+        if position < len(argv):
+            found[argv[position].decode(errors='replace')] = int(entry)
+    return found
+
+def format_duration(seconds: float) -> str:
+    minutes, _ = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    days, hours = divmod(hours, 24)
+    return f"{days}d{hours:02d}h" if days else f"{hours:02d}:{minutes:02d}"
+
+class DashboardState:
+    """Data dashboard: gabungan node fleet, node supervisor, dan prover yang ditemukan di /proc."""
+
+    def __init__(self):
+        self.sampler = ProcessSampler()
+        self.discovered = {}
+        self.discovered_at = 0.0
+
+    def rows(self) -> List[dict]:
+        import time
+        supervised = {}
+        if os.path.exists(supervisor_socket_path()):
+            response = supervisor_request({'cmd': 'status'}, timeout=2.0)
+            supervised = {n['nodeId']: n for n in response['nodes']} if response else {}
+        if time.monotonic() - self.discovered_at >= DASHBOARD_DISCOVERY_INTERVAL:
+            self.discovered = discover_prover_processes()
+            self.discovered_at = time.monotonic()
+
+        screen_metrics = {n['nodeId']: n['metrics'] for n in load_screen_node_metrics(supervised)}
+
+        order = [n['nodeId'] for n in fleet_nodes]
+        order += [i for i in list(supervised) + list(self.discovered) if i not in order]
+        uptime = read_system_uptime()
+        rows = []
+        for row_id in order:
+            node = supervised.get(row_id)
+            if node:
+                pid, source, state = node['pid'], 'supervisor', node['state']
+                ppm = node['metrics']['proofsPerMin']
+            else:
+                pid, source = self.discovered.get(row_id), 'screen'
+                ppm = screen_metrics[row_id]['proofsPerMin'] if row_id in screen_metrics else None
+                state = 'running' if pid else 'stopped'
+            sample = self.sampler.sample(pid, uptime) if pid else None
+            if pid and sample is None and not node:
+                self.discovered.pop(row_id, None)
+                pid, state = None, 'stopped'
+            rows.append({'nodeId': row_id, 'source': source if pid or node else '-', 'pid': pid, 'state': state,
+                         'sample': sample, 'proofsPerMin': ppm})
+        return rows
+
+    def start(self, row: dict) -> str:
+        plan = dict(zip([n['nodeId'] for n in fleet_nodes], plan_fleet_threads(fleet_nodes)))
+        threads = plan.get(row['nodeId']) or get_tuned_threads()
+        if os.path.exists(supervisor_socket_path()) and supervisor_request({'cmd': 'ping'}, timeout=2.0):
+            response = supervisor_request({'cmd': 'start', 'nodeId': row['nodeId'], 'threads': threads}) or {}
+            return "dimulai via supervisor" if response.get('ok') else f"gagal: {response.get('error')}"
+        if not screen_path:
+            return "gagal: screen tidak ditemukan dan supervisor tidak berjalan"
+        command, threads = node_launch_command(row['nodeId'], threads)
+        ok = launch_in_screen(tool_screen_name(row['nodeId']), command, row['nodeId'], threads)
+        self.discovered_at = 0.0
+        return "dimulai di screen" if ok else "gagal menjalankan screen"
+
+    def stop(self, row: dict) -> str:
+        import signal
+        if row['source'] == 'supervisor':
+            response = supervisor_request({'cmd': 'stop', 'nodeId': row['nodeId']}) or {}
+            return "dihentikan" if response.get('ok') else f"gagal: {response.get('error')}"
+        entries = [e for e in reconcile_sessions() if e['nodeId'] == row['nodeId']]
+        if entries:
+            stop_sessions(entries)
+        elif row['pid']:
+            try:
+                os.kill(row['pid'], signal.SIGTERM)
+            except OSError as e:
+                return f"gagal: {e}"
+        else:
+            return "node tidak berjalan"
+        self.discovered.pop(row['nodeId'], None)
+        return "dihentikan"
+
+    def restart(self, row: dict) -> str:
+        if row['source'] == 'supervisor':
+            response = supervisor_request({'cmd': 'restart', 'nodeId': row['nodeId']}) or {}
+            return "di-restart" if response.get('ok') else f"gagal: {response.get('error')}"
+        if row['pid']:
+            self.stop(row)
+        return self.start(row)
+
+def dashboard_loop(screen):
+    """Loop utama curses: render di tempat, sampling tiap DASHBOARD_REFRESH detik."""
+    import contextlib
+    import curses
+    import io
+    curses.curs_set(0)
+    curses.use_default_colors()
+    screen.timeout(int(DASHBOARD_REFRESH * 1000))
+    state = DashboardState()
+    selected = 0
+    message = ''
+    rows = state.rows()
+    while True:
+        height, width = screen.getmaxyx()
+        screen.erase()
+        running = sum(1 for r in rows if r['state'] == 'running')
+        header = f" Nexus Dashboard - {running}/{len(rows)} node berjalan - refresh {DASHBOARD_REFRESH:.0f}s"
+        screen.addnstr(0, 0, header.ljust(width), width - 1, curses.A_REVERSE)
+        columns = f" {'NODE ID':<22} {'SUMBER':<10} {'STATUS':<9} {'PID':>7} {'CPU%':>6} {'RSS MB':>8} {'THR':>4} {'UPTIME':>7} {'PROOF/M':>8}"
+        screen.addnstr(1, 0, columns, width - 1, curses.A_BOLD)
+        visible = max(1, height - 4)
+        selected = min(selected, max(0, len(rows) - 1))
+        offset = max(0, selected - visible + 1)
+        for line, row in enumerate(rows[offset:offset + visible]):
+            sample = row['sample'] or {}
+            text = (f" {row['nodeId'][:22]:<22} {row['source']:<10} {row['state']:<9} {row['pid'] or '-':>7} "
+                    f"{sample.get('cpu', 0):>6.1f} {sample.get('rssKb', 0) / 1024:>8.0f} {sample.get('threads', 0):>4} "
+                    f"{format_duration(sample.get('uptime', 0)):>7} "
+                    f"{row['proofsPerMin'] if row['proofsPerMin'] is not None else '-':>8}")
+            attr = curses.A_REVERSE if offset + line == selected else curses.A_NORMAL
+            screen.addnstr(2 + line, 0, text, width - 1, attr)
+        footer = " [↑/↓] pilih  [s] start  [t] stop  [r] restart  [q] keluar  " + message
+        screen.addnstr(height - 1, 0, footer[:width - 1], width - 1, curses.A_DIM)
+        screen.refresh()
+
+        key = screen.getch()
+        if key in (ord('q'), ord('Q'), 27):
+            return
+        if key == curses.KEY_UP:
+            selected = max(0, selected - 1)
+            continue
+        if key == curses.KEY_DOWN:
+            selected = min(len(rows) - 1, selected + 1)
+            continue
+        actions = {ord('s'): state.start, ord('t'): state.stop, ord('r'): state.restart}
+        if key in actions and rows:
+            # Output run_command ditampung agar tidak merusak tampilan curses.
+            with contextlib.redirect_stdout(io.StringIO()):
+                message = f"{rows[selected]['nodeId']}: {actions[key](rows[selected])}"
+        rows = state.rows()
+
+def run_dashboard():
+    """Menampilkan dashboard live semua node."""
+    import curses
+    try:
+        curses.wrapper(dashboard_loop)
+    except curses.error as e:
+        print(color_log(f"❌ Dashboard tidak dapat ditampilkan: {e}\n", 'red'))
+
+def show_system_utilities_menu():
+    """Menampilkan submenu utilitas sistem."""
+    while True:
+        clear_screen()
+        print(color_log("========== MENU UTILITAS SISTEM ==========\n", 'yellow'))
+        print("1. Cek & Update Versi GLIBC")
+        print("2. Mengatasi VPS Killed (Buat Swap)")
+        print("3. Reboot VPS")
+        print("4. Governor Memori (Pencegah OOM)")
+        print("5. Governor Beban CPU (Steal/PSI)")
+        print("6. Ringkasan Trace (Langkah Paling Lambat)")
+        print("7. Kembali ke Menu Utama")
+        
+        choice = get_input("Masukkan pilihan Anda [1-7]: ")
+        
+        if choice == '1': manage_glibc()
+        elif choice == '2': manage_swap()
+        elif choice == '3': reboot_vps()
+        elif choice == '4': show_memory_governor_menu()
+        elif choice == '5': show_load_governor_menu()
+        elif choice == '6': show_trace_summary_menu()
+        elif choice == '7': return
+        else: print(color_log("Pilihan tidak valid. Silakan coba lagi.\n", 'red'))
+        
+        get_input(color_log("\nTekan [Enter] untuk kembali ke menu utilitas...", 'cyan'))
+
+# --- Kontrol Multi-Host ---
+# Tool ini dapat mengendalikan banyak VPS sekaligus: setiap host menjalankan salinan skrip ini
+# dalam mode non-interaktif (--json), dan hasilnya digabung menjadi satu tabel/JSON. Perintah
+# dikirim lewat transport yang dapat diganti: SSH dengan koneksi multipleks (ControlMaster),
+# sehingga handshake hanya terjadi sekali per host, atau subprocess lokal untuk pengujian.
+MULTIHOST_DEFAULTS = {'concurrency': 8, 'timeout': 900, 'controlPersist': 600,
+                      'script': '$HOME/.nexus_tool/nexus_tool.py', 'python': 'python3'}
+REMOTE_SCRIPT_MISSING = 96  # Kode exit perintah remote jika file tool belum disalin ke host
+REMOTE_ACTIONS = {  # Aksi -> subcommand CLI skrip di host tujuan
+    'status': ['status'],
+    'sessions': ['sessions'],
+    'start': ['start'],
+    'stop': ['stop'],
+    'restart': ['restart'],
+    'update': ['upgrade'],
+    'provision': ['provision'],
+}
+
+def get_multihost_settings() -> dict:
+    """Pengaturan kontrol multi-host digabung dengan nilai default."""
+    return {**MULTIHOST_DEFAULTS, **tool_settings.get('multiHost', {})}
+
+class HostTransport:
+    """Cara menjalankan perintah shell di sebuah host. Subclass cukup mengimplementasikan argv()."""
+    sudo = True  # Skrip dipanggil lewat `sudo -n` jika user login di host bukan root
+
+    def __init__(self, host: dict, settings: dict):
+        self.host = host
+        self.settings = settings
+
+    def argv(self, command: str) -> List[str]:
+        raise NotImplementedError
+
+    def env(self) -> Optional[dict]:
+        return None
+
+    def run(self, command: str, data: Optional[bytes] = None, timeout: Optional[float] = None):
+        """Menjalankan `command` (shell) di host; `data` dikirim ke stdin. Mengembalikan CompletedProcess."""
+        return run_traced(f"remote.{self.host['name']}", self.argv(command), input=data or b'',
+                          capture_output=True, timeout=timeout, env=self.env())
+
+    def close(self, timeout: float = 15) -> bool:
+        """Melepas koneksi yang dipakai ulang ke host ini; tanpa koneksi persisten tidak ada yang dilakukan."""
+        return True
+
+class LocalTransport(HostTransport):
+    """Menjalankan perintah di mesin ini. Variabel 'env' host (mis. HOME) memisahkan state tiap host."""
+    sudo = False  # Berjalan dengan hak akses proses ini sendiri, seperti perintah lokal lainnya
+
+    def argv(self, command: str) -> List[str]:
+        return ['bash', '-c', command]
+
+    def env(self) -> Optional[dict]:
+        return {**os.environ, **self.host['env']} if self.host.get('env') else None
+
+class SshTransport(HostTransport):
+    """SSH dengan ControlMaster: koneksi pertama menjadi master yang dipakai ulang perintah berikutnya."""
+
+    def options(self) -> List[str]:
+        control_dir = os.path.join(get_state_dir(), 'ssh')
+        os.makedirs(control_dir, mode=0o700, exist_ok=True)
+        # %C adalah hash host/port/user, menjaga path socket di bawah batas panjang path Unix.
+        options = ['-o', 'ControlMaster=auto', '-o', f"ControlPath={control_dir}/%C",
+                   '-o', f"ControlPersist={int(self.settings['controlPersist'])}",
+                   '-o', 'BatchMode=yes', '-o', 'ConnectTimeout=15']
+        if self.host.get('port'):
+            options += ['-p', str(self.host['port'])]
+        return options
+
+    def argv(self, command: str) -> List[str]:
+        return ['ssh', *self.options(), self.host['address'], command]
+
+    def close(self, timeout: float = 15) -> bool:
+        """Menutup koneksi master host ini (jika ada)."""
+        import subprocess
+        try:
+            result = run_traced(f"remote.{self.host['name']}.close",
+                                ['ssh', *self.options(), '-O', 'exit', self.host['address']],
+                                capture_output=True, timeout=timeout)
+        except (OSError, subprocess.TimeoutExpired):
+            return False
+        return result.returncode == 0
+
+HOST_TRANSPORTS = {'ssh': SshTransport, 'local': LocalTransport}
+
+def configured_hosts() -> List[dict]:
+    return tool_settings.get('hosts', [])
+
+def select_hosts(names: Optional[List[str]] = None, tag: Optional[str] = None) -> List[dict]:
+    """Host terdaftar yang cocok dengan nama (glob) dan/atau tag; tanpa filter berarti semua host."""
+    import fnmatch
+    hosts = configured_hosts()
+    if names:
+        hosts = [h for h in hosts if any(fnmatch.fnmatchcase(h['name'], pattern) for pattern in names)]
+    if tag:
+        hosts = [h for h in hosts if tag in h.get('tags', [])]
+    return hosts
+
+def save_host(host: dict) -> bool:
+    """Menambahkan atau mengganti host (berdasarkan nama) di daftar host. False jika gagal disimpan."""
+    tool_settings['hosts'] = [h for h in configured_hosts() if h['name'] != host['name']] + [host]
+    return save_configuration()
+
+def remove_host(name: str) -> bool:
+    """Menghapus host dan menutup koneksi master-nya; False jika host tidak ada (store_error tetap None)
+    atau gagal disimpan."""
+    hosts = configured_hosts()
+    remaining = [h for h in hosts if h['name'] != name]
+    if len(remaining) == len(hosts):
+        return False
+    for host in hosts:
+        transport_class = HOST_TRANSPORTS.get(host.get('transport', 'ssh'))
+        if host['name'] == name and transport_class is not None:
+            transport_class(host, get_multihost_settings()).close()
+    tool_settings['hosts'] = remaining
+    return save_configuration()
+
+def remote_tool_command(settings: dict, args: List[str], sudo: bool = True) -> str:
+    """Perintah shell untuk memanggil skrip di host tujuan, lewat `sudo -n` jika `sudo` dan user bukan root.
+
+    Jika skrip belum disalin, perintah keluar dengan REMOTE_SCRIPT_MISSING alih-alih
+    pesan error Python yang membingungkan.
+    """
+    import shlex
+    quoted = ' '.join(shlex.quote(a) for a in ['--json', *args])
+    elevate = '$( [ "$(id -u)" = 0 ] || echo sudo -n ) ' if sudo else ''
+    return (f'[ -f "{settings["script"]}" ] || exit {REMOTE_SCRIPT_MISSING}; '
+            f'{elevate}{settings["python"]} "{settings["script"]}" {quoted}')
+
+def sync_tool_script(transport: HostTransport, settings: dict, timeout: float):
+    """Menyalin skrip ini ke host tujuan secara atomik (lewat koneksi yang sama, tanpa scp)."""
+    with open(TOOL_ENTRY, 'rb') as f:
+        data = f.read()
+    script = settings['script']
+    command = (f'mkdir -p "$(dirname "{script}")" && cat > "{script}.tmp" && '
+               f'chmod 755 "{script}.tmp" && mv "{script}.tmp" "{script}"')
+    return transport.run(command, data, timeout)
+
+def parse_remote_result(stdout: bytes) -> Optional[dict]:
+    """Hasil --json adalah baris JSON terakhir di stdout."""
+    for line in reversed(stdout.decode(errors='replace').splitlines()):
+        if line.strip():
+            try:
+                return json.loads(line)
+            except json.JSONDecodeError:
+                return None
+    return None
+
+def run_on_host(host: dict, action: str, extra: List[str], settings: dict, parent: Optional[Span] = None) -> dict:
+    """Menjalankan satu aksi di satu host dan mengembalikan ringkasan hasilnya."""
+    with trace_span(f"remote.{action}", parent, host=host['name']) as span:
+        entry = run_host_action(host, action, extra, settings)
+        span.set(exitCode=entry['exitCode'], ok=entry['ok'])
+    return entry
+
+def run_host_action(host: dict, action: str, extra: List[str], settings: dict) -> dict:
+    import subprocess
+    import time
+    started = time.monotonic()
+    entry = {'host': host['name'], 'ok': False, 'exitCode': None, 'seconds': 0.0, 'result': None, 'error': None}
+    transport_class = HOST_TRANSPORTS.get(host.get('transport', 'ssh'))
+    if transport_class is None:
+        entry['error'] = f"transport tidak dikenal: {host.get('transport')}"
+        return entry
+    transport = transport_class(host, settings)
+    timeout = settings['timeout']
+    try:
+        if action in ('sync', 'provision'):
+            result = sync_tool_script(transport, settings, timeout)
+            if result.returncode != 0 or action == 'sync':
+                entry.update(ok=result.returncode == 0, exitCode=result.returncode,
+                             error=result.stderr.decode(errors='replace').strip()[-500:] or None)
+                return entry
+        result = transport.run(remote_tool_command(settings, REMOTE_ACTIONS[action] + extra, transport.sudo),
+                               timeout=timeout)
+        entry['exitCode'] = result.returncode
+        entry['result'] = parse_remote_result(result.stdout)
+        entry['ok'] = result.returncode == 0 and bool(entry['result'] and entry['result'].get('ok'))
+        if result.returncode == REMOTE_SCRIPT_MISSING:
+            entry['error'] = f"skrip tool belum ada di {settings['script']}; jalankan `remote sync` dulu"
+        elif not entry['ok']:
+            entry['error'] = ((entry['result'] or {}).get('error')
+                              or result.stderr.decode(errors='replace').strip()[-500:]
+                              or f"kode error {result.returncode}")
+    except subprocess.TimeoutExpired:
+        entry['error'] = f"timeout setelah {timeout} detik"
+    except OSError as e:
+        entry['error'] = str(e)
+    finally:
+        entry['seconds'] = round(time.monotonic() - started, 3)
+    return entry
+
+def run_on_hosts(hosts: List[dict], action: str, extra: Optional[List[str]] = None,
+                 concurrency: Optional[int] = None) -> List[dict]:
+    """Menjalankan aksi di banyak host dengan pool konkurensi terbatas; hasil diurutkan sesuai daftar host."""
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    settings = get_multihost_settings()
+    workers = max(1, min(concurrency or settings['concurrency'], len(hosts) or 1))
+    results = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(run_on_host, host, action, extra or [], settings, current_span()): host['name']
+                   for host in hosts}
+        for done, future in enumerate(as_completed(futures), 1):
+            entry = future.result()
+            results[futures[future]] = entry
+            status = color_log('✅', 'green') if entry['ok'] else color_log(f"❌ {summarize_remote_result(action, entry)}", 'red')
+            print(f"[{done}/{len(hosts)}] {entry['host']} ({entry['seconds']:.1f}s) {status}")
+    return [results[host['name']] for host in hosts]
+
+def summarize_remote_result(action: str, entry: dict) -> str:
+    """Ringkasan satu baris hasil aksi untuk tabel."""
+    result = entry['result'] or {}
+    if not entry['ok']:
+        return (str(entry['error'] or '').strip().splitlines() or [''])[-1][:80]
+    if action == 'status':
+        supervised = len(result.get('supervisor', {}).get('nodes', []))
+        return (f"CLI {result.get('cliVersion') or '-'}, {len(result.get('screenSessions', []))} sesi screen, "
+                f"{supervised} node supervisor")
+    if action == 'sessions':
+        return f"{len(result.get('sessions', []))} sesi"
+    if action in ('start', 'restart'):
+        nodes = result.get('nodes') or result.get('sessions') or result.get('started') or []
+        return f"{len(nodes)} node"
+    if action == 'stop':
+        return f"{len(result.get('stopped', []))} dihentikan"
+    if action == 'update':
+        return f"versi {result.get('version') or '-'}, {len(result.get('restarted', []))} node di-restart"
+    return 'selesai'
+
+def print_host_results(action: str, results: List[dict]):
+    """Mencetak hasil multi-host sebagai tabel."""
+    width = max([len('HOST')] + [len(r['host']) for r in results])
+    print(f"\n{'HOST':<{width}}  {'OK':<3}  {'DETIK':>7}  RINGKASAN")
+    for entry in results:
+        mark = color_log('ya ', 'green') if entry['ok'] else color_log('tdk', 'red')
+        print(f"{entry['host']:<{width}}  {mark}  {entry['seconds']:>7.2f}  {summarize_remote_result(action, entry)}")
+    ok = sum(1 for r in results if r['ok'])
+    print(color_log(f"\n{ok}/{len(results)} host berhasil.\n", 'green' if ok == len(results) else 'yellow'))
+
+def add_host_menu():
+    """Menu interaktif menambah host."""
+    name = get_input("Nama host (mis. vps-eu-1): ").strip()
+    address = get_input("Alamat SSH (user@host): ").strip()
+    if not name or not address:
+        print(color_log("Nama dan alamat wajib diisi.\n", 'red'))
+        return
+    port = get_input("Port SSH [22]: ").strip()
+    tags = [t for t in get_input("Tag (pisahkan dengan koma, opsional): ").replace(' ', '').split(',') if t]
+    if port and not port.isdigit():
+        print(color_log("Port tidak valid.\n", 'red'))
+        return
+    save_host({'name': name, 'address': address, 'port': int(port) if port else None,
+               'transport': 'ssh', 'tags': tags})
+    print(color_log(f"✅ Host '{name}' disimpan.\n", 'green'))
+
+def show_multihost_menu():
+    """Menampilkan submenu kontrol multi-host."""
+    while True:
+        clear_screen()
+        print(color_log("========== KONTROL MULTI-HOST ==========\n", 'yellow'))
+        hosts = configured_hosts()
+        if not hosts:
+            print(color_log("Belum ada host terdaftar.", 'yellow'))
+        for host in hosts:
+            tags = f" [{', '.join(host['tags'])}]" if host.get('tags') else ''
+            print(f"- {color_log(host['name'], 'cyan')}: {host.get('address') or host.get('transport')}{tags}")
+        print("\n1. Tambah Host")
+        print("2. Hapus Host")
+        print("3. " + color_log("Jalankan Aksi di Semua Host", 'green'))
+        print("4. Kembali ke Menu Utama")
+
+        choice = get_input("Masukkan pilihan Anda [1-4]: ")
+
+        if choice == '1': add_host_menu()
+        elif choice == '2':
+            name = get_input("Nama host yang dihapus: ").strip()
+            print(color_log("Host dihapus.\n", 'green') if remove_host(name) else color_log("Host tidak ditemukan.\n", 'red'))
+        elif choice == '3':
+            action = get_input(f"Aksi ({'/'.join(['sync', *REMOTE_ACTIONS])}): ").strip()
+            if action != 'sync' and action not in REMOTE_ACTIONS:
+                print(color_log("Aksi tidak valid.\n", 'red'))
+            elif hosts:
+                extra = ['--fleet'] if action in ('start', 'restart') else ['--all'] if action == 'stop' else []
+                print_host_results(action, run_on_hosts(hosts, action, extra))
+        elif choice == '4': return
+        else: print(color_log("Pilihan tidak valid. Silakan coba lagi.\n", 'red'))
+
+        get_input(color_log("\nTekan [Enter] untuk kembali ke menu multi-host...", 'cyan'))
+
+# --- CLI Non-Interaktif ---
+# Semua handler mengembalikan (kode_exit, data). Data dicetak sebagai JSON dengan --json,
+# atau sebagai teks biasa. Output proses (run_command) dialihkan ke stderr saat --json.
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+
+def cli_error(message: str) -> tuple:
+    return EXIT_FAILED, {'ok': False, 'error': message}
+
+def cli_status(args) -> tuple:
+    rustc_path = os.path.join(user_home, '.cargo', 'bin', 'rustc')
+    supervisor = supervisor_request({'cmd': 'status'}, timeout=2.0) if os.path.exists(supervisor_socket_path()) else None
+    data = {
+        'ok': bool(nexus_cli_path),
+        'host': get_host_key(),
+        'dependencies': {
+            'screen': screen_path,
+            'rustc': rustc_path if os.access(rustc_path, os.X_OK) else None,
+            'nexus-network': nexus_cli_path,
+        },
+        'cliVersion': get_cli_version(),
+        'walletAddress': wallet_address,
+        'nodeId': node_id,
+        'fleetNodes': len(fleet_nodes),
+        'tunedThreads': get_tuned_threads(),
+        'screenSessions': list_screen_sessions(),
+        'supervisor': {'running': supervisor is not None, 'nodes': supervisor['nodes'] if supervisor else []},
+        'storeError': store_error,
+    }
+    data['ok'] = data['ok'] and store_error is None
+    return (EXIT_OK if data['ok'] else EXIT_FAILED), data
+
+def cli_sessions(args) -> tuple:
+    entries = match_sessions(reconcile_sessions(), args.match, args.tag)
+    return EXIT_OK, {'ok': True, 'sessions': entries}
+
+def cli_list(args) -> tuple:
+    supervisor = supervisor_request({'cmd': 'status'}, timeout=2.0) if os.path.exists(supervisor_socket_path()) else None
+    running = running_node_sessions()
+    plan = plan_fleet_threads(fleet_nodes)
+    return EXIT_OK, {
+        'ok': True,
+        'fleet': [{'nodeId': n['nodeId'], 'threads': t, 'session': running.get(n['nodeId'])}
+                  for n, t in zip(fleet_nodes, plan)],
+        'screenSessions': list_screen_sessions(),
+        'supervised': supervisor['nodes'] if supervisor else [],
+    }
+
+def cli_targets(args) -> List[dict]:
+    """Menentukan node target beserta jumlah thread dari argumen --node-id/--fleet."""
+    if args.fleet:
+        return [{'nodeId': n['nodeId'], 'threads': t} for n, t in zip(fleet_nodes, plan_fleet_threads(fleet_nodes))]
+    ids = args.node_id or ([node_id] if node_id else [])
+    threads = getattr(args, 'threads', None) or get_tuned_threads()
+    return [{'nodeId': target, 'threads': threads} for target in ids]
+
+def cli_start(args) -> tuple:
+    if not nexus_cli_path:
+        return cli_error("nexus-network tidak ditemukan")
+    targets = cli_targets(args)
+    if not targets:
+        return cli_error("tidak ada Node ID (gunakan --node-id atau --fleet)")
+    placement = [None] * len(targets)
+    if tool_settings.get('cpuPinning'):
+        # Rencana fleet dibagi ke core yang tidak dipakai prover di luar fleet; node satuan hanya
+        # mengambil porsinya dari core yang masih bebas.
+        reserved = held_cpus({t['nodeId'] for t in targets})
+        placement = assign_cpu_sets([t['threads'] or 1 for t in targets], reserved=reserved,
+                                    incremental=not args.fleet)
+    results = []
+    if args.supervisor:
+        if not start_supervisor_daemon():
+            return cli_error("daemon supervisor gagal berjalan")
+        for target, cpus in zip(targets, placement):
+            response = supervisor_request({'cmd': 'start', 'nodeId': target['nodeId'],
+                                           'threads': target['threads'], 'cpus': cpus}) or {}
+            results.append({**target, 'ok': bool(response.get('ok')), 'error': response.get('error')})
+    else:
+        if not screen_path:
+            return cli_error("screen tidak ditemukan")
+        running = running_node_sessions()
+        for target, cpus in zip(targets, placement):
+            if target['nodeId'] in running:
+                results.append({**target, 'ok': True, 'session': running[target['nodeId']], 'skipped': True})
+                continue
+            command = [nexus_cli_path, "start", "--node-id", target['nodeId']]
+            if target['threads']:
+                command.extend(["--max-threads", str(target['threads'])])
+            name = tool_screen_name(target['nodeId'])
+            ok = launch_in_screen(name, pin_command(command, cpus), target['nodeId'], target['threads'])
+            results.append({**target, 'ok': ok, 'session': name})
+    ok = all(r['ok'] for r in results)
+    return (EXIT_OK if ok else EXIT_FAILED), {'ok': ok, 'nodes': results}
+
+def cli_stop(args) -> tuple:
+    results = []
+    if args.supervisor:
+        ids = [t['nodeId'] for t in cli_targets(args)]
+        if args.all:
+            response = supervisor_request({'cmd': 'status'})
+            ids = [n['nodeId'] for n in response['nodes']] if response else []
+        for target in ids:
+            response = supervisor_request({'cmd': 'stop', 'nodeId': target}) or {}
+            results.append({'nodeId': target, 'ok': bool(response.get('ok')), 'error': response.get('error')})
+    else:
+        if not screen_path:
+            return cli_error("screen tidak ditemukan")
+        entries = reconcile_sessions()
+        if args.all:
+            selected = entries
+        elif args.match or args.tag:
+            selected = match_sessions(entries, args.match, args.tag)
+        else:
+            ids = {t['nodeId'] for t in cli_targets(args)}
+            names = {session.split('.', 1)[-1] for session in args.session or []}
+            selected = [e for e in entries if e['nodeId'] in ids or e['session'] in names]
+        results = stop_sessions(selected)
+    ok = all(r['ok'] for r in results)
+    return (EXIT_OK if ok else EXIT_FAILED), {'ok': ok, 'stopped': results}
+
+def cli_restart(args) -> tuple:
+    if args.supervisor:
+        # Node supervisor di-restart di tempat agar riwayat restart dan metrik tetap ada.
+        results = []
+        for target in cli_targets(args):
+            response = supervisor_request({'cmd': 'restart', 'nodeId': target['nodeId'],
+                                           'threads': target['threads']}) or {}
+            results.append({**target, 'ok': bool(response.get('ok')), 'error': response.get('error')})
+        ok = bool(results) and all(r['ok'] for r in results)
+        return (EXIT_OK if ok else EXIT_FAILED), {'ok': ok, 'nodes': results}
+    if args.match or args.tag:
+        if not screen_path:
+            return cli_error("screen tidak ditemukan")
+        results = restart_sessions(match_sessions(reconcile_sessions(), args.match, args.tag))
+        ok = bool(results) and all(r.get('restarted') for r in results)
+        return (EXIT_OK if ok else EXIT_FAILED), {'ok': ok, 'sessions': results}
+    _, stopped = cli_stop(args)
+    code, started = cli_start(args)
+    return code, {'ok': started['ok'] and stopped['ok'], 'started': started.get('nodes', []),
+                  'stopped': stopped.get('stopped', [])}
+
+def cli_register_node(args) -> tuple:
+    global node_id
+    if not nexus_cli_path:
+        return cli_error("nexus-network tidak ditemukan")
+    result = run_traced('nexus.register-node', [nexus_cli_path, 'register-node'], text=True, capture_output=True)
+    new_id = parse_node_id(result.stdout) if result.returncode == 0 else None
+    if not new_id:
+        return EXIT_FAILED, {'ok': False, 'error': "Node ID tidak ditemukan pada output",
+                             'exitCode': result.returncode, 'output': (result.stdout + result.stderr)[-2000:]}
+    node_id = new_id
+    if not save_configuration():
+        return EXIT_FAILED, {'ok': False, 'nodeId': new_id, 'error': f"Node ID gagal disimpan: {store_error}"}
+    if args.add_to_fleet:
+        append_fleet_nodes([{'nodeId': new_id, 'threads': args.threads}])
+    return EXIT_OK, {'ok': True, 'nodeId': new_id}
+
+def cli_register_nodes(args) -> tuple:
+    if not nexus_cli_path:
+        return cli_error("nexus-network tidak ditemukan")
+    results = register_nodes_bulk(args.count, args.workers, args.rate, args.retries, args.backoff, args.threads)
+    registered = [r['nodeId'] for r in results if r['ok']]
+    ok = len(registered) == args.count
+    return (EXIT_OK if ok else EXIT_FAILED), {'ok': ok, 'registered': registered,
+                                              'failed': [r for r in results if not r['ok']]}
+
+def cli_register_wallet(args) -> tuple:
+    import shlex
+    global wallet_address
+    if not nexus_cli_path:
+        return cli_error("nexus-network tidak ditemukan")
+    command = f"{shlex.quote(nexus_cli_path)} register-user --wallet-address {shlex.quote(args.address)}"
+    if not run_command(command):
+        return cli_error("register-user gagal")
+    wallet_address = args.address
+    if not save_configuration():
+        return EXIT_FAILED, {'ok': False, 'walletAddress': wallet_address,
+                             'error': f"alamat wallet gagal disimpan: {store_error}"}
+    return EXIT_OK, {'ok': True, 'walletAddress': wallet_address}
+
+def cli_fleet(args) -> tuple:
+    if args.action == 'add':
+        if any(n['nodeId'] == args.id for n in fleet_nodes):
+            return cli_error(f"node {args.id} sudah ada di fleet")
+        append_fleet_nodes([{'nodeId': args.id, 'threads': args.threads}])
+    elif args.action == 'remove':
+        if not any(n['nodeId'] == args.id for n in fleet_nodes):
+            return cli_error(f"node {args.id} tidak ada di fleet")
+        remove_fleet_nodes([args.id])
+    return cli_list(args)
+
+def cli_provision(args) -> tuple:
+    ok = run_provisioning(dry_run=args.dry_run, stub=args.stub, reset=args.reset)
+    try:
+        with open(provision_state_path()) as f:
+            state = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        state = {}
+    return (EXIT_OK if ok else EXIT_FAILED), {'ok': ok, 'steps': state}
+
+def cli_glibc(args) -> tuple:
+    if args.action == 'build':
+        ok = build_glibc(args.tarball, args.sha256, args.allow_unpinned)
+        return (EXIT_OK if ok else EXIT_FAILED), {'ok': ok, 'prefix': GLIBC_PREFIX}
+    if args.action == 'package':
+        artifact = package_glibc_artifact(args.artifact)
+        return (EXIT_OK, {'ok': True, 'artifact': artifact}) if artifact else cli_error("gagal membuat artefak")
+    if not args.artifact:
+        return cli_error("--artifact wajib untuk install")
+    ok = install_glibc_artifact(args.artifact, args.force)
+    return (EXIT_OK if ok else EXIT_FAILED), {'ok': ok, 'prefix': GLIBC_PREFIX}
+
+def cli_dashboard(args) -> tuple:
+    run_dashboard()
+    return EXIT_OK, {'ok': True}
+
+def cli_logs(args) -> tuple:
+    try:
+        since = parse_time_arg(args.since) if args.since else None
+        until = parse_time_arg(args.until) if args.until else None
+        entries = search_node_logs(args.node_id, since, until, args.grep, args.limit)
+    except (ValueError, re.error) as e:
+        return cli_error(f"argumen tidak valid: {e}")
+    if not args.json:
+        for entry in entries:
+            print(format_log_entry(entry))
+        return EXIT_OK, {'ok': True, 'lines': len(entries)}
+    return EXIT_OK, {'ok': True, 'entries': entries}
+
+def cli_log_sink(args) -> tuple:
+    run_log_sink(args.node_id)
+    return EXIT_OK, {'ok': True}
+
+def cli_upgrade(args) -> tuple:
+    if args.list:
+        return EXIT_OK, {'ok': True, 'versions': list_cli_versions()}
+    if args.rollback:
+        result = rollback_nexus_cli(args.batch, args.health_seconds)
+    else:
+        result = upgrade_nexus_cli(args.binary, args.batch, args.health_seconds, restart=not args.no_restart)
+    return (EXIT_OK if result['ok'] else EXIT_FAILED), result
+
+def cli_events(args) -> tuple:
+    return EXIT_OK, {'ok': True, 'events': node_events(args.node_id, args.kind, args.limit)}
+
+def cli_watchdog(args) -> tuple:
+    settings = get_watchdog_settings()
+    if args.quiet_minutes:
+        settings['quietMinutes'] = args.quiet_minutes
+    run_screen_watchdog(settings)
+    return EXIT_OK, {'ok': True}
+
+def cli_bench(args) -> tuple:
+    if args.worker:
+        return EXIT_OK, {'ok': True, 'results': run_bench_worker(args.quick)}
+    report = run_benchmarks(args.quick, args.compare, args.threshold)
+    if args.output and 'results' in report:
+        write_json_atomic(args.output, report)
+    return (EXIT_OK if report['ok'] else EXIT_FAILED), report
+
+def cli_hosts(args) -> tuple:
+    if args.action == 'add':
+        if not args.name or (args.transport == 'ssh' and not args.address):
+            return cli_error("nama host dan --address wajib untuk transport ssh")
+        env = dict(item.split('=', 1) for item in args.env or [] if '=' in item)
+        if not save_host({'name': args.name, 'address': args.address, 'port': args.port,
+                          'transport': args.transport, 'tags': args.tag or [], 'env': env}):
+            return cli_error(f"host gagal disimpan: {store_error}")
+    elif args.action == 'remove':
+        if not any(h['name'] == args.name for h in configured_hosts()):
+            return cli_error(f"host {args.name} tidak ditemukan")
+        if not remove_host(args.name):
+            return cli_error(f"host gagal disimpan: {store_error}")
+    return EXIT_OK, {'ok': True, 'hosts': configured_hosts()}
+
+def cli_remote(args) -> tuple:
+    hosts = select_hosts(args.host, args.tag)
+    if not hosts:
+        return cli_error("tidak ada host yang cocok (tambahkan dengan 'hosts add')")
+    results = run_on_hosts(hosts, args.action, args.extra, args.concurrency)
+    ok = all(r['ok'] for r in results)
+    if not args.json:
+        print_host_results(args.action, results)
+        return (EXIT_OK if ok else EXIT_FAILED), {'ok': ok}
+    return (EXIT_OK if ok else EXIT_FAILED), {'ok': ok, 'action': args.action, 'hosts': results}
+
+def cli_trace(args) -> tuple:
+    try:
+        since = parse_time_arg(args.since) if args.since else None
+    except ValueError as e:
+        return cli_error(f"argumen tidak valid: {e}")
+    rows = summarize_trace(since, args.name, args.sort, args.limit)
+    if not args.json:
+        print_trace_summary(rows)
+        return EXIT_OK, {'ok': True, 'steps': len(rows)}
+    return EXIT_OK, {'ok': True, 'steps': rows}
+
+def cli_history(args) -> tuple:
+    return EXIT_OK, {'ok': True, 'launches': launch_history(args.node_id, args.session, args.limit)}
+
+def cli_autotune(args) -> tuple:
+    binary = args.binary or nexus_cli_path
+    target = args.node_id or node_id
+    if not binary or not target:
+        return cli_error("binary prover atau Node ID tidak tersedia")
+    candidates = [int(c) for c in args.threads.split(',')] if args.threads else default_thread_candidates()
+    result = autotune_threads(binary, target, candidates, args.duration)
+    return (EXIT_OK, {'ok': True, **result}) if result else cli_error("tidak ada trial yang stabil")
+
+def cli_metrics(args) -> tuple:
+    response = supervisor_request({'cmd': 'metrics'})
+    if response:
+        return EXIT_OK, response
+    # Tanpa supervisor, metrik node screen tetap tersedia dari snapshot log-sink.
+    return EXIT_OK, {'ok': True, 'metrics': {n['nodeId']: n['metrics'] for n in load_screen_node_metrics()}}
+
+def cli_supervisor(args) -> tuple:
+    if args.action == 'run':
+        run_supervisor()
+        return EXIT_OK, {'ok': True}
+    if args.action == 'start':
+        return (EXIT_OK, {'ok': True}) if start_supervisor_daemon() else cli_error("daemon supervisor gagal berjalan")
+    response = supervisor_request({'cmd': 'shutdown'})
+    return (EXIT_OK, {'ok': True}) if response else cli_error("daemon supervisor tidak berjalan")
+
+def print_cli_result(data, indent: int = 0):
+    """Mencetak hasil handler CLI sebagai teks sederhana."""
+    pad = '  ' * indent
+    if isinstance(data, dict):
+        for key, value in data.items():
+            if isinstance(value, (dict, list)) and value:
+                print(f"{pad}{key}:")
+                print_cli_result(value, indent + 1)
+            else:
+                print(f"{pad}{key}: {value}")
+    elif isinstance(data, list):
+        for item in data:
+            if isinstance(item, dict):
+                print(f"{pad}- " + ', '.join(f"{k}={v}" for k, v in item.items() if not isinstance(v, dict)))
+            else:
+                print(f"{pad}- {item}")
+
+class SkippedParser:
+    """Pengganti subparser yang tidak dibangun: add_argument/set_defaults diabaikan."""
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+def build_arg_parser(command: Optional[str] = None):
+    """Membangun parser argparse untuk mode non-interaktif.
+
+    Jika `command` diberikan, hanya subparser perintah itu yang dibangun agar startup tetap
+    cepat; perintah yang tidak dikenal membangun semua subparser untuk --help dan pesan error.
+    """
+    import argparse
+    parser = argparse.ArgumentParser(description="Nexus Node Tool - mode non-interaktif. "
+                                                 "Tanpa subcommand, menu interaktif akan dijalankan.")
+    parser.add_argument('--json', action='store_true', help="cetak hasil sebagai JSON")
+    parser.add_argument('--profile', action='store_true', help="jalankan di bawah cProfile (tanpa subcommand: menu)")
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--json', action='store_true', default=argparse.SUPPRESS, help="cetak hasil sebagai JSON")
+    common.add_argument('--profile', action='store_true', default=argparse.SUPPRESS, help="jalankan di bawah cProfile")
+    sub = parser.add_subparsers(dest='command')
+    add_parser = sub.add_parser
+    built = []
+
+    def add_command_parser(name, **kw):
+        if command is not None and name != command:
+            return SkippedParser()
+        built.append(name)
+        return add_parser(name, parents=[common], **kw)
+    sub.add_parser = add_command_parser
+
+    sub.add_parser('status', help="status dependensi, konfigurasi, dan node").set_defaults(handler=cli_status)
+    sub.add_parser('list', help="daftar node fleet, sesi screen, dan node supervisor").set_defaults(handler=cli_list)
+
+    def add_target_args(p, threads: bool = True):
+        p.add_argument('--node-id', action='append', help="Node ID (boleh diulang); default Node ID tersimpan")
+        p.add_argument('--fleet', action='store_true', help="semua node fleet")
+        p.add_argument('--supervisor', action='store_true', help="lewat daemon supervisor, bukan screen")
+        if threads:
+            p.add_argument('--threads', type=int, help="--max-threads untuk node yang dijalankan")
+
+    def add_match_args(p):
+        p.add_argument('--match', help="glob nama sesi atau Node ID, mis. 'nexus-fleet-*'")
+        p.add_argument('--tag', help="hanya node fleet dengan tag ini")
+
+    p = sub.add_parser('sessions', help="registry sesi screen (dicocokkan dengan PID hidup)")
+    add_match_args(p)
+    p.set_defaults(handler=cli_sessions)
+
+    p = sub.add_parser('start', help="jalankan node di background")
+    add_target_args(p)
+    p.set_defaults(handler=cli_start)
+    p = sub.add_parser('stop', help="hentikan node")
+    add_target_args(p, threads=False)
+    p.add_argument('--session', action='append', help="nama sesi screen (boleh diulang)")
+    p.add_argument('--all', action='store_true', help="hentikan semua sesi/node")
+    add_match_args(p)
+    p.set_defaults(handler=cli_stop)
+    p = sub.add_parser('restart', help="hentikan lalu jalankan ulang node")
+    add_target_args(p)
+    p.add_argument('--session', action='append', help=argparse.SUPPRESS)
+    add_match_args(p)
+    p.set_defaults(handler=cli_restart, all=False)
+
+    p = sub.add_parser('register-node', help="buat Node ID baru")
+    p.add_argument('--add-to-fleet', action='store_true', help="tambahkan Node ID baru ke fleet")
+    p.add_argument('--threads', type=int, help="thread untuk node fleet baru")
+    p.set_defaults(handler=cli_register_node)
+    p = sub.add_parser('register-nodes', help="daftarkan banyak Node ID sekaligus ke fleet")
+    p.add_argument('--count', type=int, required=True)
+    p.add_argument('--workers', type=int, default=4, help="jumlah worker paralel")
+    p.add_argument('--rate', type=float, default=2.0, help="batas registrasi per detik")
+    p.add_argument('--retries', type=int, default=3)
+    p.add_argument('--backoff', type=float, default=2.0, help="jeda awal retry (detik), berlipat dua tiap percobaan")
+    p.add_argument('--threads', type=int, help="thread untuk node fleet baru")
+    p.set_defaults(handler=cli_register_nodes)
+    p = sub.add_parser('register-wallet', help="daftarkan alamat wallet")
+    p.add_argument('address')
+    p.set_defaults(handler=cli_register_wallet)
+
+    p = sub.add_parser('fleet', help="kelola daftar node fleet")
+    p.add_argument('action', choices=['add', 'remove'])
+    p.add_argument('id')
+    p.add_argument('--threads', type=int)
+    p.set_defaults(handler=cli_fleet)
+
+    p = sub.add_parser('provision', help="instalasi awal (paralel, dapat dilanjutkan)")
+    p.add_argument('--dry-run', action='store_true', help="tampilkan rencana tanpa menjalankan")
+    p.add_argument('--stub', help="template pengganti perintah, mis. 'echo {command}'")
+    p.add_argument('--reset', action='store_true', help="abaikan state run sebelumnya")
+    p.set_defaults(handler=cli_provision)
+
+    p = sub.add_parser('glibc', help=f"build/paket/instal GLIBC {GLIBC_VERSION} di {GLIBC_PREFIX}")
+    p.add_argument('action', choices=['build', 'package', 'install'])
+    p.add_argument('--tarball', help="tarball source lokal (tanpa unduh)")
+    p.add_argument('--sha256', help="checksum tarball yang diharapkan")
+    p.add_argument('--allow-unpinned', action='store_true', help="percayai tarball tanpa checksum yang di-pin")
+    p.add_argument('--artifact', help="path artefak untuk package/install")
+    p.add_argument('--force', action='store_true', help="instal meski distro artefak berbeda")
+    p.set_defaults(handler=cli_glibc)
+
+    p = sub.add_parser('upgrade', help="upgrade Nexus CLI berversi dengan rolling restart dan rollback")
+    p.add_argument('--binary', help="binary lokal sebagai versi baru (tanpa unduh)")
+    p.add_argument('--batch', type=int, help="jumlah node yang di-restart per batch")
+    p.add_argument('--health-seconds', type=float, help="lama node harus hidup sebelum dianggap sehat")
+    p.add_argument('--no-restart', action='store_true', help="hanya aktifkan versi, node tidak di-restart")
+    p.add_argument('--rollback', action='store_true', help="kembali ke versi sebelumnya")
+    p.add_argument('--list', action='store_true', help="daftar versi terinstal")
+    p.set_defaults(handler=cli_upgrade)
+
+    sub.add_parser('dashboard', help="dashboard live (curses) semua node").set_defaults(handler=cli_dashboard)
+
+    p = sub.add_parser('logs', help="cari log node tersimpan menurut waktu/regex")
+    p.add_argument('--node-id', action='append', help="Node ID (boleh diulang); default semua node")
+    p.add_argument('--since', help="mis. 30m, 2h, 1d, atau '2024-05-01 13:00'")
+    p.add_argument('--until', help="batas akhir, format sama dengan --since")
+    p.add_argument('--grep', help="regex yang harus cocok dengan baris")
+    p.add_argument('--limit', type=int, default=200, help="jumlah baris terakhir yang ditampilkan (0 = semua)")
+    p.set_defaults(handler=cli_logs)
+    p = sub.add_parser('log-sink')
+    p.add_argument('--node-id', required=True)
+    p.set_defaults(handler=cli_log_sink)
+
+    p = sub.add_parser('hosts', help="kelola daftar host untuk kontrol multi-host")
+    p.add_argument('action', nargs='?', choices=['list', 'add', 'remove'], default='list')
+    p.add_argument('name', nargs='?')
+    p.add_argument('--address', help="tujuan SSH, mis. root@203.0.113.5")
+    p.add_argument('--port', type=int)
+    p.add_argument('--transport', choices=sorted(HOST_TRANSPORTS), default='ssh')
+    p.add_argument('--tag', action='append', help="tag host (boleh diulang)")
+    p.add_argument('--env', action='append', help="KEY=VALUE untuk transport local (boleh diulang)")
+    p.set_defaults(handler=cli_hosts)
+    p = sub.add_parser('remote', help="jalankan aksi di banyak host sekaligus (SSH multipleks); "
+                                      "argumen aksi ditulis setelah '--', mis. 'remote start -- --fleet'")
+    p.add_argument('action', choices=['sync', *REMOTE_ACTIONS])
+    p.add_argument('--host', action='append', help="nama host atau glob (boleh diulang); default semua host")
+    p.add_argument('--tag', help="hanya host dengan tag ini")
+    p.add_argument('--concurrency', type=int, help="jumlah host yang diproses bersamaan")
+    p.set_defaults(handler=cli_remote)
+
+    p = sub.add_parser('trace', help="ringkasan span tracing: langkah paling lambat lintas run")
+    p.add_argument('--since', default='7d', help="mis. 1h, 7d, atau '2024-05-01 13:00'")
+    p.add_argument('--name', help="glob nama span, mis. 'provision.*' atau 'cmd.*'")
+    p.add_argument('--sort', choices=['p95', 'max', 'mean', 'total', 'count'], default='p95')
+    p.add_argument('--limit', type=int, default=20, help="jumlah langkah yang ditampilkan (0 = semua)")
+    p.set_defaults(handler=cli_trace)
+
+    p = sub.add_parser('history', help="riwayat peluncuran node")
+    p.add_argument('--node-id')
+    p.add_argument('--session')
+    p.add_argument('--limit', type=int, default=20)
+    p.set_defaults(handler=cli_history)
+
+    p = sub.add_parser('watchdog', help="watchdog node screen yang macet (berjalan terus)")
+    p.add_argument('--quiet-minutes', type=float, help="batas diam sebelum node di-restart")
+    p.set_defaults(handler=cli_watchdog)
+
+    p = sub.add_parser('bench', help="benchmark overhead tool dengan binary palsu (hasil JSON)")
+    p.add_argument('--quick', action='store_true', help="iterasi lebih sedikit, tanpa peluncuran 100 node")
+    p.add_argument('--output', help="simpan laporan JSON ke file")
+    p.add_argument('--compare', help="laporan JSON rilis sebelumnya sebagai pembanding")
+    p.add_argument('--threshold', type=float, default=1.2, help="rasio median yang dianggap regresi")
+    p.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    p.set_defaults(handler=cli_bench)
+
+    p = sub.add_parser('events', help="tindakan otomatis governor/watchdog beserta alasannya")
+    p.add_argument('--node-id')
+    p.add_argument('--kind', help="jenis event, mis. load atau memory")
+    p.add_argument('--limit', type=int, default=20)
+    p.set_defaults(handler=cli_events)
+
+    p = sub.add_parser('autotune', help="cari --max-threads terbaik untuk host ini")
+    p.add_argument('--binary', help="binary prover pengganti nexus-network (mis. stub)")
+    p.add_argument('--node-id')
+    p.add_argument('--threads', help="kandidat thread, dipisah koma")
+    p.add_argument('--duration', type=float, default=180.0, help="durasi per trial (detik)")
+    p.set_defaults(handler=cli_autotune)
+
+    sub.add_parser('metrics', help="snapshot metrik node (supervisor dan screen)").set_defaults(handler=cli_metrics)
+    p = sub.add_parser('supervisor', help="daemon supervisor")
+    p.add_argument('action', nargs='?', choices=['run', 'start', 'stop'], default='run')
+    p.set_defaults(handler=cli_supervisor)
+    if command is not None and not built:
+        return build_arg_parser()
+    return parser
+
+# Perintah yang mengubah sistem atau node memerlukan sudo seperti menu interaktif.
+CLI_ROOT_COMMANDS = {'start', 'stop', 'restart', 'register-node', 'register-nodes', 'register-wallet', 'autotune',
+                     'supervisor', 'provision', 'glibc', 'upgrade',
+                     'watchdog'}
+
+def cli_needs_root(args) -> bool:
+    """Perintah di CLI_ROOT_COMMANDS memerlukan root, kecuali provisioning --dry-run/--stub yang tidak mengubah sistem."""
+    return args.command in CLI_ROOT_COMMANDS and not (getattr(args, 'stub', None) or getattr(args, 'dry_run', False))
+
+# Perintah yang tetap berjalan meski database state tidak dapat dibuka.
+CLI_STORELESS_COMMANDS = {'status', 'log-sink', 'bench', 'trace'}
+
+def run_cli(argv: List[str]) -> int:
+    """Titik masuk mode non-interaktif. Mengembalikan kode exit."""
+    if not argv:
+        main()
+        return EXIT_OK
+    # Argumen setelah '--' diteruskan apa adanya (mis. 'remote start -- --fleet').
+    extra = argv[argv.index('--') + 1:] if '--' in argv else []
+    argv = argv[:len(argv) - len(extra) - 1] if '--' in argv else argv
+    # Opsi global hanya flag tanpa nilai, jadi argumen posisional pertama adalah subcommand.
+    command = next((a for a in argv if not a.startswith('-')), None)
+    if command is not None and {'-h', '--help'} & set(argv[:argv.index(command)]):
+        command = None
+    parser = build_arg_parser(command)
+    args = parser.parse_args(argv)
+    args.extra = extra
+    if not args.command:
+        if args.profile:
+            run_profiled(main)
+            return EXIT_OK
+        parser.print_help()
+        return EXIT_USAGE
+    if cli_needs_root(args) and os.geteuid() != 0:
+        code, result = cli_error("perintah ini harus dijalankan dengan sudo")
+    else:
+        import contextlib
+
+        def invoke() -> tuple:
+            import sqlite3
+            with trace_span(f"cli.{args.command}") as span:
+                try:
+                    code, result = args.handler(args)
+                except sqlite3.Error as e:
+                    code, result = cli_error(f"state tool gagal dibaca/ditulis: {e}")
+                span.set(exitCode=code)
+            return code, result
+
+        with contextlib.redirect_stdout(sys.stderr) if args.json else contextlib.nullcontext():
+            init_paths()
+            if not load_configuration(quiet=True) and args.command not in CLI_STORELESS_COMMANDS:
+                # Tanpa state, perintah lain akan melaporkan fleet/riwayat kosong seolah berhasil.
+                code, result = cli_error(f"state tool tidak dapat dibaca: {store_error}")
+            else:
+                code, result = run_profiled(invoke) if args.profile else invoke()
+    if args.json:
+        print(json.dumps(result))
+    else:
+        print_cli_result(result)
+    return code
+
+# --- Main Program Logic ---
+def main():
+    """Logika utama program."""
+    global user_home, config_file, screen_path, nexus_cli_path, taskset_path
+    
+    if os.geteuid() != 0:
+        print(color_log("Error: Skrip ini harus dijalankan dengan sudo.", 'red'))
+        print(f"Silakan coba lagi dengan: {color_log('sudo python3 ' + os.path.basename(TOOL_ENTRY), 'yellow')}")
+        sys.exit(1)
+    
+    init_paths()
 
     print(color_log("============================================\n", 'blue'))
     print(color_log("   Selamat Datang di Nexus Node Tool v2.4   \n", 'blue'))
@@ -505,17 +5614,18 @@ def main():
     print("2. " + color_log("[MENU UTAMA]", 'green') + " (Langsung ke manajemen node)")
     choice = get_input("Masukkan pilihan Anda (1/2): ")
     if choice.strip() == '1':
-        initial_setup()
+        with trace_span('menu.setup'):
+            initial_setup()
 
     load_configuration()
     
     while True:
         # Perbarui path nexus_cli_path setiap kali masuk loop utama
         # Ini penting jika CLI baru diinstal atau diperbarui
-        nexus_cli_path = find_executable('nexus-network', user_home)
+        nexus_cli_path = resolve_nexus_cli()
         
         get_input(color_log("\nTekan [Enter] untuk menampilkan menu...", 'cyan'))
-        os.system('clear')
+        clear_screen()
         
         print(color_log("================= MENU MANAJEMEN NEXUS =================\n", 'blue'))
         print(color_log("Konfigurasi Tersimpan:\n", 'cyan'))
@@ -523,6 +5633,8 @@ def main():
         print(f"- Wallet Address : {color_log(str(display_wallet), 'yellow')}")
         display_node_id = node_id or color_log('[Belum diatur]', 'red')
         print(f"- Node ID        : {color_log(str(display_node_id), 'yellow')}")
+        if fleet_nodes:
+            print(f"- Node Fleet     : {color_log(str(len(fleet_nodes)), 'yellow')}")
         print(color_log("========================================================\n", 'blue'))
         
         print("\nPilih tindakan:")
@@ -534,22 +5646,40 @@ def main():
         print("6. " + color_log("Run Node (background)", 'cyan'))
         # Menambahkan opsi baru untuk jumlah thread yang dapat disesuaikan
         print("6b. " + color_log("Run Node with Custom Threads (On Screen)", 'yellow'))
+        print("6c. " + color_log("Mode Fleet (Multi-Node)", 'cyan'))
+        print("6d. Autotune Jumlah Thread (--max-threads)")
+        print("6e. " + color_log("Supervisor Node (tanpa screen, auto-restart)", 'green'))
+        print("6f. " + color_log("Dashboard Live Semua Node", 'cyan'))
+        print("6g. Kontrol Multi-Host (SSH)")
         print("7. Lihat Sesi Screen (Logs)")
+        print("7b. Cari Log Node Tersimpan")
         print("8. " + color_log("Hentikan Sesi Screen", 'red'))
         print("9. " + color_log("Utilitas Sistem", 'yellow'))
         print("10. Keluar dari skrip")
         
         choice = get_input("Masukkan pilihan Anda [1-10]: ")
         
-        if choice == '1': check_status()
+        # Span dipasang di sekitar operasinya sendiri (setelah prompt), bukan di sekitar
+        # submenu, agar waktu berpikir pengguna tidak tercatat sebagai durasi.
+        if choice == '1':
+            with trace_span('menu.status'):
+                check_status()
         elif choice == '2': update_nexus_cli()
         elif choice == '3': register_wallet()
-        elif choice == '4': create_node_id()
+        elif choice == '4':
+            with trace_span('menu.create_node'):
+                create_node_id()
         elif choice == '5': start_node()
         elif choice == '6': start_node(background=True)
         # Menambahkan case untuk opsi baru
         elif choice == '6b': start_node_with_custom_threads()
+        elif choice == '6c': show_fleet_menu()
+        elif choice == '6d': run_autotune()
+        elif choice == '6e': show_supervisor_menu()
+        elif choice == '6f': run_dashboard()
+        elif choice == '6g': show_multihost_menu()
         elif choice == '7': view_screen_logs()
+        elif choice == '7b': search_node_logs_menu()
         elif choice == '8': stop_screen()
         elif choice == '9': show_system_utilities_menu()
         elif choice == '10': 
@@ -558,4 +5688,4 @@ def main():
         else: print(color_log("Pilihan tidak valid. Silakan coba lagi.\n", 'red'))
 
 if __name__ == "__main__":
-    main()
+    sys.exit(run_cli(sys.argv[1:]))
@@ -0,0 +1,42 @@
+"""Fixture bersama: skrip tool di-import sebagai modul dengan HOME sementara."""
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TOOL = os.path.join(ROOT, 'nexusAIOnew.py')
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture
+def tool(tmp_path, monkeypatch):
+    """Modul nexusAIOnew dengan state (SQLite, log, cache) terisolasi di tmp_path."""
+    import nexusAIOnew
+    monkeypatch.setenv('HOME', str(tmp_path))
+    monkeypatch.delenv('SUDO_USER', raising=False)
+    monkeypatch.setattr(nexusAIOnew, 'user_home', str(tmp_path))
+    monkeypatch.setattr(nexusAIOnew, 'config_file', str(tmp_path / '.nexus_tool_config.json'))
+    monkeypatch.setattr(nexusAIOnew, 'store_connection', None)
+    monkeypatch.setattr(nexusAIOnew, 'tool_settings', {})
+    monkeypatch.setattr(nexusAIOnew, 'fleet_nodes', [])
+    monkeypatch.setattr(nexusAIOnew, 'trace_fd', None)
+    yield nexusAIOnew
+    if nexusAIOnew.trace_fd not in (None, -1):
+        os.close(nexusAIOnew.trace_fd)
+    if nexusAIOnew.store_connection is not None:
+        nexusAIOnew.store_connection.close()
+
+
+@pytest.fixture
+def run_tool(tmp_path):
+    """Menjalankan tool dengan --json di HOME sementara; mengembalikan (kode exit, hasil JSON)."""
+    def run(*args, timeout=120, home=None):
+        result = subprocess.run([sys.executable, TOOL, '--json', *args],
+                                env={**os.environ, 'HOME': str(home or tmp_path)},
+                                capture_output=True, text=True, timeout=timeout)
+        assert result.stdout.strip(), result.stderr
+        return result.returncode, json.loads(result.stdout.strip().splitlines()[-1])
+    return run
@@ -0,0 +1,43 @@
+import os
+import time
+
+# nexus-network palsu: `start --node-id ID --max-threads N` mencetak N proof setiap 0,1 detik.
+STUB = """#!/bin/sh
+while :; do
+    i=0
+    while [ $i -lt $5 ]; do echo "Proof submitted"; i=$((i + 1)); done
+    sleep 0.1
+done
+"""
+
+
+def write_stub(path, body):
+    path.write_text(body)
+    path.chmod(0o755)
+    return str(path)
+
+
+def test_autotune_picks_fastest_candidate_with_stub(tool, tmp_path):
+    stub = write_stub(tmp_path / 'nexus-network', STUB)
+    result = tool.autotune_threads(stub, '123', [1, 4], duration=1.0)
+    assert result['threads'] == 4
+    assert [t['threads'] for t in result['trials']] == [1, 4]
+    assert all(t['proofs'] > 0 and not t['exitedEarly'] for t in result['trials'])
+    assert result['trials'][1]['proofsPerMin'] > result['trials'][0]['proofsPerMin']
+    assert tool.get_tuned_threads() == 4
+
+
+def test_trial_kills_prover_that_ignores_sigterm(tool, tmp_path, monkeypatch):
+    monkeypatch.setattr(tool, 'TUNING_STOP_TIMEOUT', 0.5)
+    stub = write_stub(tmp_path / 'stubborn', "#!/bin/sh\ntrap '' TERM\nwhile :; do sleep 0.1; done\n")
+    started = time.monotonic()
+    trial = tool.run_tuning_trial(stub, '123', 1, 0.5)
+    assert time.monotonic() - started < 5
+    assert not trial['exitedEarly'] and trial['proofs'] == 0
+
+
+def test_trial_reports_prover_that_exits_early(tool, tmp_path):
+    stub = write_stub(tmp_path / 'crash', "#!/bin/sh\necho 'Proof submitted'\nexit 1\n")
+    trial = tool.run_tuning_trial(stub, '123', 1, 5.0)
+    assert trial['exitedEarly'] and trial['proofs'] == 1 and trial['seconds'] < 5
+    assert os.path.exists(stub)
@@ -0,0 +1,23 @@
+def test_bench_quick_json(run_tool):
+    code, result = run_tool('bench', '--quick', timeout=600)
+    assert code == 0 and result['ok'] and result['quick']
+    results = result['results']
+    assert {'find_executable.hit', 'start_node.launch_1', 'start_node.launch_10'} <= set(results)
+    assert results['start_node.launch_10']['sessions'] == 10
+    assert 'stop_sessions.10' in results
+    assert any(name.startswith('list_screen_sessions.') for name in results)
+
+
+def test_compare_flags_only_metrics_above_threshold(tool):
+    baseline = {'a': {'median': 10.0}, 'b': {'total': 2.0}, 'gone': {'median': 1.0}, 'zero': {'median': 0}}
+    current = {'a': {'median': 11.0}, 'b': {'total': 3.0}, 'new': {'median': 5.0}, 'zero': {'median': 1.0}}
+    comparison = tool.compare_bench_results(current, baseline, 1.2)
+    assert set(comparison) == {'a', 'b'}
+    assert comparison['a'] == {'baseline': 10.0, 'current': 11.0, 'ratio': 1.1, 'regression': False}
+    assert comparison['b']['ratio'] == 1.5 and comparison['b']['regression']
+
+
+def test_bench_timing_statistics(tool):
+    timing = tool.bench_timing(lambda: None, 20)
+    assert timing['n'] == 20
+    assert timing['min'] <= timing['median'] <= timing['p95'] <= timing['max']
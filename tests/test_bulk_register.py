@@ -0,0 +1,52 @@
+import sys
+import time
+
+# register-node palsu: setiap panggilan ke-3 gagal (mis. rate limit dari API), lainnya mendapat ID unik.
+FAKE_CLI = """#!{python}
+import fcntl, sys
+with open({counter!r}, 'a+') as f:
+    fcntl.flock(f, fcntl.LOCK_EX)
+    f.seek(0)
+    calls = len(f.read())
+    f.write('x')
+if sys.argv[1] != 'register-node' or calls % 3 == 1 or {always_fail}:
+    print('429 Too Many Requests', file=sys.stderr)
+    sys.exit(1)
+print(f'Node registered successfully with ID: {{7000 + calls}}')
+"""
+
+
+def fake_cli(tool, tmp_path, monkeypatch, always_fail=False):
+    path = tmp_path / 'nexus-network'
+    path.write_text(FAKE_CLI.format(python=sys.executable, counter=str(tmp_path / 'calls'), always_fail=always_fail))
+    path.chmod(0o755)
+    monkeypatch.setattr(tool, 'nexus_cli_path', str(path))
+    return tmp_path / 'calls'
+
+
+def test_bulk_registration_retries_and_saves_every_id(tool, tmp_path, monkeypatch):
+    calls = fake_cli(tool, tmp_path, monkeypatch)
+    results = tool.register_nodes_bulk(6, workers=3, rate=100, retries=2, backoff=0.01, threads=2)
+    assert all(r['ok'] for r in results)
+    ids = {r['nodeId'] for r in results}
+    assert len(ids) == 6
+    assert any(r['attempts'] > 1 for r in results)
+    assert len(calls.read_text()) == sum(r['attempts'] for r in results)
+    assert {n['nodeId']: n['threads'] for n in tool.store_load_nodes()} == {i: 2 for i in ids}
+
+
+def test_bulk_registration_gives_up_after_retries(tool, tmp_path, monkeypatch):
+    fake_cli(tool, tmp_path, monkeypatch, always_fail=True)
+    results = tool.register_nodes_bulk(2, workers=2, rate=100, retries=2, backoff=0.01)
+    assert [(r['ok'], r['attempts']) for r in results] == [(False, 3), (False, 3)]
+    assert '429' in results[0]['error']
+    assert tool.store_load_nodes() == []
+
+
+def test_rate_limiter_spaces_calls_across_threads(tool):
+    from concurrent.futures import ThreadPoolExecutor
+    limiter = tool.RateLimiter(20)
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(lambda _: limiter.wait(), range(6)))
+    assert time.monotonic() - started >= 0.24
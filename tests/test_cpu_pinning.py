@@ -0,0 +1,26 @@
+def topology(cores=8, numa_nodes=2, smt=2):
+    """Topologi sintetis: core c punya CPU logis c dan c + cores (SMT sibling)."""
+    return [{'numa': c * numa_nodes // cores, 'cpus': [c + s * cores for s in range(smt)]} for c in range(cores)]
+
+
+def test_fleet_plan_is_disjoint_and_numa_local(tool):
+    assignment = tool.assign_cpu_sets([8, 8], topology())
+    assert all(assignment)
+    assert not set(assignment[0]) & set(assignment[1])
+    assert sorted(cpu for cpus in assignment for cpu in cpus) == list(range(16))
+    assert set(assignment[0]) == {0, 1, 2, 3, 8, 9, 10, 11}
+
+
+def test_fleet_plan_skips_reserved_cores(tool):
+    reserved = {0, 8, 1, 9}
+    assignment = tool.assign_cpu_sets([4, 4], topology(), reserved)
+    assert all(assignment)
+    used = [cpu for cpus in assignment for cpu in cpus]
+    assert not reserved & set(used)
+    assert len(used) == len(set(used)) == 12
+
+
+def test_incremental_takes_only_its_share_of_free_cores(tool):
+    assignment = tool.assign_cpu_sets([4], topology(), {0, 8}, incremental=True)
+    assert assignment == [[1, 2, 9, 10]]
+    assert tool.assign_cpu_sets([2], topology(cores=2, numa_nodes=1), {0, 1, 2, 3}, incremental=True) == [None]
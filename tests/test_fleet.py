@@ -0,0 +1,14 @@
+def test_auto_nodes_share_the_remaining_cores(tool):
+    nodes = [{'nodeId': 'a', 'threads': 4}, {'nodeId': 'b'}, {'nodeId': 'c', 'threads': None}]
+    assert tool.plan_fleet_threads(nodes, total_cores=11) == [4, 4, 3]
+
+
+def test_oversubscribed_plan_is_scaled_down(tool):
+    nodes = [{'nodeId': 'a', 'threads': 8}, {'nodeId': 'b', 'threads': 8}, {'nodeId': 'c'}]
+    plan = tool.plan_fleet_threads(nodes, total_cores=8)
+    assert plan == [3, 3, 1] and sum(plan) <= 8
+
+
+def test_every_node_gets_at_least_one_thread(tool):
+    assert tool.plan_fleet_threads([{'nodeId': str(i)} for i in range(6)], total_cores=4) == [1] * 6
+    assert tool.plan_fleet_threads([], total_cores=4) == []
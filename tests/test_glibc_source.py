@@ -0,0 +1,49 @@
+import hashlib
+import io
+import os
+import tarfile
+
+import pytest
+
+
+@pytest.fixture
+def tarball(tool, tmp_path):
+    """Tarball source GLIBC palsu berisi glibc-<versi>/configure."""
+    path = tmp_path / f'glibc-{tool.GLIBC_VERSION}.tar.gz'
+    with tarfile.open(path, 'w:gz') as archive:
+        data = b'#!/bin/sh\necho configure\n'
+        info = tarfile.TarInfo(f'glibc-{tool.GLIBC_VERSION}/configure')
+        info.size = len(data)
+        archive.addfile(info, io.BytesIO(data))
+    return str(path)
+
+
+def digest(path):
+    return hashlib.sha256(open(path, 'rb').read()).hexdigest()
+
+
+def test_matching_checksum_extracts_and_pins(tool, tarball):
+    source_dir = tool.fetch_glibc_source(tarball, digest(tarball).upper())
+    assert os.path.exists(os.path.join(source_dir, 'configure'))
+    assert tool.load_glibc_manifest() == {'sha256': digest(tarball), 'extracted': True}
+    assert tool.glibc_pinned_sha256() == digest(tarball)
+
+
+def test_mismatched_checksum_is_refused_before_extraction(tool, tarball):
+    assert tool.fetch_glibc_source(tarball, '0' * 64) is None
+    assert not os.path.exists(os.path.join(tool.glibc_cache_dir(), f'glibc-{tool.GLIBC_VERSION}'))
+    assert tool.load_glibc_manifest() == {}
+
+
+def test_pin_from_settings_is_enforced(tool, tarball, monkeypatch):
+    monkeypatch.setitem(tool.tool_settings, 'glibcSha256', 'f' * 64)
+    assert tool.fetch_glibc_source(tarball, allow_unpinned=True) is None
+    monkeypatch.setitem(tool.tool_settings, 'glibcSha256', digest(tarball))
+    assert tool.fetch_glibc_source(tarball) is not None
+
+
+def test_unpinned_archive_needs_allow_unpinned(tool, tarball):
+    assert tool.fetch_glibc_source(tarball) is None
+    assert tool.load_glibc_manifest() == {}
+    assert tool.fetch_glibc_source(tarball, allow_unpinned=True) is not None
+    assert tool.glibc_pinned_sha256() == digest(tarball)
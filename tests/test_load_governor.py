@@ -0,0 +1,53 @@
+import pytest
+
+CALM = {'steal': 1.0, 'iowait': 0.0, 'idle': 50.0, 'pressure': 2.0}
+STOLEN = {'steal': 15.0, 'iowait': 0.0, 'idle': 5.0, 'pressure': 2.0}
+PRESSURED = {'steal': 1.0, 'iowait': 0.0, 'idle': 5.0, 'pressure': 40.0}
+BUSY = {'steal': 5.0, 'iowait': 0.0, 'idle': 10.0, 'pressure': 10.0}  # di antara kedua ambang
+
+
+@pytest.fixture
+def governor(tool):
+    return tool.LoadGovernor(tool.get_load_governor_settings())
+
+
+def feed(governor, samples, start=0.0, interval=30.0):
+    return [governor.decide(sample, start + i * interval)[0] for i, sample in enumerate(samples)]
+
+
+def test_steal_must_hold_before_scaling_down(governor):
+    assert feed(governor, [STOLEN, STOLEN, BUSY, STOLEN, STOLEN, STOLEN]) == [None] * 5 + ['down']
+
+
+def test_cpu_pressure_alone_scales_down(governor):
+    assert feed(governor, [PRESSURED] * 3) == [None, None, 'down']
+    assert 'PSI cpu 40.0%' in governor.classify(PRESSURED)[1]
+
+
+def test_cooldown_blocks_next_adjustment(governor):
+    assert feed(governor, [STOLEN] * 3) == [None, None, 'down']
+    assert feed(governor, [CALM] * 6, start=90.0) == [None] * 6
+    direction, reason = governor.decide(CALM, 60.0 + 300)
+    assert direction == 'up' and 'selama 3 sampel' in reason
+
+
+def test_missing_psi_still_allows_scaling_up(governor):
+    assert feed(governor, [{**CALM, 'pressure': None}] * 3) == [None, None, 'up']
+    assert governor.classify({**CALM, 'idle': 10.0}) == (None, '')
+
+
+def test_samples_from_proc_files(tool, tmp_path):
+    shares = tool.cpu_time_shares([100, 0, 100, 700, 0, 0, 0, 100], [200, 0, 200, 1300, 100, 0, 0, 200])
+    assert shares == {'steal': 10.0, 'iowait': 10.0, 'idle': 60.0}
+    psi = tmp_path / 'cpu'
+    psi.write_text('some avg10=31.50 avg60=12.00 avg300=3.00 total=123\n'
+                   'full avg10=0.00 avg60=0.00 avg300=0.00 total=0\n')
+    assert tool.read_cpu_pressure(str(psi)) == 31.5
+    assert tool.read_cpu_pressure(str(tmp_path / 'missing')) is None
+
+
+def test_adjusted_threads_stays_in_bounds(tool):
+    assert tool.adjusted_threads(8, 8, 'down', 0.25) == 6
+    assert tool.adjusted_threads(1, 8, 'down', 0.25) == 1
+    assert tool.adjusted_threads(2, 8, 'up', 0.25) == 3
+    assert tool.adjusted_threads(7, 8, 'up', 0.25) == 8
@@ -0,0 +1,37 @@
+GB_KB = 1024 * 1024
+
+
+def test_swap_covers_peak_shortfall_with_margin(tool):
+    meminfo = {'MemTotal': 4 * GB_KB, 'SwapTotal': 0}
+    assert tool.recommend_swap_size([2 * GB_KB, 2 * GB_KB], meminfo) == 2
+    assert tool.recommend_swap_size([GB_KB], meminfo) == 0
+    assert tool.recommend_swap_size([2 * GB_KB, 2 * GB_KB], {**meminfo, 'SwapTotal': 2 * GB_KB}) == 0
+    assert tool.recommend_swap_size([3 * GB_KB], {'MemTotal': 3 * GB_KB, 'SwapTotal': 0}) == 2
+
+
+def test_memory_high_splits_budget_by_measured_peaks(tool):
+    total_kb = 10 * GB_KB
+    peaks = {'a': 3 * GB_KB, 'b': GB_KB}
+    assert tool.memory_high_limit('a', peaks, total_kb, 20) == 6 * 1024 ** 3
+    assert tool.memory_high_limit('b', peaks, total_kb, 20) == 2 * 1024 ** 3
+    assert tool.memory_high_limit('a', {'a': 0, 'b': 0}, total_kb, 20) == 4 * 1024 ** 3
+
+
+def test_apply_memory_high_never_lowers_an_existing_limit(tool, tmp_path, monkeypatch):
+    base = tmp_path / 'nexus.service'
+    group = base / 'node-n1'
+    group.mkdir(parents=True)
+    (base / 'cgroup.procs').write_text('100\n')
+    (base / 'cgroup.subtree_control').write_text('')
+    (group / 'memory.high').write_text('max\n')
+    monkeypatch.setattr(tool, 'delegated_cgroup', lambda: str(base))
+
+    assert tool.apply_memory_high('n1', 4242, 2 * 1024 ** 3) == 2 * 1024 ** 3
+    assert (base / tool.GOVERNOR_CGROUP_LEAF / 'cgroup.procs').read_text() == '100'
+    assert (base / 'cgroup.subtree_control').read_text() == '+memory'
+    assert (group / 'cgroup.procs').read_text() == '4242'
+    assert tool.apply_memory_high('n1', 4242, 1024 ** 3) == 2 * 1024 ** 3
+    assert (group / 'memory.high').read_text() == str(2 * 1024 ** 3)
+
+    monkeypatch.setattr(tool, 'delegated_cgroup', lambda: None)
+    assert tool.apply_memory_high('n1', 4242, 1024 ** 3) is None
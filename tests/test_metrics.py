@@ -0,0 +1,65 @@
+import io
+import os
+import signal
+import threading
+import time
+import types
+
+
+def test_node_metrics_counts_proofs_latency_and_rate(tool):
+    metrics = tool.NodeMetrics()
+    start = 1_700_000_000.0
+    metrics.feed("Fetched task 1", start)
+    metrics.feed("Proof submitted for task 1", start + 20)
+    metrics.feed("Got new task 2", start + 30)
+    metrics.feed("Proof failed: rejected", start + 40)
+    metrics.feed("noise", start + 41)
+    snapshot = metrics.snapshot()
+    assert (snapshot['lines'], snapshot['proofsOk'], snapshot['proofsFailed'], snapshot['tasksFetched']) == (5, 1, 1, 2)
+    assert snapshot['latency']['count'] == 2 and snapshot['latency']['sum'] == 30.0
+    assert snapshot['latency']['buckets']['10.0'] == 1 and snapshot['latency']['buckets']['30.0'] == 1
+    assert metrics.proofs_per_minute(start + 60) == round(1 / tool.RATE_WINDOW_MINUTES, 3)
+    assert metrics.proofs_per_minute(start + 3600) == 0
+
+
+def test_render_prometheus_escapes_label_values(tool):
+    node = {'nodeId': 'a"b\\c\nd', 'state': 'running', 'metrics': tool.NodeMetrics().snapshot()}
+    text = tool.render_prometheus([node])
+    assert 'nexus_node_up{node_id="a\\"b\\\\c\\nd"} 1' in text
+    assert 'nexus_node_restarts_total{' not in text
+    assert all(line.startswith(('#', 'nexus_')) for line in text.splitlines())
+
+
+def test_log_sink_publishes_metrics_for_screen_nodes(tool, monkeypatch):
+    monkeypatch.setattr(tool, 'METRICS_SNAPSHOT_SECONDS', 0.1)
+    handlers = {signum: signal.getsignal(signum) for signum in (signal.SIGHUP, signal.SIGTERM)}
+    read_fd, write_fd = os.pipe()
+    monkeypatch.setattr(tool.sys, 'stdin', types.SimpleNamespace(buffer=io.FileIO(read_fd, 'rb')))
+    monkeypatch.setattr(tool.sys, 'stdout', types.SimpleNamespace(buffer=io.BytesIO()))
+    seen = []
+
+    def producer():
+        # Sink berjalan di thread utama (handler sinyal), jadi output dan pengecekan di thread ini.
+        try:
+            os.write(write_fd, b"Fetched task 1\nProof submitted\nProof submitted\n")
+            deadline = time.monotonic() + 5
+            while time.monotonic() < deadline:
+                nodes = tool.load_screen_node_metrics()
+                if nodes and nodes[0]['metrics']['proofsOk'] == 2:
+                    seen.extend(nodes)
+                    break
+                time.sleep(0.05)
+        finally:
+            os.close(write_fd)
+
+    thread = threading.Thread(target=producer)
+    thread.start()
+    try:
+        tool.run_log_sink('n1')
+    finally:
+        thread.join()
+        for signum, handler in handlers.items():
+            signal.signal(signum, handler)
+    assert [n['nodeId'] for n in seen] == ['n1'] and seen[0]['state'] == 'running'
+    assert tool.load_screen_node_metrics() == []
+    assert [line for _, line in tool.read_node_log_blocks('n1')][-1] == "Proof submitted"
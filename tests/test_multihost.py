@@ -0,0 +1,66 @@
+import shlex
+
+STUB = 'echo {command}'
+
+
+def add_local_host(run_tool, home, name, tag='lab'):
+    host_home = home / 'hosts' / name
+    host_home.mkdir(parents=True)
+    code, result = run_tool('hosts', 'add', name, '--transport', 'local', '--env', f'HOME={host_home}',
+                            '--tag', tag)
+    assert code == 0 and result['ok']
+    return host_home
+
+
+def test_hosts_add_list_remove(run_tool, tmp_path):
+    add_local_host(run_tool, tmp_path, 'h1')
+    add_local_host(run_tool, tmp_path, 'h2', tag='eu')
+    code, result = run_tool('hosts', 'list')
+    assert code == 0 and [h['name'] for h in result['hosts']] == ['h1', 'h2']
+
+    code, result = run_tool('hosts', 'remove', 'h1')
+    assert code == 0 and [h['name'] for h in result['hosts']] == ['h2']
+    code, result = run_tool('hosts', 'remove', 'h1')
+    assert code != 0 and not result['ok']
+
+
+def test_remote_on_local_hosts(run_tool, tmp_path):
+    for name in ('h1', 'h2'):
+        add_local_host(run_tool, tmp_path, name)
+
+    code, result = run_tool('remote', 'status')
+    assert code != 0
+    assert all(not h['ok'] and 'remote sync' in h['error'] for h in result['hosts'])
+
+    code, result = run_tool('remote', 'sync', '--tag', 'lab')
+    assert code == 0 and [h['host'] for h in result['hosts']] == ['h1', 'h2']
+
+    code, result = run_tool('remote', 'provision', '--host', 'h*', '--', '--stub', STUB)
+    assert code == 0 and result['ok']
+    for entry in result['hosts']:
+        assert entry['ok'] and all(step['ok'] for step in entry['result']['steps'].values())
+        assert entry['result']['steps']['nexus-cli']['log'].startswith(str(tmp_path / 'hosts' / entry['host']))
+
+
+def test_select_hosts_by_glob_and_tag(tool):
+    tool.tool_settings['hosts'] = [{'name': 'eu-1', 'tags': ['eu']}, {'name': 'eu-2', 'tags': []},
+                                   {'name': 'us-1', 'tags': ['eu']}]
+    assert [h['name'] for h in tool.select_hosts()] == ['eu-1', 'eu-2', 'us-1']
+    assert [h['name'] for h in tool.select_hosts(['eu-*'])] == ['eu-1', 'eu-2']
+    assert [h['name'] for h in tool.select_hosts(['eu-*'], 'eu')] == ['eu-1']
+    assert [h['name'] for h in tool.select_hosts(tag='eu')] == ['eu-1', 'us-1']
+
+
+def test_remote_tool_command_quotes_arguments(tool):
+    settings = tool.get_multihost_settings()
+    command = tool.remote_tool_command(settings, ['start', '--node-id', 'a;reboot'])
+    assert command.endswith("--json start --node-id 'a;reboot'")
+    assert 'sudo -n' in command and f'exit {tool.REMOTE_SCRIPT_MISSING}' in command
+    assert 'sudo' not in tool.remote_tool_command(settings, ['status'], sudo=False)
+    assert shlex.split(command.rsplit('"', 1)[1]) == ['--json', 'start', '--node-id', 'a;reboot']
+
+
+def test_parse_remote_result_takes_last_json_line(tool):
+    assert tool.parse_remote_result(b'progress\n{"ok": true}\n\n') == {'ok': True}
+    assert tool.parse_remote_result(b'{"ok": true}\nTraceback: boom\n') is None
+    assert tool.parse_remote_result(b'') is None
@@ -0,0 +1,56 @@
+import os
+
+T0 = 1_700_000_000.0
+
+
+def write_lines(writer, count, start=T0, step=1.0):
+    for i in range(count):
+        writer.write(f'line {i} proof ok', start + i * step)
+
+
+def test_blocks_round_trip_with_time_filter(tool):
+    writer = tool.NodeLogWriter('node-a')
+    write_lines(writer, 30)
+    writer.close()
+    entries = list(tool.read_node_log_blocks('node-a'))
+    assert entries == [(T0 + i, f'line {i} proof ok') for i in range(30)]
+    window = list(tool.read_node_log_blocks('node-a', since=T0 + 10, until=T0 + 12))
+    assert [line for _, line in window] == ['line 10 proof ok', 'line 11 proof ok', 'line 12 proof ok']
+    assert list(tool.read_node_log_blocks('node-a', since=T0 + 100)) == []
+    assert list(tool.read_node_log_blocks('tidak-ada')) == []
+
+
+def test_unindexed_block_is_skipped(tool):
+    writer = tool.NodeLogWriter('node-a')
+    write_lines(writer, 3, step=10.0)
+    writer.close()
+    index = next(name for name in os.listdir(tool.node_log_dir('node-a')) if name.endswith('.idx'))
+    with open(os.path.join(tool.node_log_dir('node-a'), index), 'a') as f:
+        f.write('[1, 2, 0')
+    assert len(list(tool.read_node_log_blocks('node-a'))) == 3
+
+
+def test_prune_keeps_newest_segments_under_limit(tool):
+    settings = {'segmentMb': 8, 'segmentMinutes': 1, 'maxMb': 0.001}
+    writer = tool.NodeLogWriter('node-a', settings)
+    write_lines(writer, 600, step=6.0)
+    writer.close()
+    directory = tool.node_log_dir('node-a')
+    segments = sorted(name for name in os.listdir(directory) if name.endswith('.log.gz'))
+    assert sum(os.path.getsize(os.path.join(directory, name)) for name in segments) <= writer.max_bytes
+    assert sorted(name for name in os.listdir(directory) if name.endswith('.idx')) == \
+        [name[:-len('.log.gz')] + '.idx' for name in segments]
+    lines = [line for _, line in tool.read_node_log_blocks('node-a')]
+    assert lines[-1] == 'line 599 proof ok'
+    assert 'line 0 proof ok' not in lines
+
+
+def test_search_merges_nodes_in_time_order(tool):
+    for target, offset in (('node-a', 0.0), ('node-b', 0.5)):
+        writer = tool.NodeLogWriter(target)
+        write_lines(writer, 5, start=T0 + offset)
+        writer.close()
+    results = tool.search_node_logs(pattern=r'line [34]', limit=3)
+    assert [(r['nodeId'], r['line']) for r in results] == [
+        ('node-b', 'line 3 proof ok'), ('node-a', 'line 4 proof ok'), ('node-b', 'line 4 proof ok')]
+    assert [r['nodeId'] for r in tool.search_node_logs(['node-b'], since=T0 + 4)] == ['node-b']
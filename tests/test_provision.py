@@ -0,0 +1,31 @@
+STUB = 'echo {command}'
+ALL_STEPS = {'apt-update', 'apt-upgrade', 'apt-packages', 'rustup', 'rust-target', 'nexus-cli'}
+
+
+def test_provision_stub_runs_every_step_and_resumes(run_tool):
+    code, result = run_tool('provision', '--stub', STUB)
+    assert code == 0 and result['ok']
+    assert set(result['steps']) == ALL_STEPS
+    assert all(step['ok'] for step in result['steps'].values())
+
+    code, again = run_tool('provision', '--stub', STUB)
+    assert code == 0 and again['steps'] == result['steps']
+
+
+def test_provision_stub_failure_skips_dependent_steps(run_tool):
+    code, result = run_tool('provision', '--stub', 'exit 3')
+    assert code == 1 and not result['ok']
+    assert {name: step['ok'] for name, step in result['steps'].items()} == {
+        'apt-update': False, 'rustup': False, 'nexus-cli': False}
+
+
+def test_provision_resumes_from_the_failed_step(run_tool, tmp_path):
+    code, result = run_tool('provision', '--stub', 'exit 3')
+    assert code == 1
+    code, result = run_tool('provision', '--stub', STUB)
+    assert code == 0 and set(result['steps']) == ALL_STEPS
+
+
+def test_provision_stub_quotes_the_replaced_command(run_tool):
+    code, result = run_tool('provision', '--stub', 'test -n {command}')
+    assert code == 0 and result['ok']
@@ -0,0 +1,25 @@
+import os
+import shlex
+
+
+def test_screen_launch_command_quotes_names_for_both_shells(tool, monkeypatch):
+    monkeypatch.setattr(tool, 'screen_path', '/usr/bin/screen')
+    command = ['/opt/nexus network', 'start', '--node-id', '1$(reboot)`id`']
+    line = tool.screen_launch_command('x;reboot', command, '1;id|x')
+    outer = shlex.split(line)
+    assert outer[:5] == ['/usr/bin/screen', '-S', 'x;reboot', '-dm', 'bash']
+    assert outer[5] == '-c' and len(outer) == 7
+    inner = shlex.split(outer[6].replace('set -o pipefail;', '', 1))
+    assert inner[:4] == command
+    assert inner[-2:] == ['--node-id', '1;id|x']
+
+
+def test_stop_sessions_leaves_command_logs_alone(tool, monkeypatch):
+    monkeypatch.setattr(tool, 'screen_path', '/bin/true')
+    log_dir = tool.command_log_dir()
+    tool.run_commands({'provision': 'echo ok'}, echo=False)
+    before = sorted(os.listdir(log_dir))
+    entries = [{'session': f'nexus-node-{i}', 'pid': 1000 + i, 'nodeId': str(i)} for i in range(tool.COMMAND_LOG_KEEP + 5)]
+    results = tool.stop_sessions(entries)
+    assert all(r['ok'] for r in results)
+    assert sorted(os.listdir(tool.command_log_dir())) == before
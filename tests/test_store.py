@@ -0,0 +1,30 @@
+import sqlite3
+
+
+def test_busy_database_does_not_leave_store_lock_held(tool):
+    db = tool.open_store()
+    db.execute('PRAGMA busy_timeout = 50')
+    other = sqlite3.connect(tool.store_path(), isolation_level=None)
+    other.execute('BEGIN IMMEDIATE')
+    try:
+        assert tool.record_launch('111', 'nexus-111') is None
+        assert not tool.store_lock.locked()
+    finally:
+        other.execute('ROLLBACK')
+        other.close()
+
+    launch_id = tool.record_launch('111', 'nexus-111', threads=4)
+    assert launch_id is not None
+    assert tool.launch_history('111')[0]['threads'] == 4
+
+
+def test_failed_write_is_rolled_back(tool):
+    db = tool.open_store()
+    try:
+        with tool.store_transaction(db):
+            db.execute("INSERT INTO settings (key, value) VALUES ('a', '1')")
+            raise ValueError
+    except ValueError:
+        pass
+    assert not db.in_transaction and not tool.store_lock.locked()
+    assert db.execute("SELECT 1 FROM settings WHERE key = 'a'").fetchone() is None
@@ -0,0 +1,28 @@
+import signal
+import sys
+import time
+
+
+def test_rusage_survives_reaping_through_poll(tool):
+    process = tool.rusage_popen([sys.executable, '-c', 'x = bytearray(64 * 1024 * 1024)'])
+    deadline = time.monotonic() + 10
+    while process.poll() is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert process.returncode == 0
+    assert process.rusage is not None and process.rusage.ru_maxrss > 64 * 1024
+
+
+def test_send_signal_after_exit_keeps_rusage(tool):
+    process = tool.rusage_popen(['true'])
+    time.sleep(0.2)
+    process.send_signal(signal.SIGTERM)  # poll() di dalam send_signal me-reap child yang sudah keluar
+    assert process.wait() == 0 and process.rusage is not None
+
+
+def test_run_traced_records_span_with_exit_code(tool):
+    result = tool.run_traced('test.false', ['sh', '-c', 'echo hi; exit 3'], capture_output=True, text=True)
+    assert result.returncode == 3 and result.stdout == 'hi\n'
+    spans = [s for s in tool.read_trace_spans() if s['name'] == 'test.false']
+    assert len(spans) == 1
+    assert spans[0]['exitCode'] == 3 and spans[0]['bytes'] == 3 and not spans[0]['ok']
+    assert spans[0]['maxRssKb']
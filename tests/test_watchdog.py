@@ -0,0 +1,64 @@
+import json
+import os
+import time
+
+import pytest
+
+
+@pytest.fixture
+def watcher(tool):
+    watcher = tool.DirectoryWatcher()
+    if watcher.fd < 0:
+        pytest.skip('inotify tidak tersedia')
+    yield watcher
+    os.close(watcher.fd)
+
+
+def test_wait_reports_only_the_changed_node(tool, watcher, tmp_path):
+    for key in ('node-a', 'node-b'):
+        (tmp_path / key).mkdir()
+        watcher.add(key, str(tmp_path / key))
+    assert watcher.wait(0.05) == set()
+    (tmp_path / 'node-b' / 'segment.log.gz').write_bytes(b'x')
+    assert watcher.wait(1.0) == {'node-b'}
+    watcher.remove('node-b')
+    (tmp_path / 'node-b' / 'segment.log.gz').write_bytes(b'y')
+    assert watcher.wait(0.05) == set()
+
+
+def test_writer_flush_wakes_watcher(tool, watcher):
+    os.makedirs(tool.node_log_dir('node-a'), exist_ok=True)
+    watcher.add('node-a', tool.node_log_dir('node-a'))
+    writer = tool.NodeLogWriter('node-a')
+    writer.write('Proof submitted successfully', time.time())
+    writer.flush()
+    assert watcher.wait(1.0) == {'node-a'}
+    writer.close()
+
+
+def test_without_inotify_every_node_is_checked(tool):
+    watcher = tool.DirectoryWatcher()
+    watcher.fd = -1
+    watcher.add('node-a', '/nonexistent')
+    assert watcher.wait(0.01) is None
+
+
+@pytest.mark.parametrize('line,mode,expected', [
+    ('Proof submitted successfully', 'proofs', True),
+    ('Fetching task from orchestrator', 'proofs', True),
+    ('Got task 123', 'proofs', True),
+    ('Refresh rate 30s', 'proofs', False),
+    ('Refresh rate 30s', 'output', True),
+])
+def test_progress_lines(tool, line, mode, expected):
+    assert tool.is_progress_line(line, mode) is expected
+
+
+def test_stall_snapshot_captures_process_state(tool):
+    path = tool.capture_stall_snapshot('node a/1', os.getpid(), [f'line {i}' for i in range(80)], 'diam 30 menit')
+    assert os.path.dirname(path) == os.path.join(tool.get_state_dir(), 'diagnostics')
+    assert 'node_a_1' in os.path.basename(path)
+    snapshot = json.load(open(path))
+    assert snapshot['lastLines'] == [f'line {i}' for i in range(30, 80)]
+    assert snapshot['state'] and snapshot['wchan'] is not None
+    assert str(os.getpid()) in snapshot['threads']